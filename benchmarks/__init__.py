@@ -0,0 +1,5 @@
+"""Performance benchmarks for ``penelopise``.
+
+These aren't run as part of the test suite, each module can be executed
+directly with ``python -m benchmarks.<name>`` from the repository root.
+"""
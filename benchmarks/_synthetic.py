@@ -0,0 +1,111 @@
+"""Synthetic ``todo.txt`` data generation for benchmarks."""
+
+import datetime
+import pathlib
+import random
+import sys
+
+import penelopise
+
+_WORDS = [
+    "call",
+    "email",
+    "buy",
+    "fix",
+    "write",
+    "review",
+    "plan",
+    "book",
+    "check",
+    "send",
+    "update",
+    "clean",
+    "organise",
+    "read",
+    "order",
+    "pay",
+    "renew",
+    "cancel",
+    "schedule",
+    "print",
+    "sort",
+    "file",
+]
+_CONTEXTS = ["phone", "email", "home", "office", "errands", "computer"]
+_PROJECTS = ["Work", "GarageSale", "Sprint42", "Taxes", "Garden", "Blog"]
+_KEYS = ["due", "body", "t", "rec", "id"]
+
+
+def _date(rng: random.Random) -> datetime.date:
+    return datetime.date(2020, 1, 1) + datetime.timedelta(rng.randrange(2000))
+
+
+def make_line(rng: random.Random) -> str:
+    """Generate a single plausible task line."""
+    parts = []
+    if rng.random() < 0.3:
+        parts.append(f"x {_date(rng):%F}")
+    elif rng.random() < 0.4:
+        parts.append(f"({rng.choice('ABCDE')})")
+    if rng.random() < 0.6:
+        parts.append(f"{_date(rng):%F}")
+    words = rng.choices(_WORDS, k=rng.randint(2, 8))
+    words += [f"@{c}" for c in rng.sample(_CONTEXTS, rng.randint(0, 2))]
+    words += [f"+{p}" for p in rng.sample(_PROJECTS, rng.randint(0, 2))]
+    for key in rng.sample(_KEYS, rng.randint(0, 2)):
+        value = f"{_date(rng):%F}" if key in {"due", "t"} else "notes.md"
+        words.append(f"{key}:{value}")
+    rng.shuffle(words)
+    return " ".join(parts + words)
+
+
+def make_lines(count: int, *, seed: int = 0) -> list[str]:
+    """Generate ``count`` task lines deterministically."""
+    rng = random.Random(seed)
+    return [make_line(rng) for _ in range(count)]
+
+
+def _usable(text: str) -> bool:
+    # The test strategies generate text that is valid for a single entry, but
+    # not all of it survives a round trip through a file
+    if text.splitlines() != [text] or not text.strip():
+        return False
+    try:
+        text.encode()
+        entry = penelopise.Entry(text)
+        for field in penelopise._FIELDS:
+            getattr(entry, field)
+    except (KeyError, UnicodeError, ValueError):
+        return False
+    return True
+
+
+def strategy_lines(count: int, *, seed: int = 0) -> list[str]:
+    """Generate up to ``count`` task lines with the test suite's strategies.
+
+    These use the full range of text that ``todo_testable`` produces, which is
+    far less regular than ``make_lines`` output.
+    """
+    import hypothesis
+
+    sys.path.insert(0, str(pathlib.Path(__file__).parent.parent / "tests"))
+    import strategies
+
+    lines: list[str] = []
+
+    @hypothesis.seed(seed)
+    @hypothesis.settings(
+        database=None,
+        deadline=None,
+        max_examples=count * 2,
+        phases=[hypothesis.Phase.generate],
+        suppress_health_check=list(hypothesis.HealthCheck),
+    )
+    @hypothesis.given(strategies.todo_testable())
+    def collect(testable: tuple[str, strategies.TodoData]) -> None:
+        text, _ = testable
+        if len(lines) < count and _usable(text):
+            lines.append(text)
+
+    collect()
+    return lines
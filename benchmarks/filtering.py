@@ -0,0 +1,85 @@
+"""Compare filtered loading with loading everything and then filtering.
+
+One in every hundred tasks is given an ``@waiting`` context, to represent the
+rare tasks a command line query usually selects.  Queries are also answered
+from a warm parse cache, as a command line tool run repeatedly would.
+
+Usage::
+
+    python -m benchmarks.filtering [--lines N] [--query QUERY ...]
+"""
+
+import argparse
+import itertools
+import os
+import pathlib
+import tempfile
+import time
+
+import penelopise
+
+from ._synthetic import make_lines
+
+
+def write_file(path: pathlib.Path, count: int) -> None:
+    """Write a synthetic task file, with ``@waiting`` on every 100th line."""
+    pool = make_lines(min(count, 100_000))
+    with path.open("w") as fh:
+        for i, line in enumerate(
+            itertools.islice(itertools.cycle(pool), count)
+        ):
+            fh.write(f"{line} @waiting\n" if i % 100 == 0 else line + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument(
+        "--query",
+        nargs="+",
+        default=[
+            "@waiting",
+            "@waiting !complete",
+            "+Taxes @phone",
+            "!complete",
+        ],
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "todo.txt"
+        write_file(path, args.lines)
+        # Make the file old enough for its cache to be trusted
+        os.utime(path, (0, 0))
+        cache_dir = pathlib.Path(tmp) / "cache"
+        start = time.perf_counter()
+        penelopise.Entries.parse_file_cached(path, cache_dir=cache_dir)
+        print(
+            f"{args.lines:,} lines, "
+            f"cache written in {time.perf_counter() - start:.3f}s"
+        )
+        for query in args.query:
+            start = time.perf_counter()
+            entries = penelopise.Entries.parse_file(path)
+            expected = list(entries.filter(query))
+            full = time.perf_counter() - start
+            start = time.perf_counter()
+            found = penelopise.Entries.filter_file(path, query)
+            filtered = time.perf_counter() - start
+            assert found == expected
+            start = time.perf_counter()
+            found = penelopise.Entries.parse_file_cached(
+                path, query=query, cache_dir=cache_dir
+            )
+            cached = time.perf_counter() - start
+            assert found == expected
+            print(
+                f"  {query!r:>22}: {len(found):7,} found, "
+                f"parse then filter {full:6.3f}s, "
+                f"filter_file {filtered:6.3f}s ({full / filtered:5.1f}x), "
+                f"cached {cached:6.3f}s ({full / cached:5.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Measure event loop latency while loading a large file.
+
+Small requests are simulated by tasks that repeatedly sleep for a short
+interval, recording how late they wake.  Blocking loaders stall every task
+until the file is loaded, while the async loader should keep them responsive.
+
+Usage::
+
+    python -m benchmarks.latency [--lines N] [--tasks N] [--interval MS]
+"""
+
+import argparse
+import asyncio
+import pathlib
+import statistics
+import tempfile
+import time
+
+import penelopise
+
+from .loaders import write_file
+
+
+async def blocking(path: pathlib.Path) -> int:
+    return len(penelopise.Entries.parse_file(path))
+
+
+async def threaded(path: pathlib.Path) -> int:
+    return len(await asyncio.to_thread(penelopise.Entries.parse_file, path))
+
+
+async def aparse_file(path: pathlib.Path) -> int:
+    return len(await penelopise.Entries.aparse_file(path))
+
+
+LOADERS = {
+    "parse_file": blocking,
+    "to_thread": threaded,
+    "aparse_file": aparse_file,
+}
+
+
+async def request(
+    interval: float, done: asyncio.Event, delays: list[float]
+) -> None:
+    """Sleep repeatedly, recording how late each wake up is."""
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        delays.append(time.perf_counter() - start - interval)
+
+
+async def measure(
+    loader, path: pathlib.Path, tasks: int, interval: float
+) -> tuple[float, list[float]]:
+    done = asyncio.Event()
+    delays: list[float] = []
+    requests = [
+        asyncio.create_task(request(interval, done, delays))
+        for _ in range(tasks)
+    ]
+    # Let the requests start before loading
+    await asyncio.sleep(interval)
+    start = time.perf_counter()
+    await loader(path)
+    elapsed = time.perf_counter() - start
+    done.set()
+    await asyncio.gather(*requests)
+    return elapsed, delays
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=500_000)
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=5,
+        help="milliseconds between each task's requests",
+    )
+    parser.add_argument(
+        "--loaders", nargs="+", choices=LOADERS, default=list(LOADERS)
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "todo.txt"
+        write_file(path, args.lines)
+        print(f"{args.lines:,} lines, {args.tasks} concurrent requests")
+        for name in args.loaders:
+            elapsed, delays = asyncio.run(
+                measure(LOADERS[name], path, args.tasks, args.interval / 1000)
+            )
+            p50, p99 = (
+                q * 1000 for q in statistics.quantiles(delays, n=100)[49::49]
+            )
+            print(
+                f"  {name:>11}: load {elapsed:6.2f}s, {len(delays):7,} "
+                f"requests, delay p50 {p50:7.2f}ms, p99 {p99:7.2f}ms, "
+                f"max {max(delays) * 1000:7.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
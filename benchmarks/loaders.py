@@ -0,0 +1,97 @@
+"""Compare file loaders for throughput and peak memory.
+
+Each loader runs in a fresh interpreter, so that peak RSS figures aren't
+polluted by earlier runs.
+
+Usage::
+
+    python -m benchmarks.loaders [--lines N ...] [--loaders NAME ...]
+"""
+
+import argparse
+import functools
+import itertools
+import json
+import pathlib
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import penelopise
+
+from ._synthetic import make_lines
+
+LOADERS = {
+    "parse_file": penelopise.Entries.parse_file,
+    "map_file": penelopise.Entries.map_file,
+    "eager": functools.partial(penelopise.Entries.parse_file, eager=True),
+    "bulk": penelopise.Entries.parse_file_bulk,
+}
+
+
+def write_file(path: pathlib.Path, count: int) -> None:
+    """Write a synthetic task file with ``count`` lines."""
+    # Generating unique lines is far slower than the loaders being measured,
+    # so cycle through a pool of them instead.
+    pool = make_lines(min(count, 100_000))
+    with path.open("w") as fh:
+        for line in itertools.islice(itertools.cycle(pool), count):
+            fh.write(line + "\n")
+
+
+def child(loader: str, path: str) -> None:
+    start = time.perf_counter()
+    entries = LOADERS[loader](path)
+    elapsed = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    json.dump(
+        {"count": len(entries), "elapsed": elapsed, "rss": rss}, sys.stdout
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--lines", type=int, nargs="+", default=[1_000_000, 10_000_000]
+    )
+    parser.add_argument(
+        "--loaders", nargs="+", choices=LOADERS, default=list(LOADERS)
+    )
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "todo.txt"
+        for count in args.lines:
+            write_file(path, count)
+            print(f"{count:,} lines")
+            for loader in args.loaders:
+                proc = subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        __spec__.name,
+                        "--child",
+                        loader,
+                        path,
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+                result = json.loads(proc.stdout)
+                rate = result["count"] / result["elapsed"]
+                print(
+                    f"  {loader:>10}: {rate:12,.0f} lines/s, "
+                    f"peak RSS {result['rss'] / 1024:8.1f}MiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
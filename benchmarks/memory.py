@@ -0,0 +1,58 @@
+"""Compare memory usage of ``Entry`` and ``CompactEntry``.
+
+Usage::
+
+    python -m benchmarks.memory [--entries N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+import penelopise
+
+from ._synthetic import make_lines
+
+
+def measure(entry_type: type, lines: list[str]) -> tuple[int, int]:
+    """Measure allocations for fully populated entries.
+
+    The line text is allocated before tracing begins, so only the cost of the
+    entry objects and their computed values is included.
+
+    Returns:
+        Current and peak traced memory in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    entries = [entry_type(line) for line in lines]
+    for entry in entries:
+        for field in penelopise._FIELDS:
+            getattr(entry, field)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entries
+    return current, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    lines = make_lines(args.entries)
+    results = {}
+    for entry_type in (penelopise.Entry, penelopise.CompactEntry):
+        current, peak = measure(entry_type, lines)
+        results[entry_type] = current
+        print(
+            f"{entry_type.__name__:>12}: {current / 2**20:8.1f}MiB "
+            f"(peak {peak / 2**20:.1f}MiB, "
+            f"{current / args.entries:.0f}B/entry)"
+        )
+    ratio = results[penelopise.Entry] / results[penelopise.CompactEntry]
+    print(f"reduction: {ratio:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Time deduplicating, diffing, and merging two copies of a task list.
+
+The second copy has a fraction of its entries edited, and others with their
+tags reordered, as if the same file had been changed on two machines.
+
+Usage::
+
+    python -m benchmarks.merging [--lines N] [--changed FRACTION]
+"""
+
+import argparse
+import functools
+import itertools
+import random
+import time
+
+import penelopise
+
+from ._synthetic import make_lines
+
+
+def reorder(text: str, rng: random.Random) -> str:
+    """Shuffle the tags at the end of an entry."""
+    words = text.split()
+    tags = [w for w in words if w[0] in "@+"]
+    rng.shuffle(tags)
+    return " ".join([w for w in words if w[0] not in "@+"] + tags)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=500_000)
+    parser.add_argument("--changed", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pool = make_lines(min(args.lines, 100_000), seed=args.seed)
+    lines = list(itertools.islice(itertools.cycle(pool), args.lines))
+    theirs = list(lines)
+    for i in rng.sample(range(args.lines), int(args.lines * args.changed)):
+        theirs[i] += " edited"
+    for i in rng.sample(range(args.lines), int(args.lines * args.changed)):
+        theirs[i] = reorder(theirs[i], rng)
+
+    mine = penelopise.Entries(map(penelopise.Entry, lines))
+    other = penelopise.Entries(map(penelopise.Entry, theirs))
+    print(f"{args.lines:,} lines in each list")
+    for normalize in (False, True):
+        for name, func in (
+            ("dedupe", mine.dedupe),
+            ("diff", functools.partial(mine.diff, other)),
+            ("merge", functools.partial(mine.merge, other)),
+        ):
+            start = time.perf_counter()
+            result = func(normalize=normalize)
+            elapsed = time.perf_counter() - start
+            if isinstance(result, penelopise.Changes):
+                size = f"+{len(result.added):,} -{len(result.removed):,}"
+            else:
+                size = f"{len(result):,} entries"
+            label = f"{name}{' normalized' if normalize else ''}"
+            print(f"  {label:>17}: {elapsed:6.3f}s, {size}")
+
+
+if __name__ == "__main__":
+    main()
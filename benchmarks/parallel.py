@@ -0,0 +1,58 @@
+"""Measure scaling of ``Entries.parse_file_parallel`` with worker count.
+
+The baseline is sequential ``parse_file`` with ``eager`` set, as the parallel
+loader extracts all fields up front too.
+
+Usage::
+
+    python -m benchmarks.parallel [--lines N] [--workers N ...]
+"""
+
+import argparse
+import os
+import pathlib
+import tempfile
+import time
+
+import penelopise
+
+from .loaders import write_file
+
+
+def timed(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=2_000_000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[n for n in (1, 2, 4, 8, 16, 32) if n <= cpus],
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "todo.txt"
+        write_file(path, args.lines)
+
+        baseline = timed(penelopise.Entries.parse_file, path, eager=True)
+        print(f"{'sequential':>10}: {baseline:7.2f}s")
+        for workers in args.workers:
+            elapsed = timed(
+                penelopise.Entries.parse_file_parallel, path, workers=workers
+            )
+            print(
+                f"{workers:>10}: {elapsed:7.2f}s "
+                f"(speedup {baseline / elapsed:.2f}x, "
+                f"efficiency {baseline / elapsed / workers:.0%})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Time parsing, field extraction, and bulk operations on a task file.
+
+Results can be saved as a JSON baseline, and later runs compared against it to
+catch regressions between commits.
+
+Usage::
+
+    python -m benchmarks.suite [--lines N] [--source NAME] [--save FILE]
+    python -m benchmarks.suite --compare FILE [--threshold PERCENT]
+"""
+
+import argparse
+import functools
+import gc
+import itertools
+import json
+import pathlib
+import platform
+import subprocess
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+import penelopise
+
+from ._synthetic import make_lines, strategy_lines
+
+SOURCES = {
+    "synthetic": make_lines,
+    "strategies": strategy_lines,
+}
+
+
+def write_file(path: pathlib.Path, pool: list[str], count: int) -> None:
+    """Write ``count`` lines to ``path``, cycling through ``pool``."""
+    with path.open("w", encoding="utf-8") as fh:
+        for line in itertools.islice(itertools.cycle(pool), count):
+            fh.write(line + "\n")
+
+
+def best(func, repeat: int) -> float:
+    """Return the fastest of ``repeat`` runs of ``func``, in seconds."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def fresh(path: pathlib.Path) -> penelopise.Entries:
+    """Load entries with nothing computed, for timing property access."""
+    return penelopise.Entries.parse_file(path)
+
+
+def access(entries: penelopise.Entries, field: str) -> None:
+    for entry in entries:
+        getattr(entry, field)
+
+
+def parse_all(entries: penelopise.Entries) -> None:
+    for entry in entries:
+        entry.parse_all()
+
+
+def peak_memory(path: pathlib.Path) -> int:
+    """Peak traced allocation while loading and fully parsing ``path``."""
+    gc.collect()
+    tracemalloc.start()
+    parse_all(penelopise.Entries.parse_file(path))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run(path: pathlib.Path, count: int, repeat: int) -> dict[str, dict]:
+    """Run every benchmark against the file at ``path``.
+
+    Property benchmarks need unparsed entries for each run, which are loaded
+    outside of the timed section.
+    """
+    results: dict[str, float] = {}
+    results["parse_file"] = best(
+        functools.partial(penelopise.Entries.parse_file, path), repeat
+    )
+    for field in penelopise._FIELDS:
+        results[field] = min(
+            timeit.timeit(functools.partial(access, entries, field), number=1)
+            for entries in (fresh(path) for _ in range(repeat))
+        )
+    results["parse_all"] = min(
+        timeit.timeit(functools.partial(parse_all, entries), number=1)
+        for entries in (fresh(path) for _ in range(repeat))
+    )
+
+    entries = fresh(path)
+    parse_all(entries)
+    results["sorted"] = best(functools.partial(sorted, entries), repeat)
+    results["sorted_by"] = best(entries.sorted_by, repeat)
+    results["sorted_by_top_20"] = best(
+        functools.partial(entries.sorted_by, limit=20), repeat
+    )
+    other = fresh(path)
+    results["equality"] = best(functools.partial(entries.__eq__, other), repeat)
+
+    report = {
+        name: {
+            "seconds": seconds,
+            "lines_per_second": count / seconds,
+            "us_per_entry": seconds / count * 1e6,
+        }
+        for name, seconds in results.items()
+    }
+    report["peak_memory"] = {"bytes": peak_memory(path)}
+    return report
+
+
+def commit() -> str | None:
+    """Return the current git commit, if there is one."""
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=pathlib.Path(__file__).parent,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return proc.stdout.strip()
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> bool:
+    """Print changes from ``baseline``, and report whether any regressed."""
+    regressed = False
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        metric = "bytes" if name == "peak_memory" else "seconds"
+        change = result[metric] / baseline[name][metric] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"{name:>16}: {change:+7.1%}{flag}")
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--source", choices=SOURCES, default="synthetic")
+    parser.add_argument(
+        "--pool",
+        type=int,
+        default=500,
+        help="distinct lines to generate, which are repeated to fill the file",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", type=pathlib.Path, metavar="FILE")
+    parser.add_argument("--compare", type=pathlib.Path, metavar="FILE")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10,
+        help="percentage slowdown reported as a regression",
+    )
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        # Comparisons are only meaningful for the same workload
+        args.lines = baseline["lines"]
+        args.source = baseline["source"]
+        args.pool = baseline["pool"]
+        args.seed = baseline["seed"]
+
+    pool = SOURCES[args.source](min(args.pool, args.lines), seed=args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "todo.txt"
+        write_file(path, pool, args.lines)
+        results = run(path, args.lines, args.repeat)
+
+    for name, result in results.items():
+        if "seconds" in result:
+            print(
+                f"{name:>16}: {result['lines_per_second']:12,.0f} lines/s, "
+                f"{result['us_per_entry']:6.2f}µs/entry"
+            )
+    print(
+        f"{'peak memory':>16}: {results['peak_memory']['bytes'] / 2**20:.1f}MiB"
+    )
+
+    if args.save:
+        document = {
+            "commit": commit(),
+            "python": platform.python_version(),
+            "lines": args.lines,
+            "source": args.source,
+            "pool": args.pool,
+            "seed": args.seed,
+            "results": results,
+        }
+        args.save.write_text(json.dumps(document, indent=2) + "\n")
+    if baseline:
+        print(f"\nChanges from {baseline['commit'] or args.compare}:")
+        if compare(results, baseline["results"], args.threshold / 100):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
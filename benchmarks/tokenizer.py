@@ -0,0 +1,54 @@
+"""Compare lazy property access with the single pass ``Entry.parse_all``.
+
+Usage::
+
+    python -m benchmarks.tokenizer [--entries N] [--repeat N]
+"""
+
+import argparse
+import functools
+import timeit
+
+import penelopise
+
+from ._synthetic import make_lines
+
+
+def lazy(lines: list[str]) -> None:
+    for line in lines:
+        entry = penelopise.Entry(line)
+        for field in penelopise._FIELDS:
+            getattr(entry, field)
+
+
+def fused(lines: list[str]) -> None:
+    for line in lines:
+        entry = penelopise.Entry(line).parse_all()
+        for field in penelopise._FIELDS:
+            getattr(entry, field)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    lines = make_lines(args.entries)
+    results = {}
+    for func in (lazy, fused):
+        best = min(
+            timeit.repeat(
+                functools.partial(func, lines), number=1, repeat=args.repeat
+            )
+        )
+        results[func.__name__] = best
+        print(
+            f"{func.__name__:>6}: {best:.3f}s "
+            f"({best / args.entries * 1e6:.2f}µs/entry)"
+        )
+    print(f"speedup: {results['lazy'] / results['fused']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,31 @@
 """penelopise - Basic parsing for ``todo.txt`` files."""
 
+import abc
+import collections.abc
 import datetime
 import enum
 import functools
+import operator
+import os
 import re
-import string
+import sys
+import types
 import typing
 
+if typing.TYPE_CHECKING:
+    import array
+    import contextlib
+    import mmap
+    import weakref
+
+    import numpy
+
+# Modules used by only some features are imported in the functions that need
+# them, rather than here, so that importing the package stays cheap for
+# short-lived programs such as shell completions.  See
+# ``benchmarks/importtime.py``, and ``tests/test_import.py`` which checks that
+# they aren't loaded by the import.
+
 
 class Priority(enum.IntEnum):  # ruff: disable=E741
     """Enumeration for representing task priority levels.
@@ -51,6 +70,12 @@ class Priority(enum.IntEnum):  # ruff: disable=E741
     A = enum.auto()  # NoQA: E741
 
 
+# Priorities by character.  Looking them up here is much cheaper than
+# ``Priority[...]``, and also rejects anything that isn't a single uppercase
+# ASCII character.
+_PRIORITIES: dict[str, Priority] = {p.name: p for p in Priority}
+
+
 Context = typing.NewType("Context", str)
 """Represent a context associated with a task.
 
@@ -66,8 +91,34 @@ group tasks under a common goal or initiative.
 """
 
 
+class _LazyPattern:
+    """Regular expression that is only compiled when first used.
+
+    Compiling every pattern is a noticeable part of the time taken to import
+    the package, and short-lived programs rarely need more than a few of them.
+    Attributes of the compiled pattern are stored on the instance as they are
+    looked up, so later uses are as cheap as with the pattern itself.
+    """
+
+    def __init__(self, pattern: str | bytes, flags: int = 0) -> None:
+        self._args = (pattern, flags)
+        self._compiled: re.Pattern[typing.Any] | None = None
+
+    def __getattr__(self, name: str) -> typing.Any:
+        if self._compiled is None:
+            self._compiled = re.compile(*self._args)
+        value = self.__dict__[name] = getattr(self._compiled, name)
+        return value
+
+
+def _lazy_compile(
+    pattern: str | bytes, flags: int = 0
+) -> re.Pattern[typing.Any]:
+    return typing.cast("re.Pattern[typing.Any]", _LazyPattern(pattern, flags))
+
+
 def _make_metadata_re(symbol: str) -> re.Pattern[str]:
-    return re.compile(
+    return _lazy_compile(
         rf"""
         \B                   # Not a word boundary
         {re.escape(symbol)}
@@ -89,7 +140,7 @@ _CONTEXT_RE = _make_metadata_re("@")
 _PROJECT_RE = _make_metadata_re("+")
 
 
-_PRIORITY_RE = re.compile(
+_PRIORITY_RE = _lazy_compile(
     r"""
     (?:
         ^
@@ -109,29 +160,582 @@ _PRIORITY_RE = re.compile(
     re.VERBOSE | re.ASCII,
 )
 
+_COMPLETION_DATE_RE = _lazy_compile(
+    rf"""
+    x                    # Completed marker
+    \s
+    (?:\([A-Z]\)\s)?     # Optional priority
+    (
+        {_ISO_DATE}      # Completion date
+    )
+    """,
+    re.VERBOSE,
+)
+
+_CREATION_DATE_RE = _lazy_compile(
+    rf"""
+    (?:
+        x            # Completed marker
+        \s
+        {_ISO_DATE}  # Completion date
+        \s
+        |
+        \([A-Z]\)    # Priority
+        \s
+    )?
+    (
+        {_ISO_DATE}  # Creation date
+    )
+    \s
+    """,
+    re.VERBOSE,
+)
+
+# The following patterns support the single pass tokenizer, and are only used
+# once we've already established that a match is possible.
+_DATE_SHAPE_RE = _lazy_compile(_ISO_DATE)
+_PRI_TAG_RE = _lazy_compile(r"\bpri:([^\s:]+)", re.ASCII)
+_ATTR_RE = _lazy_compile(r"([^\s:]+):([^\s:]+)")
+# Any whitespace delimited token containing a metadata sigil
+_SIGIL_TOKEN_RE = _lazy_compile(r"(?<!\S)[^\s@+:]*[@+:]\S*")
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_date(value: str) -> datetime.date | None:
+    # Large files repeat the same dates many times, so share them.  Invalid
+    # values are cached as ``None``, as failed conversions are expensive.
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _parse_date(value: str) -> datetime.date:
+    """Convert an ISO-8601 date, like ``datetime.date.fromisoformat``."""
+    if (date := _cached_date(value)) is None:
+        raise ValueError(f"Invalid isoformat string: {value!r}")
+    return date
+
+
+def _attr_value(value: str) -> str | datetime.date:
+    """Convert an attribute value to a date, if it is one."""
+    # Every format that ``fromisoformat`` accepts is seven to ten characters
+    # long, and begins with a digit.  Checking that first avoids the cache for
+    # common values like ``body:notes.md``.
+    if 7 <= len(value) <= 10 and value[0].isdigit():
+        return _cached_date(value) or value
+    return value
+
+
+def _is_priority_marker(text: str, pos: int, *, ascii_only: bool) -> bool:
+    """Check for a ``(X)`` priority marker and trailing space at ``pos``."""
+    marker = text[pos : pos + 4]
+    return (
+        len(marker) == 4
+        and marker[0] == "("
+        and "A" <= marker[1] <= "Z"
+        and marker[2] == ")"
+        and (marker[3] in " \t\n\r\f\v" if ascii_only else marker[3].isspace())
+    )
+
+
+def _tag_values(token: str, sigil: str, pattern: re.Pattern[str]) -> list[str]:
+    """Extract context or project values from a single token."""
+    # The common case is a token that *is* a tag, which can be matched without
+    # descending in to the regex engine.
+    if token[0] == sigil and len(token) > 1:
+        last = token[-1]
+        if last.isalnum() or last == "_":
+            return [sys.intern(token[1:])]
+    return list(map(sys.intern, pattern.findall(token)))
+
+
+def _tokenize(text: str) -> dict[str, typing.Any]:
+    """Extract all ``Entry`` fields from text in a single pass.
+
+    This produces exactly the same values as the lazy ``Entry`` properties, but
+    walks the entry once instead of once per property.  Fields that would raise
+    an exception when accessed are omitted, so that the exception is raised
+    from the lazy property in the normal way.
+
+    Args:
+        text: Task text to parse.
+
+    Returns:
+        Mapping of ``Entry`` property names to values.
+    """
+    fields: dict[str, typing.Any] = {
+        "complete": text.startswith("x "),
+        "completion_date": None,
+        "creation_date": None,
+        "priority": None,
+    }
+
+    # Head: completion marker, priority, and dates.  Each of these can only
+    # appear at fixed offsets, so we can skip straight past the line when the
+    # first character rules them out.
+    first = text[:1]
+    if first == "x" or first == "(" or first.isdecimal():
+        completed = first == "x" and text[1:2].isspace()
+        if completed:
+            pos = 6 if _is_priority_marker(text, 2, ascii_only=False) else 2
+            if m := _DATE_SHAPE_RE.match(text, pos):
+                try:
+                    fields["completion_date"] = _parse_date(m.group())
+                except ValueError:
+                    del fields["completion_date"]
+
+        pos = 0
+        if (
+            completed
+            and _DATE_SHAPE_RE.match(text, 2)
+            and text[12:13].isspace()
+        ):
+            pos = 13
+        elif _is_priority_marker(text, 0, ascii_only=False):
+            pos = 4
+        if (
+            _DATE_SHAPE_RE.match(text, pos)
+            and text[pos + 10 : pos + 11].isspace()
+        ):
+            try:
+                fields["creation_date"] = _parse_date(text[pos : pos + 10])
+            except ValueError:
+                del fields["creation_date"]
+
+        pos = 2 if completed and text[1] in " \t\n\r\f\v" else 0
+        if _is_priority_marker(text, pos, ascii_only=True):
+            fields["priority"] = _PRIORITIES[text[pos + 1]]
+
+    if (
+        fields["priority"] is None
+        and "pri:" in text
+        and (m := _PRI_TAG_RE.search(text))
+    ):
+        if (priority := _PRIORITIES.get(m.group(1))) is not None:
+            fields["priority"] = priority
+        else:
+            del fields["priority"]
+
+    # Body: only tokens containing one of the metadata sigils are of interest,
+    # and they're found in a single scan of the text.
+    contexts: list[Context] = []
+    projects: list[Project] = []
+    attrs: dict[str, str | datetime.date] | None = {}
+    for token in _SIGIL_TOKEN_RE.findall(text):
+        if "@" in token:
+            contexts.extend(map(Context, _tag_values(token, "@", _CONTEXT_RE)))
+        if "+" in token:
+            projects.extend(map(Project, _tag_values(token, "+", _PROJECT_RE)))
+        if attrs is not None and ":" in token:
+            if token.count(":") == 1 and token[0] != ":" and token[-1] != ":":
+                pairs = [token.split(":")]
+            else:
+                pairs = _ATTR_RE.findall(token)
+            for k, v in pairs:
+                if k == "pri":
+                    continue
+                if k in attrs:
+                    attrs = None
+                    break
+                attrs[k] = _attr_value(v)
+
+    fields["contexts"] = contexts
+    fields["projects"] = projects
+    if attrs is not None:
+        fields["attrs"] = attrs
+    return fields
+
+
+# Variants of the field patterns for searching many entries at once, each
+# preceded by ``\n``.  Anchoring to the start of a line with ``\n`` rather than
+# ``^``, and checking for word boundaries before a match separately, lets the
+# regex engine skip straight to the literal text that begins each match, see
+# ``_iter_after_non_word``.
+# Whitespace is matched with ``[^\S\n]`` so that matches can't run in to the
+# next line.
+_BULK_COMPLETE_RE = _lazy_compile(r"\nx ")
+_BULK_PRIORITY_RE = _lazy_compile(
+    r"\n(?:x[^\S\n])?\(([A-Z])\)[^\S\n]", re.ASCII
+)
+_BULK_PRI_TAG_RE = _lazy_compile(r"pri:([^\s:]+)", re.ASCII)
+_BULK_COMPLETION_DATE_RE = _lazy_compile(
+    rf"\nx[^\S\n](?:\([A-Z]\)[^\S\n])?({_ISO_DATE})"
+)
+_BULK_CREATION_DATE_RE = _lazy_compile(
+    rf"""
+    \n
+    (?:x[^\S\n]{_ISO_DATE}[^\S\n]|\([A-Z]\)[^\S\n])?
+    ({_ISO_DATE})
+    [^\S\n]
+    """,
+    re.VERBOSE,
+)
+_BULK_CONTEXT_RE = _lazy_compile(r"@(\S+)\b")
+_BULK_PROJECT_RE = _lazy_compile(r"\+(\S+)\b")
+
+
+def _iter_after_non_word(
+    pattern: re.Pattern[str], buf: str, *, ascii: bool = False
+) -> typing.Iterator[re.Match[str]]:
+    """Find the matches for a pattern that don't follow a word character.
+
+    This behaves like ``finditer`` with a pattern beginning with a word
+    boundary check, which would stop the regex engine from skipping ahead to
+    the literal text that follows it.  ``ascii`` matches the ``re.ASCII``
+    definition of word characters.
+    """
+    pos = 0
+    while m := pattern.search(buf, pos):
+        start = m.start()
+        prev = buf[start - 1] if start else " "
+        if (prev.isalnum() or prev == "_") and (prev.isascii() or not ascii):
+            pos = start + 1
+        else:
+            yield m
+            pos = m.end()
+
+
+def _bulk_tokenize(texts: list[str]) -> list[dict[str, typing.Any]]:
+    """Extract ``Entry`` fields from many entries at once.
+
+    This produces the same values as ``_tokenize``, except for ``attrs``
+    which is left to be parsed lazily.  Instead of walking each entry, the
+    texts are joined and each field's pattern is run over the whole buffer
+    in a single pass.  Matches are mapped back to entries with a table of
+    line offsets.
+
+    Args:
+        texts: Task texts to parse, which must not contain newlines or
+            trailing whitespace.
+
+    Returns:
+        Mapping of ``Entry`` property names to values, for each text.
+    """
+    import itertools
+
+    buf = "\n" + "\n".join(texts)
+    # Offset of the newline before each text
+    starts = list(itertools.accumulate((len(t) + 1 for t in texts), initial=0))
+    count = len(texts)
+    complete = [False] * count
+    priority: list[Priority | None] = [None] * count
+    completion: list[datetime.date | None] = [None] * count
+    creation: list[datetime.date | None] = [None] * count
+    contexts: list[list[Context]] = [[] for _ in range(count)]
+    projects: list[list[Project]] = [[] for _ in range(count)]
+    # Rows with a field that would raise an exception, which is left for the
+    # lazy property
+    invalid: dict[int, list[str]] = collections.defaultdict(list)
+    # Imported here as it is only needed for bulk loading
+    import bisect
+
+    find = functools.partial(bisect.bisect_right, starts)
+
+    for m in _BULK_COMPLETE_RE.finditer(buf):
+        complete[find(m.start()) - 1] = True
+    for name, column, pattern in (
+        ("completion_date", completion, _BULK_COMPLETION_DATE_RE),
+        ("creation_date", creation, _BULK_CREATION_DATE_RE),
+    ):
+        for m in pattern.finditer(buf):
+            row = find(m.start()) - 1
+            column[row] = _cached_date(m.group(1))
+            if column[row] is None:
+                invalid[row].append(name)
+    # A priority marker comes before any ``pri:`` tag, and then only the first
+    # tag in an entry counts
+    marked = set()
+    for m in _BULK_PRIORITY_RE.finditer(buf):
+        marked.add(row := find(m.start()) - 1)
+        priority[row] = _PRIORITIES[m.group(1)]
+    for m in _iter_after_non_word(_BULK_PRI_TAG_RE, buf, ascii=True):
+        if (row := find(m.start()) - 1) not in marked:
+            marked.add(row)
+            if (value := _PRIORITIES.get(m.group(1))) is not None:
+                priority[row] = value
+            else:
+                invalid[row].append("priority")
+    for column, pattern in (
+        (contexts, _BULK_CONTEXT_RE),
+        (projects, _BULK_PROJECT_RE),
+    ):
+        for m in _iter_after_non_word(pattern, buf):
+            column[find(m.start()) - 1].append(sys.intern(m.group(1)))
+
+    results = [
+        {
+            "complete": values[0],
+            "completion_date": values[1],
+            "creation_date": values[2],
+            "priority": values[3],
+            "contexts": values[4],
+            "projects": values[5],
+        }
+        for values in zip(
+            complete, completion, creation, priority, contexts, projects
+        )
+    ]
+    for row, names in invalid.items():
+        for name in names:
+            del results[row][name]
+    return results
+
+
+def _extract_complete(text: str) -> bool:
+    return text.startswith("x ")
+
+
+# Each extractor first checks for the characters its pattern can't match
+# without, which rules out most entries before the regex engine is entered.
+
+
+def _extract_completion_date(text: str) -> datetime.date | None:
+    if text[:1] == "x" and (m := _COMPLETION_DATE_RE.match(text)):
+        return _parse_date(m.group(1))
+    return None
+
+
+def _extract_creation_date(text: str) -> datetime.date | None:
+    first = text[:1]
+    if (first == "x" or first == "(" or first.isdecimal()) and (
+        m := _CREATION_DATE_RE.match(text)
+    ):
+        return _parse_date(m.group(1))
+    return None
+
+
+def _extract_priority(text: str) -> Priority | None:
+    if text[:1] != "(" and text[2:3] != "(" and "pri:" not in text:
+        return None
+    if m := _PRIORITY_RE.search(text):
+        priority_val = m.group(1) or m.group(2)
+        if (priority := _PRIORITIES.get(priority_val)) is None:
+            raise ValueError(f"Invalid priority value {priority_val}")
+        return priority
+    return None
+
+
+# Tags repeat heavily across a task list, so they're interned to store a single
+# copy of each
+def _extract_contexts(text: str) -> list[Context]:
+    if "@" not in text:
+        return []
+    return [Context(sys.intern(v)) for v in _CONTEXT_RE.findall(text)]
+
+
+def _extract_projects(text: str) -> list[Project]:
+    if "+" not in text:
+        return []
+    return [Project(sys.intern(v)) for v in _PROJECT_RE.findall(text)]
+
+
+def _extract_attrs(text: str) -> dict[str, str | datetime.date]:
+    d: dict[str, str | datetime.date] = {}
+    if ":" not in text:
+        return d
+    for k, v in _ATTR_RE.findall(text):
+        if k == "pri":
+            continue
+        if k in d:
+            raise KeyError(f"Duplicate key {k}")
+        d[k] = _attr_value(v)
+    return d
+
+
+class Extractor:
+    """A custom ``key:value`` attribute, see ``register_extractor``."""
+
+    __slots__ = ("convert", "key", "pattern")
+
+    def __init__(
+        self,
+        key: str,
+        convert: typing.Callable[[str], typing.Any],
+        pattern: re.Pattern[str],
+    ) -> None:
+        #: Name of the attribute
+        self.key = key
+        #: Function converting the attribute's value
+        self.convert = convert
+        #: Precompiled pattern matching the attribute, with the value in group
+        #: one
+        self.pattern = pattern
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__qualname__}(key={self.key!r}, "
+            f"convert={self.convert!r}, pattern={self.pattern!r})"
+        )
+
+
+# Custom attributes, by key
+_EXTRACTORS: dict[str, Extractor] = {}
+
+
+def register_extractor(
+    key: str, convert: typing.Callable[[str], typing.Any] = str
+) -> Extractor:
+    """Register a converter for a custom ``key:value`` attribute.
+
+    Converted values are read with ``Entry.extract``, which only searches
+    entries that contain the key, with a precompiled pattern, and caches the
+    result on the entry.  For example, to refer to supporting files::
+
+        register_extractor("body", pathlib.Path)
+        Entry("write report body:notes/report.md").extract("body").suffix
+
+    The attribute must begin a word, and may only appear once in an entry.
+    Registering a key again replaces its converter, but doesn't affect values
+    that entries have already converted.
+
+    Args:
+        key: Name of the attribute.
+        convert: Function to convert the attribute's value.
+
+    Returns:
+        The registered extractor.
+
+    Raises:
+        ValueError: If ``key`` isn't a valid attribute name.
+    """
+    if not key or ":" in key or any(c.isspace() for c in key):
+        raise ValueError(f"Invalid attribute key {key!r}")
+    extractor = _EXTRACTORS[key] = Extractor(
+        key, convert, re.compile(rf"(?<!\S){re.escape(key)}:([^\s:]+)")
+    )
+    return extractor
+
+
+# Names of the properties computed from an entry's text
+_FIELDS = (
+    "complete",
+    "completion_date",
+    "creation_date",
+    "priority",
+    "contexts",
+    "projects",
+    "attrs",
+)
+
+
+# Fields parsed from fixed positions at the start of an entry, which can only
+# be affected by changes within the first ``_HEAD_SIZE`` characters; enough for
+# ``x (A) 2025-01-02 2025-01-01 ``
+_HEAD_FIELDS = frozenset(
+    ("complete", "completion_date", "creation_date", "priority")
+)
+_HEAD_SIZE = 28
+
+_WORD_SPLIT_RE = _lazy_compile(r"(\s+)")
+
+
+def _word_fields(word: str) -> set[str]:
+    """Fields that adding or removing a whole word could change."""
+    fields = set()
+    if "@" in word:
+        fields.add("contexts")
+    if "+" in word:
+        fields.add("projects")
+    if ":" in word:
+        fields.update(("attrs", "priority"))
+    return fields
+
+
+def _rewrite_words(
+    text: str, match: typing.Callable[[str], bool], replacement: str | None
+) -> tuple[str, set[str], int]:
+    """Replace the words in ``text`` for which ``match`` is true.
+
+    The replacement takes the place of the first match, or is appended if
+    there are none, and any other matches are removed.
+
+    Returns:
+        The new text, the fields that may have changed, and the position of
+        the first change.
+    """
+    parts = _WORD_SPLIT_RE.split(text)
+    kept = []
+    fields = set() if replacement is None else _word_fields(replacement)
+    start = len(text)
+    pos = 0
+    for i in range(0, len(parts), 2):
+        sep = parts[i - 1] if i else ""
+        word = parts[i]
+        if word and match(word):
+            fields |= _word_fields(word)
+            start = min(start, pos)
+            if replacement is not None:
+                kept.append(sep + replacement)
+                replacement = None
+        else:
+            kept.append(sep + word)
+        pos += len(sep) + len(word)
+    new = "".join(kept)
+    if not text[:1].isspace():
+        new = new.lstrip()
+    if replacement is not None:
+        new = f"{new} {replacement}" if new else replacement
+    return new, fields, start
+
 
 @functools.total_ordering
-class Entry:
-    """Represent a task.
+class _BaseEntry(abc.ABC):
+    """Behaviour shared by the ``Entry`` implementations.
 
-    Encapsulates the complete details of a task; full text description,
-    completion status, priority, creation and completion dates, contexts, and
-    projects.
+    Subclasses store the text in ``_text``, and implement the abstract methods
+    to create entries and store or drop the values computed from it.
     """
 
-    def __init__(self, text: str, /) -> None:
-        self._text: str = text
+    __slots__ = ()
+
+    _text: str
+
+    #: Line number within the source file, if read from one
+    lineno: int | None = None
+    #: Byte offset of the line within the source file, if known
+    offset: int | None = None
+    # Weak references to indexes to notify when the text changes, so that an
+    # entry doesn't keep them alive, see ``EntryIndex``
+    _observers: tuple["weakref.ref[EntryIndex]", ...] = ()
+    # Most recent ``Entries.sorted_by`` key names, and the resulting key
+    _sort_key: tuple[tuple[str, ...], tuple[typing.Any, ...]] | None = None
+    # Previously parsed values, see ``Entries.parse_file_cached``
+    _record: "_Record | None" = None
+    # Converted custom attributes, see ``extract``
+    _extracted: dict[str, typing.Any] | None = None
+
+    def __getattr__(self, name: str) -> typing.Any:
+        # This is only reached when ``_text`` hasn't been set, which means the
+        # entry was created by ``_from_bytes`` and is yet to be decoded.
+        if name == "_text":
+            raw = self._raw
+            encoding = "utf-8"
+            if isinstance(raw, tuple):
+                raw, encoding = raw
+            self._text = raw.decode(encoding).rstrip()
+            del self._raw
+            return self._text
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
+
+    @classmethod
+    @abc.abstractmethod
+    def _from_bytes(
+        cls,
+        raw: bytes,
+        encoding: str,
+        /,
+        *,
+        lineno: int | None = None,
+        offset: int | None = None,
+    ) -> typing.Self:
+        """Create an entry that defers decoding its text until first use."""
 
     def __repr__(self) -> str:
         return f"{self.__class__.__qualname__}({self.text!r})"
 
-    def __setattr__(self, name, value, /):
-        if isinstance(
-            getattr(type(self), name, None), functools.cached_property
-        ):
-            raise AttributeError(f"Cannot set attribute '{name}'.")
-        super().__setattr__(name, value)
-
     @property
     def text(self) -> str:
         return self._text
@@ -140,108 +744,237 @@ class Entry:
     def text(self, value: str, /) -> None:
         if value != self._text:
             self._text = value
-            for attr in (
-                "complete",
-                "completion_date",
-                "creation_date",
-                "priority",
-                "contexts",
-                "projects",
-                "attrs",
-            ):
-                self.__dict__.pop(attr, None)
+            self._invalidate()
+            self._notify()
 
-    @functools.cached_property
-    def complete(self) -> bool:
-        return self.text.startswith("x ")
+    def _notify(self) -> None:
+        """Tell indexes containing the entry that its text has changed."""
+        for ref in self._observers:
+            if (index := ref()) is not None:
+                index._entry_changed(self)
 
-    @functools.cached_property
-    def completion_date(self) -> datetime.date | None:
-        if m := re.match(
-            rf"""
-            x                    # Completed marker
-            \s
-            (?:\([A-Z]\)\s)?     # Optional priority
-            (?:
-                (
-                    {_ISO_DATE}  # Completion date
-                )
-            )
-            """,
-            self.text,
-            re.VERBOSE,
-        ):
-            return datetime.date.fromisoformat(m.group(1))
-        return None
+    @abc.abstractmethod
+    def _invalidate(self) -> None:
+        """Drop every value computed from the text."""
 
-    @functools.cached_property
-    def creation_date(self) -> datetime.date | None:
-        if m := re.match(
-            rf"""
-            (?:
-                x            # Completed marker
-                \s
-                {_ISO_DATE}  # Completion date
-                \s
-                |
-                \([A-Z]\)    # Priority
-                \s
-            )?
-            (
-                {_ISO_DATE}  # Creation date
-            )
-            \s
-            """,
-            self.text,
-            re.VERBOSE,
-        ):
-            return datetime.date.fromisoformat(m.group(1))
-        else:
-            return None
+    def _parse(
+        self, name: str, extract: typing.Callable[[str], typing.Any]
+    ) -> typing.Any:
+        """Compute a property, using the value in ``_record`` if possible."""
+        if self._record is not None:
+            value = _RECORD_FIELDS[name](self._record)
+            if value is not _UNSET:
+                return value
+        return extract(self._text)
 
-    @functools.cached_property
-    def priority(self) -> Priority | None:
-        if m := _PRIORITY_RE.search(self.text):
-            priority_val = m.group(1) or m.group(2)
-            if priority_val not in string.ascii_uppercase:
-                raise ValueError(f"Invalid priority value {priority_val}")
-            return Priority[priority_val]
-        return None
+    @abc.abstractmethod
+    def _populate(self, fields: dict[str, typing.Any]) -> None:
+        """Store precomputed values, as produced by ``_tokenize``."""
 
-    @functools.cached_property
-    def contexts(self) -> list[Context]:
-        return [Context(v) for v in _CONTEXT_RE.findall(self.text)]
+    def extract(self, key: str) -> typing.Any:
+        """Return the converted value of a custom attribute.
 
-    @functools.cached_property
-    def projects(self) -> list[Project]:
-        return [Project(v) for v in _PROJECT_RE.findall(self.text)]
+        Args:
+            key: Attribute registered with ``register_extractor``.
 
-    @functools.cached_property
-    def attrs(self) -> dict[str, str | datetime.date]:
-        d: dict[str, str | datetime.date] = {}
-        for k, v in re.findall(
-            r"""
-            (
-                [^\s:]+  # Anything that isn't whitespace or a colon
+        Returns:
+            The converted value, or ``None`` if the entry doesn't have the
+            attribute.
+
+        Raises:
+            KeyError: If the attribute isn't registered, or appears more than
+                once.
+        """
+        extracted = self._extracted
+        if extracted is None:
+            extracted = {}
+            object.__setattr__(self, "_extracted", extracted)
+        elif key in extracted:
+            return extracted[key]
+        try:
+            extractor = _EXTRACTORS[key]
+        except KeyError:
+            raise KeyError(f"Unregistered attribute {key}") from None
+        value = None
+        text = self.text
+        if f"{key}:" in text:
+            values = extractor.pattern.findall(text)
+            if len(values) > 1:
+                raise KeyError(f"Duplicate key {key}")
+            if values:
+                value = extractor.convert(values[0])
+        extracted[key] = value
+        return value
+
+    @abc.abstractmethod
+    def _cached(self, name: str) -> typing.Any:
+        """Return a property's value if it has been computed, or ``_UNSET``."""
+
+    @property
+    def priority_code(self) -> int:
+        """The priority as a small integer, with zero for no priority.
+
+        Codes order like priorities, from one for ``Z`` to 26 for ``A``, and
+        are cheaper than ``Priority`` members to hash and compare in sort keys
+        and tallies.  ``Columns.priority`` holds the same values.
+        """
+        priority = self.priority
+        return 0 if priority is None else priority._value_
+
+    @abc.abstractmethod
+    def _invalidate_fields(self, fields: typing.Collection[str]) -> None:
+        """Drop the given computed values, and anything derived from them."""
+
+    def _edit(self, text: str, fields: set[str], start: int) -> None:
+        """Replace the text after a structured change.
+
+        Args:
+            text: New text.
+            fields: Fields that the change may have affected.
+            start: Position of the first changed character.
+        """
+        if text == self._text:
+            return
+        if start < _HEAD_SIZE:
+            fields |= _HEAD_FIELDS
+        object.__setattr__(self, "_text", text)
+        self._invalidate_fields(fields)
+        self._notify()
+
+    def mark_complete(self, date: datetime.date | None = None) -> None:
+        """Mark the task as complete.
+
+        A priority marker is replaced with a ``pri:`` attribute, as completed
+        tasks don't keep their marker.  Nothing is changed if the task is
+        already complete.
+
+        Args:
+            date: Completion date, defaults to today.
+        """
+        text = self.text
+        if text.startswith("x "):
+            return
+        if date is None:
+            date = datetime.date.today()
+        fields: set[str] = set()
+        if _is_priority_marker(text, 0, ascii_only=True):
+            text, fields, _ = _rewrite_words(
+                text[4:], _PRI_TAG_RE.search, f"pri:{text[1]}"
             )
-            :            # Separator
-            (
-                [^\s:]+  # Anything that isn't whitespace or a colon
+        self._edit(f"x {date.isoformat()} {text}".rstrip(), fields, 0)
+
+    def set_priority(self, priority: Priority | None) -> None:
+        """Change the task's priority.
+
+        Incomplete tasks are given a priority marker, and completed tasks a
+        ``pri:`` attribute, replacing any existing priority.
+
+        Args:
+            priority: New priority, or ``None`` to remove it.
+        """
+        text = self.text
+        complete = text.startswith("x ")
+        pos = 2 if complete else 0
+        start = len(text)
+        if _is_priority_marker(text, pos, ascii_only=True):
+            text = text[:pos] + text[pos + 4 :]
+            start = pos
+        tag = None if priority is None else f"pri:{priority.name}"
+        text, fields, changed = _rewrite_words(
+            text, _PRI_TAG_RE.search, tag if complete else None
+        )
+        start = min(start, changed)
+        if tag and not complete:
+            text = f"({priority.name}) {text}".rstrip()
+            start = 0
+        self._edit(text, fields | {"priority"}, start)
+
+    def _add_tag(
+        self, sigil: str, tag: str, pattern: re.Pattern[str], field: str
+    ) -> None:
+        word = sigil + tag
+        if word.split() != [word] or _tag_values(word, sigil, pattern) != [tag]:
+            raise ValueError(f"Invalid {field[:-1]} {tag!r}")
+        if tag in getattr(self, field):
+            return
+        text = self.text
+        self._edit(
+            f"{text} {sigil}{tag}" if text else sigil + tag, {field}, len(text)
+        )
+
+    def add_context(self, context: str) -> None:
+        """Add a context to the task, if it isn't already present.
+
+        Args:
+            context: Context to add, without the leading ``@``.
+
+        Raises:
+            ValueError: If the context isn't valid.
+        """
+        self._add_tag("@", context, _CONTEXT_RE, "contexts")
+
+    def add_project(self, project: str) -> None:
+        """Add a project to the task, if it isn't already present.
+
+        Args:
+            project: Project to add, without the leading ``+``.
+
+        Raises:
+            ValueError: If the project isn't valid.
+        """
+        self._add_tag("+", project, _PROJECT_RE, "projects")
+
+    def set_attr(self, key: str, value: str | datetime.date | None) -> None:
+        """Set, replace, or remove a ``key:value`` attribute.
+
+        An existing attribute is replaced where it is, and new attributes are
+        added at the end of the task.
+
+        Args:
+            key: Name of the attribute.
+            value: New value, or ``None`` to remove the attribute.
+
+        Raises:
+            ValueError: If the key or value isn't valid.
+        """
+        if key == "pri":
+            raise ValueError("Use set_priority to change the priority")
+        if isinstance(value, datetime.date):
+            value = value.isoformat()
+        word = None if value is None else f"{key}:{value}"
+        if not _ATTR_RE.fullmatch(word or f"{key}:_"):
+            raise ValueError(f"Invalid attribute {word or key!r}")
+        prefix = f"{key}:"
+        text = self.text
+        if prefix not in text:
+            if word is not None:
+                fields = _word_fields(word)
+                self._edit(
+                    f"{text} {word}" if text else word, fields, len(text)
+                )
+            return
+
+        def match(word: str) -> bool:
+            return prefix in word and any(
+                k == key for k, _ in _ATTR_RE.findall(word)
             )
-            """,
-            self.text,
-            re.VERBOSE,
-        ):
-            if k == "pri":
-                continue
-            if k in d:
-                raise KeyError(f"Duplicate key {k}")
-            try:
-                v = datetime.date.fromisoformat(v)
-            except ValueError:
-                pass
-            d[k] = v
-        return d
+
+        text, fields, start = _rewrite_words(text, match, word)
+        self._edit(text, fields, start)
+
+    def parse_all(self) -> typing.Self:
+        """Populate all properties in a single pass over the text.
+
+        The properties are normally computed lazily on first access, which is
+        the right choice when only a few of them are used.  When *every*
+        property is going to be inspected it is considerably cheaper to fill
+        them all at once.
+
+        Returns:
+            The entry, to allow chaining.
+        """
+        self._populate(_tokenize(self.text))
+        return self
 
     def __eq__(self, other, /):
         if not hasattr(other, "text"):
@@ -259,22 +992,3379 @@ class Entry:
             return False
 
 
-class Entries(list):
-    """Represent a task list.
+class Entry(_BaseEntry):
+    """Represent a task.
 
-    This is simply a convenience class for holding a collection of ``Entry``
-    objects, and a space to tie custom methods for operating on them.
+    Encapsulates the complete details of a task; full text description,
+    completion status, priority, creation and completion dates, contexts, and
+    projects.
     """
 
+    def __init__(
+        self,
+        text: str,
+        /,
+        *,
+        lineno: int | None = None,
+        offset: int | None = None,
+    ) -> None:
+        # Bypass the ``__setattr__`` guard, as it is expensive when loading
+        # large files and can't apply to these attributes.
+        object.__setattr__(self, "_text", text)
+        if lineno is not None:
+            object.__setattr__(self, "lineno", lineno)
+        if offset is not None:
+            object.__setattr__(self, "offset", offset)
+
     @classmethod
-    def parse_file(cls, file: str) -> typing.Self:
-        """Parse a file containing tasks in ``todo.txt`` format.
+    def _from_bytes(
+        cls,
+        raw: bytes,
+        encoding: str,
+        /,
+        *,
+        lineno: int | None = None,
+        offset: int | None = None,
+    ) -> typing.Self:
+        entry = cls.__new__(cls)
+        # UTF-8 is by far the common case, so avoid storing it per entry
+        object.__setattr__(
+            entry, "_raw", raw if encoding == "utf-8" else (raw, encoding)
+        )
+        object.__setattr__(entry, "lineno", lineno)
+        object.__setattr__(entry, "offset", offset)
+        return entry
 
-        Args:
-            file: The path to the file containing task entries.
+    def __setattr__(self, name, value, /):
+        if isinstance(
+            getattr(type(self), name, None), functools.cached_property
+        ):
+            raise AttributeError(f"Cannot set attribute '{name}'.")
+        super().__setattr__(name, value)
 
-        Returns:
-            The list of ``Entry`` objects contained in the given file.
-        """
-        with open(file) as fh:
-            return cls(Entry(line.rstrip()) for line in fh if line.strip())
+    def __getstate__(self) -> dict[str, typing.Any]:
+        # Copies aren't in the original's indexes, and the weak references to
+        # them can't be pickled
+        return {k: v for k, v in self.__dict__.items() if k != "_observers"}
+
+    def _cached(self, name: str) -> typing.Any:
+        return self.__dict__.get(name, _UNSET)
+
+    def _invalidate_fields(self, fields: typing.Collection[str]) -> None:
+        cache = self.__dict__
+        for name in fields:
+            cache.pop(name, None)
+        cache.pop("_sort_key", None)
+        cache.pop("_record", None)
+        cache.pop("_extracted", None)
+
+    def _invalidate(self) -> None:
+        for attr in _FIELDS:
+            self.__dict__.pop(attr, None)
+        self.__dict__.pop("_sort_key", None)
+        self.__dict__.pop("_record", None)
+        self.__dict__.pop("_extracted", None)
+
+    @functools.cached_property
+    def complete(self) -> bool:
+        return self._parse("complete", _extract_complete)
+
+    @functools.cached_property
+    def completion_date(self) -> datetime.date | None:
+        return self._parse("completion_date", _extract_completion_date)
+
+    @functools.cached_property
+    def creation_date(self) -> datetime.date | None:
+        return self._parse("creation_date", _extract_creation_date)
+
+    @functools.cached_property
+    def priority(self) -> Priority | None:
+        return self._parse("priority", _extract_priority)
+
+    @functools.cached_property
+    def contexts(self) -> list[Context]:
+        return self._parse("contexts", _extract_contexts)
+
+    @functools.cached_property
+    def projects(self) -> list[Project]:
+        return self._parse("projects", _extract_projects)
+
+    @functools.cached_property
+    def attrs(self) -> dict[str, str | datetime.date]:
+        return self._parse("attrs", _extract_attrs)
+
+    def _populate(self, fields: dict[str, typing.Any]) -> None:
+        self.__dict__.update(fields)
+
+
+class FrozenEntry(Entry):
+    """Represent a task, with text that can't be changed.
+
+    As the text is fixed these entries are hashable, so they can be used in
+    sets and as dictionary keys.  Entries are equal to, and hash the same as,
+    any other ``FrozenEntry`` with the same text.
+    """
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @text.setter
+    def text(self, value: str, /) -> None:
+        raise AttributeError("Cannot change the text of a FrozenEntry.")
+
+    def __hash__(self) -> int:
+        return hash(self.text)
+
+    def _edit(self, text: str, fields: set[str], start: int) -> None:
+        raise AttributeError("Cannot change the text of a FrozenEntry.")
+
+
+# Marker for ``CompactEntry`` slots that haven't been computed yet
+_UNSET: typing.Any = object()
+
+# Slot holding each field of a ``CompactEntry``
+_COMPACT_SLOTS = {name: f"_{name}" for name in _FIELDS}
+
+# Shared empty attribute mapping for ``CompactEntry``
+_NO_ATTRS: typing.Mapping[str, str | datetime.date] = types.MappingProxyType({})
+
+
+def _compact_tags(tags: list[str]) -> tuple[str, ...]:
+    # Tags repeat heavily across a task list, so store a single copy of each
+    return tuple(map(sys.intern, tags)) if tags else ()
+
+
+def _compact_attrs(
+    attrs: dict[str, str | datetime.date],
+) -> typing.Mapping[str, str | datetime.date]:
+    if not attrs:
+        return _NO_ATTRS
+    return types.MappingProxyType({sys.intern(k): v for k, v in attrs.items()})
+
+
+class CompactEntry(_BaseEntry):
+    """Represent a task, with a minimal memory footprint.
+
+    This provides the same interface as ``Entry``, but stores computed values
+    in slots instead of an instance dictionary.  Contexts and projects are
+    returned as tuples of interned strings, and attributes as a read-only
+    mapping, so that empty values can be shared between all instances.
+
+    Prefer this over ``Entry`` when holding very large task lists in memory.
+    """
+
+    __slots__ = (
+        "_attrs",
+        "_complete",
+        "_completion_date",
+        "_contexts",
+        "_creation_date",
+        "_extracted",
+        "_observers",
+        "_priority",
+        "_projects",
+        "_raw",
+        "_record",
+        "_sort_key",
+        "_text",
+        "lineno",
+        "offset",
+    )
+
+    def __init__(
+        self,
+        text: str,
+        /,
+        *,
+        lineno: int | None = None,
+        offset: int | None = None,
+    ) -> None:
+        self._text = text
+        self.lineno = lineno
+        self.offset = offset
+        self._observers = ()
+        self._invalidate()
+
+    @classmethod
+    def _from_bytes(
+        cls,
+        raw: bytes,
+        encoding: str,
+        /,
+        *,
+        lineno: int | None = None,
+        offset: int | None = None,
+    ) -> typing.Self:
+        entry = cls.__new__(cls)
+        entry._raw = raw if encoding == "utf-8" else (raw, encoding)
+        entry.lineno = lineno
+        entry.offset = offset
+        entry._observers = ()
+        entry._invalidate()
+        return entry
+
+    def __getstate__(self) -> tuple[str, int | None, int | None]:
+        # Computed values include markers and read-only mappings, which can't
+        # be pickled, so only the text is kept and the rest parsed again.
+        # Copies aren't in the original's indexes either.
+        return self.text, self.lineno, self.offset
+
+    def __setstate__(self, state: tuple[str, int | None, int | None]) -> None:
+        self._text, self.lineno, self.offset = state
+        self._observers = ()
+        self._invalidate()
+
+    def _cached(self, name: str) -> typing.Any:
+        return getattr(self, _COMPACT_SLOTS[name])
+
+    def _invalidate_fields(self, fields: typing.Collection[str]) -> None:
+        for name in fields:
+            setattr(self, f"_{name}", _UNSET)
+        self._sort_key = None
+        self._record = None
+        self._extracted = None
+
+    def _invalidate(self) -> None:
+        self._complete = self._completion_date = self._creation_date = _UNSET
+        self._priority = self._contexts = self._projects = self._attrs = _UNSET
+        self._sort_key = None
+        self._record = None
+        self._extracted = None
+
+    @property
+    def complete(self) -> bool:
+        if self._complete is _UNSET:
+            self._complete = self._parse("complete", _extract_complete)
+        return self._complete
+
+    @property
+    def completion_date(self) -> datetime.date | None:
+        if self._completion_date is _UNSET:
+            self._completion_date = self._parse(
+                "completion_date", _extract_completion_date
+            )
+        return self._completion_date
+
+    @property
+    def creation_date(self) -> datetime.date | None:
+        if self._creation_date is _UNSET:
+            self._creation_date = self._parse(
+                "creation_date", _extract_creation_date
+            )
+        return self._creation_date
+
+    @property
+    def priority(self) -> Priority | None:
+        if self._priority is _UNSET:
+            self._priority = self._parse("priority", _extract_priority)
+        return self._priority
+
+    @property
+    def contexts(self) -> tuple[Context, ...]:
+        if self._contexts is _UNSET:
+            self._contexts = _compact_tags(
+                self._parse("contexts", _extract_contexts)
+            )
+        return self._contexts
+
+    @property
+    def projects(self) -> tuple[Project, ...]:
+        if self._projects is _UNSET:
+            self._projects = _compact_tags(
+                self._parse("projects", _extract_projects)
+            )
+        return self._projects
+
+    @property
+    def attrs(self) -> typing.Mapping[str, str | datetime.date]:
+        if self._attrs is _UNSET:
+            self._attrs = _compact_attrs(self._parse("attrs", _extract_attrs))
+        return self._attrs
+
+    def _populate(self, fields: dict[str, typing.Any]) -> None:
+        for name in _FIELDS[:4]:
+            if name in fields:
+                setattr(self, f"_{name}", fields[name])
+        self._contexts = _compact_tags(fields["contexts"])
+        self._projects = _compact_tags(fields["projects"])
+        if "attrs" in fields:
+            self._attrs = _compact_attrs(fields["attrs"])
+
+
+# Classes that can be used to represent tasks in an ``Entries`` list
+_EntryClass = type[Entry] | type[CompactEntry]
+
+# Match a line containing something other than ASCII whitespace, splitting on
+# the same line endings as universal newlines mode.  Group one is only set when
+# the line begins with a byte that could be non-ASCII whitespace, or one of the
+# ASCII separator characters that ``str.strip`` removes.
+_RAW_LINE_RE = _lazy_compile(
+    rb"""
+    (?<![^\r\n])              # Start of a line
+    [\ \t\x0b\x0c]*            # Leading whitespace
+    (?:
+        [^\s\x1c-\x1f\x80-\xff]
+        |
+        ([\x1c-\x1f\x80-\xff])
+    )
+    [^\r\n]*                  # Remainder of the line
+    """,
+    re.VERBOSE,
+)
+
+
+# Size of the window to process before releasing pages from a memory map
+_MMAP_RELEASE_SIZE = 16 * 2**20
+
+
+def _count_lines(data: bytes, start: int = 0, end: int | None = None) -> int:
+    """Count line terminators, as recognised by universal newlines mode."""
+    return (
+        data.count(b"\n", start, end)
+        + data.count(b"\r", start, end)
+        - data.count(b"\r\n", start, end)
+    )
+
+
+def _iter_line_spans(
+    buf: "bytes | mmap.mmap", encoding: str, start: int = 0, end: int = -1
+) -> typing.Iterator[tuple[int, int, int]]:
+    """Find non-blank lines in an encoded buffer.
+
+    Lines are split, and blank lines skipped, exactly as when iterating over a
+    file opened in text mode.  ``encoding`` must be ASCII compatible.
+
+    Args:
+        buf: Buffer to search.
+        encoding: Encoding of the text in ``buf``.
+        start: Offset to begin searching from, which must be the start of a
+            line.
+        end: Offset to stop searching at, which must be the end of a line.
+
+    Yields:
+        One-based line number relative to ``start``, and start and end offsets
+        of each line excluding the line terminator.
+    """
+    if end == -1:
+        end = len(buf)
+    lineno = 1
+    prev = start
+    for m in _RAW_LINE_RE.finditer(buf, start, end):
+        line_start, line_end = m.span()
+        # The gap between lines is normally a single terminator
+        if line_start - prev == 1:
+            lineno += 1
+        elif line_start != prev:
+            lineno += _count_lines(buf[prev:line_start])
+        prev = line_end
+        if (
+            m.lastindex
+            and not buf[line_start:line_end].decode(encoding).strip()
+        ):
+            continue
+        yield lineno, line_start, line_end
+
+
+_LINE_END_RE = _lazy_compile(rb"[\r\n]")
+
+
+def _iter_newline_spans(buf: bytes) -> typing.Iterator[tuple[int, int, int]]:
+    """Split an encoded buffer that only uses ``\n`` terminators in to lines.
+
+    This is much faster than ``_iter_line_spans`` for such buffers, but only
+    skips empty lines, not those containing whitespace.
+
+    Args:
+        buf: Buffer to split.
+
+    Yields:
+        One-based line number, and start and end offsets of each line
+        excluding the line terminator.
+    """
+    start = 0
+    for lineno, line in enumerate(buf.split(b"\n"), 1):
+        end = start + len(line)
+        if line:
+            yield lineno, start, end
+        start = end + 1
+
+
+def _iter_candidate_spans(
+    buf: bytes, pattern: re.Pattern[bytes]
+) -> typing.Iterator[tuple[int, int, int]]:
+    """Find the lines in an encoded buffer containing a match for a pattern.
+
+    Lines are split as for ``_iter_line_spans``, but the buffer is searched
+    for ``pattern`` directly, and only lines with a match are located.
+
+    Args:
+        buf: Buffer to search.
+        pattern: Pattern to search for, which must not match line terminators.
+
+    Yields:
+        One-based line number, and start and end offsets of each line
+        excluding the line terminator.
+    """
+    # Nearly all files only use ``\n``, and then lines can be found and
+    # counted with a single scan of the text between matches.
+    universal = b"\r" in buf
+    lineno = 1
+    # Start of the last line found, which line numbers are counted from
+    counted = 0
+    pos = 0
+    while m := pattern.search(buf, pos):
+        hit = m.start()
+        if universal:
+            start = max(
+                counted,
+                buf.rfind(b"\n", counted, hit) + 1,
+                buf.rfind(b"\r", counted, hit) + 1,
+            )
+            lineno += _count_lines(buf, counted, start)
+            e = _LINE_END_RE.search(buf, m.end())
+            pos = e.start() if e else len(buf)
+        else:
+            start = max(counted, buf.rfind(b"\n", counted, hit) + 1)
+            lineno += buf.count(b"\n", counted, start)
+            pos = buf.find(b"\n", m.end())
+            if pos == -1:
+                pos = len(buf)
+        counted = start
+        yield lineno, start, pos
+
+
+# Amount of text read, and then parsed, between returning control to the event
+# loop in the async API
+_ASYNC_READ_SIZE = 64 * 2**10
+
+# Files smaller than this are parsed in process, as starting workers would
+# cost more than parsing the file
+_PARALLEL_MIN_SIZE = 4 * 2**20
+
+# Compact, picklable, form of a parsed line.  This is line number relative to
+# the start of its range, byte offset, text, completion state, completion and
+# creation date ordinals, priority value, contexts, projects, and attribute
+# pairs with dates as ordinals.  Dates and priority use zero for ``None`` and
+# -1 for values that raise, which are left to be computed lazily along with
+# attributes of ``None``.
+_Record = tuple[
+    int,
+    int,
+    str,
+    bool,
+    int,
+    int,
+    int,
+    tuple[str, ...],
+    tuple[str, ...],
+    tuple[tuple[str, str | int], ...] | None,
+]
+
+
+def _encode_record(
+    lineno: int, offset: int, text: str, fields: dict[str, typing.Any]
+) -> _Record:
+    def ordinal(value: datetime.date | None | object) -> int:
+        if isinstance(value, datetime.date):
+            return value.toordinal()
+        return 0 if value is None else -1
+
+    priority = fields.get("priority", _UNSET)
+    attrs = fields.get("attrs")
+    return (
+        lineno,
+        offset,
+        text,
+        fields["complete"],
+        ordinal(fields.get("completion_date", _UNSET)),
+        ordinal(fields.get("creation_date", _UNSET)),
+        -1 if priority is _UNSET else priority.value if priority else 0,
+        # Interned tags are shared, and so only pickled once per range
+        tuple(map(sys.intern, fields["contexts"])),
+        tuple(map(sys.intern, fields["projects"])),
+        None
+        if attrs is None
+        else tuple(
+            (k, v.toordinal() if isinstance(v, datetime.date) else v)
+            for k, v in attrs.items()
+        ),
+    )
+
+
+# Large files repeat the same dates many times, so share them
+_ordinal_date = functools.lru_cache(maxsize=4096)(datetime.date.fromordinal)
+
+
+def _record_date(ordinal: int) -> datetime.date | None | object:
+    if ordinal > 0:
+        return _ordinal_date(ordinal)
+    return None if ordinal == 0 else _UNSET
+
+
+def _record_priority(value: int) -> Priority | None | object:
+    if value > 0:
+        return Priority(value)
+    return None if value == 0 else _UNSET
+
+
+def _record_attrs(
+    pairs: tuple[tuple[str, str | int], ...] | None,
+) -> dict[str, str | datetime.date] | object:
+    if pairs is None:
+        return _UNSET
+    return {k: _ordinal_date(v) if isinstance(v, int) else v for k, v in pairs}
+
+
+# Convert ``_Record`` fields back to their property values, or ``_UNSET`` for
+# values that need to be computed from the text
+_RECORD_FIELDS: dict[str, typing.Callable[[_Record], typing.Any]] = {
+    "complete": lambda record: record[3],
+    "completion_date": lambda record: _record_date(record[4]),
+    "creation_date": lambda record: _record_date(record[5]),
+    "priority": lambda record: _record_priority(record[6]),
+    "contexts": lambda record: list(record[7]),
+    "projects": lambda record: list(record[8]),
+    "attrs": lambda record: _record_attrs(record[9]),
+}
+
+
+def _parse_range(
+    file: str | os.PathLike[str], start: int, end: int, encoding: str
+) -> tuple[int, list[_Record]]:
+    """Parse a newline aligned range of a file, for use in worker processes.
+
+    Returns:
+        Number of lines in the range, and records for each non-blank line.
+    """
+    with open(file, "rb") as fh:
+        fh.seek(start)
+        data = fh.read(end - start)
+    records = []
+    for lineno, line_start, line_end in _iter_line_spans(data, encoding):
+        text = data[line_start:line_end].decode(encoding).rstrip()
+        records.append(
+            _encode_record(lineno, start + line_start, text, _tokenize(text))
+        )
+    return _count_lines(data), records
+
+
+# Bump when the cache format, or the values stored in it, change
+_CACHE_VERSION = 2
+
+# Files modified this recently may be changed again without their fingerprint
+# changing, so aren't trusted on the next load
+_CACHE_RACY_NS = 2 * 10**9
+
+
+class _CacheHeader:
+    """The start of a parse cache, describing the sections that follow it.
+
+    This is stored as a marshalled tuple of the arguments.  Sections are given
+    by their offset from the end of the header, and size.
+    """
+
+    __slots__ = (
+        "encoding",
+        "fingerprint",
+        "postings",
+        "records",
+        "spans",
+        "version",
+    )
+
+    def __init__(
+        self,
+        version: int,
+        fingerprint: tuple[int, int, int] | None,
+        encoding: str,
+        records: tuple[int, int],
+        spans: tuple[int, int],
+        postings: dict["_IndexKey", tuple[int, int]],
+    ) -> None:
+        self.version = version
+        # Size, modification time, and inode of the file when it was cached,
+        # or ``None`` if it may have changed since
+        self.fingerprint = fingerprint
+        self.encoding = encoding
+        # Marshalled list of a ``_Record`` for each line
+        self.records = records
+        # Line number, and start and end offsets, of each line as an array
+        self.spans = spans
+        # Array of the lines containing each index key, see ``_record_keys``
+        self.postings = postings
+
+
+def _cache_path(
+    file: str | os.PathLike[str], cache_dir: str | os.PathLike[str] | None
+) -> str:
+    """Find the location of a file's parse cache."""
+    import hashlib
+
+    if cache_dir is None:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(
+            "~/.cache"
+        )
+        cache_dir = os.path.join(base, "penelopise")
+    key = hashlib.sha256(os.fsencode(os.path.abspath(file))).hexdigest()
+    return os.path.join(cache_dir, key)
+
+
+def _map_cache(
+    path: str,
+) -> "mmap.mmap | contextlib.nullcontext[bytes]":
+    """Map a parse cache in to memory, producing ``b""`` if it can't be.
+
+    Returns:
+        A context manager producing the cache's contents.
+    """
+    import contextlib
+    import mmap
+
+    try:
+        with open(path, "rb") as fh:
+            # The map holds its own reference to the file
+            return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Empty files can't be mapped either
+        return contextlib.nullcontext(b"")
+
+
+def _read_cache_header(
+    buf: "bytes | mmap.mmap", encoding: str
+) -> tuple[_CacheHeader, int] | None:
+    """Read a parse cache's header, ignoring it if it is unusable.
+
+    Returns:
+        The header, and the offset its sections are relative to.
+    """
+    import marshal
+
+    base = 8 + int.from_bytes(buf[:8], "little")
+    try:
+        header = _CacheHeader(*marshal.loads(buf[8:base]))
+        sections = [header.records, header.spans, *header.postings.values()]
+        # Sections are stored in order, with nothing after the last
+        complete = len(buf) == base + sum(size for _, size in sections)
+    except (AttributeError, EOFError, TypeError, ValueError):
+        return None
+    if (
+        header.version != _CACHE_VERSION
+        or header.encoding != encoding
+        or not complete
+    ):
+        return None
+    return header, base
+
+
+def _read_cache(
+    buf: "bytes | mmap.mmap", encoding: str
+) -> tuple[tuple[int, int, int] | None, list[_Record]]:
+    """Read the records from a parse cache, ignoring it if it is unusable.
+
+    Returns:
+        The fingerprint of the file when the cache was written, and records
+        for each of its lines.
+    """
+    import marshal
+
+    if (found := _read_cache_header(buf, encoding)) is None:
+        return None, []
+    header, base = found
+    start, size = header.records
+    try:
+        records = marshal.loads(buf[base + start : base + start + size])
+    except (EOFError, TypeError, ValueError):
+        return None, []
+    return header.fingerprint, records
+
+
+def _record_keys(record: _Record) -> tuple["_IndexKey", ...]:
+    """Find the index keys of a record's entry, as ``_index_keys`` does.
+
+    Values are as stored in the record, see ``_cache_key``.
+    """
+    keys: list[_IndexKey] = [("context", c) for c in record[7]]
+    keys.extend(("project", p) for p in record[8])
+    if record[9] is not None:
+        for k, v in record[9]:
+            keys.extend((("attr", k), ("attr", k, v)))
+    if record[6] >= 0:
+        keys.append(("priority", record[6]))
+    return tuple(dict.fromkeys(keys))
+
+
+def _cache_key(key: "_IndexKey") -> "_IndexKey":
+    """Convert an index key to the form used in parse cache postings."""
+    return tuple(
+        v.toordinal()
+        if isinstance(v, datetime.date)
+        else 0
+        if v is None
+        else int(v)
+        if isinstance(v, Priority)
+        else v
+        for v in key
+    )
+
+
+def _cached_rows(
+    buf: "bytes | mmap.mmap", base: int, header: _CacheHeader, query: "Query"
+) -> list[int] | None:
+    """Select the lines of a parse cache that may match a query.
+
+    Terms are answered from the cache's postings as in ``EntryIndex.query``,
+    and the lines selected still need testing against any other terms.
+
+    Returns:
+        Sorted line positions in the cached records, or ``None`` if no term
+        selects lines, and so every line would need testing.
+    """
+    import array
+
+    found: set[int] | None = None
+    excluded: set[int] = set()
+    for term in query._terms:
+        if term.keys is None:
+            continue
+        rows: set[int] = set()
+        for key in term.keys:
+            if (section := header.postings.get(_cache_key(key))) is not None:
+                start, size = section
+                rows.update(
+                    array.array("I", buf[base + start : base + start + size])
+                )
+        if term.negate:
+            excluded |= rows
+        else:
+            found = rows if found is None else found & rows
+    if found is None:
+        return None
+    return sorted(found - excluded)
+
+
+def _write_cache(
+    path: str,
+    fingerprint: tuple[int, int, int] | None,
+    encoding: str,
+    records: list[_Record],
+    spans: "array.array[int]",
+) -> None:
+    """Write a parse cache, if possible."""
+    import array
+    import marshal
+
+    postings: dict[_IndexKey, array.array[int]] = {}
+    for row, record in enumerate(records):
+        for key in _record_keys(record):
+            if (rows := postings.get(key)) is None:
+                rows = postings[key] = array.array("I")
+            rows.append(row)
+
+    sections = [marshal.dumps(records), spans.tobytes()]
+    sections.extend(rows.tobytes() for rows in postings.values())
+    locations = []
+    offset = 0
+    for section in sections:
+        locations.append((offset, len(section)))
+        offset += len(section)
+    # The arguments to ``_CacheHeader``
+    header = marshal.dumps(
+        (
+            _CACHE_VERSION,
+            fingerprint,
+            encoding,
+            locations[0],
+            locations[1],
+            dict(zip(postings, locations[2:], strict=True)),
+        )
+    )
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _atomic_write(
+            path, [len(header).to_bytes(8, "little"), header, *sections]
+        )
+    except OSError:
+        # The cache is only an optimisation, so failing to write it is fine
+        pass
+
+
+class _GCPaused:
+    """Pause garbage collection while creating a large number of objects.
+
+    Bulk loading creates many long lived containers, and the collector
+    repeatedly scanning them can more than double the time taken.
+    """
+
+    __slots__ = ("_enabled",)
+
+    def __enter__(self) -> None:
+        import gc
+
+        self._enabled = gc.isenabled()
+        gc.disable()
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._enabled:
+            import gc
+
+            gc.enable()
+
+
+def _split_ranges(file: str | os.PathLike[str], count: int) -> list[int]:
+    """Find boundaries splitting a file in to ``count`` newline aligned ranges.
+
+    Returns:
+        Offsets of range boundaries, including the start and end of the file.
+    """
+    import mmap
+
+    with open(file, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size == 0:
+            return [0, 0]
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            bounds = [0]
+            for i in range(1, count):
+                # Splitting after a "\n" can't break a "\r\n" pair
+                pos = buf.find(b"\n", max(size * i // count, bounds[-1]))
+                if pos == -1:
+                    break
+                if pos + 1 < size:
+                    bounds.append(pos + 1)
+            bounds.append(size)
+    return bounds
+
+
+def _atomic_write(
+    file: str | os.PathLike[str], chunks: typing.Iterable[bytes]
+) -> None:
+    """Replace a file's contents, such that it is never left incomplete.
+
+    The data is written to a temporary file in the same directory, which is
+    synced to disk and then renamed over ``file``.  Symbolic links are
+    followed, so that the file they point to is replaced rather than the link.
+    """
+    path = os.path.realpath(file)
+    directory, name = os.path.split(path)
+    try:
+        # Permission bits, as ``stat.S_IMODE`` gives
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = None
+    while True:
+        temp = os.path.join(directory, f".{name}.{os.urandom(6).hex()}")
+        try:
+            # Created like ``open`` would create a new file, so that the umask
+            # applies without having to be read
+            fd = os.open(temp, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+        except FileExistsError:
+            continue
+        break
+    try:
+        with open(fd, "wb") as fh:
+            fh.writelines(chunks)
+            fh.flush()
+            os.fsync(fh.fileno())
+        if mode is not None:
+            os.chmod(temp, mode)
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+    if os.name == "posix":
+        # Make sure the rename itself is durable
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _patch_lines(
+    file: str | os.PathLike[str],
+    entries: typing.Iterable[Entry | CompactEntry],
+    encoding: str,
+) -> bool:
+    """Overwrite the lines of changed entries in place.
+
+    This is only possible when every entry has a known offset, and its new text
+    is the same length as the line currently at that offset.
+
+    Returns:
+        Whether the entries were written.
+    """
+    patches = []
+    with open(file, "r+b") as fh:
+        for entry in entries:
+            if entry.offset is None:
+                return False
+            data = entry.text.encode(encoding)
+            fh.seek(max(entry.offset - 1, 0))
+            # Read the previous byte and the one after, to check that the
+            # offset is still at a line boundary
+            current = fh.read(len(data) + 1 + (entry.offset > 0))
+            if entry.offset > 0:
+                if current[:1] not in b"\r\n":
+                    return False
+                current = current[1:]
+            if (
+                len(current) < len(data)
+                or b"\n" in current[: len(data)]
+                or b"\r" in current[: len(data)]
+                or current[len(data) :] not in (b"", b"\r", b"\n")
+            ):
+                return False
+            patches.append((entry.offset, data))
+        for offset, data in patches:
+            fh.seek(offset)
+            fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+    return True
+
+
+# Key identifying a posting list in an ``EntryIndex``
+_IndexKey = tuple[typing.Any, ...]
+
+
+# Index keys for tags that are given ids, and the sigil of each
+_TAG_SIGILS = {"context": "@", "project": "+"}
+
+
+def _index_keys(entry: Entry | CompactEntry) -> tuple[_IndexKey, ...]:
+    keys: list[_IndexKey] = [("context", c) for c in entry.contexts]
+    keys.extend(("project", p) for p in entry.projects)
+    # Entries with malformed values are still indexed, just not under the
+    # field that fails to parse
+    try:
+        for k, v in entry.attrs.items():
+            keys.extend((("attr", k), ("attr", k, v)))
+    except KeyError:
+        pass
+    try:
+        keys.append(("priority", entry.priority))
+    except ValueError:
+        pass
+    # Tags may be repeated within a single entry
+    return tuple(dict.fromkeys(keys))
+
+
+_QUERY_COMPARISON_RE = _lazy_compile(r"([^\s<>=!:]+)(<=|>=|!=|<|>|=|:)(\S+)")
+
+_QUERY_OPERATORS: dict[str, typing.Callable[[typing.Any, typing.Any], bool]] = {
+    "=": operator.eq,
+    ":": operator.eq,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+# Scan pattern for completed entries, see ``_QueryTerm``
+_COMPLETE_SCAN = (2, r"(?<![^\r\n])x ")
+
+
+class _QueryTerm:
+    __slots__ = ("cost", "keys", "negate", "scan", "test")
+
+    def __init__(
+        self,
+        cost: int,
+        test: typing.Callable[[Entry | CompactEntry], bool],
+        negate: bool,
+        keys: tuple[_IndexKey, ...] | None,
+        scan: tuple[int, str] | None = None,
+    ) -> None:
+        # Relative cost of ``test``, cheapest terms are checked first
+        self.cost = cost
+        self.test = test
+        self.negate = negate
+        # Index keys whose postings together hold the entries matching the
+        # non-negated term, or ``None`` if the index can't answer it
+        self.keys = keys
+        # Pattern found in the raw line of every entry matching the term, and
+        # the length of its shortest literal, or ``None`` if there isn't one
+        self.scan = scan
+
+
+def _guarded(
+    field: typing.Callable[[Entry | CompactEntry], bool],
+    precheck: typing.Callable[[str], bool],
+    negate: bool,
+) -> typing.Callable[[Entry | CompactEntry], bool]:
+    """Wrap a field test with a cheap check of the entry's text.
+
+    ``precheck`` must be true for any entry that ``field`` matches, so that
+    most entries are rejected without parsing.  Entries with a field that
+    can't be parsed don't match it, as they aren't indexed under it.
+    """
+
+    def test(entry: Entry | CompactEntry) -> bool:
+        if not precheck(entry.text):
+            return negate
+        try:
+            return field(entry) is not negate
+        except (KeyError, ValueError):
+            return negate
+
+    return test
+
+
+def _compile_term(term: str) -> _QueryTerm:
+    negate = term.startswith("!")
+    if negate:
+        term = term[1:]
+    if not term:
+        raise ValueError("Empty query term")
+
+    if term == "complete":
+        return _QueryTerm(
+            0,
+            lambda e: e.text.startswith("x ") is not negate,
+            negate,
+            None,
+            None if negate else _COMPLETE_SCAN,
+        )
+
+    if term[0] in "@+" and len(term) > 1:
+        tag = term[1:]
+        attr = "contexts" if term[0] == "@" else "projects"
+        return _QueryTerm(
+            2,
+            _guarded(
+                lambda e: tag in getattr(e, attr), lambda t: term in t, negate
+            ),
+            negate,
+            (("context" if term[0] == "@" else "project", tag),),
+            None if negate else (len(term), re.escape(term)),
+        )
+
+    m = _QUERY_COMPARISON_RE.fullmatch(term)
+    if not m:
+        return _QueryTerm(
+            1,
+            lambda e: (term in e.text) is not negate,
+            negate,
+            None,
+            None if negate else (len(term), re.escape(term)),
+        )
+
+    key, symbol, raw = m.groups()
+    if symbol == "!=":
+        negate = not negate
+        symbol = "="
+    op = _QUERY_OPERATORS[symbol]
+    value: typing.Any
+
+    if key == "pri":
+        if (value := _PRIORITIES.get(raw)) is None:
+            raise ValueError(f"Invalid priority value {raw}")
+        marker = f"({raw})"
+        markers = [f"({p.name})" for p in Priority if op(p, value)]
+        return _QueryTerm(
+            3,
+            _guarded(
+                lambda e: e.priority is not None and op(e.priority, value),
+                (lambda t: marker in t or "pri:" in t)
+                if op is operator.eq
+                else (lambda t: True),
+                negate,
+            ),
+            negate,
+            tuple(("priority", p) for p in Priority if op(p, value)),
+            None
+            if negate
+            else (3, "|".join(map(re.escape, [*markers, "pri:"]))),
+        )
+
+    if key in {"created", "completed"}:
+        value = datetime.date.fromisoformat(raw)
+        name = "creation_date" if key == "created" else "completion_date"
+
+        def date_test(entry: Entry | CompactEntry) -> bool:
+            date = getattr(entry, name)
+            return date is not None and op(date, value)
+
+        return _QueryTerm(
+            4,
+            _guarded(
+                date_test,
+                (lambda t: t.startswith("x "))
+                if key == "completed"
+                else (lambda t: True),
+                negate,
+            ),
+            negate,
+            None,
+            _COMPLETE_SCAN if key == "completed" and not negate else None,
+        )
+
+    try:
+        value = datetime.date.fromisoformat(raw)
+    except ValueError:
+        value = raw
+    kind = type(value)
+    prefix = key + ":"
+
+    def attr_test(entry: Entry | CompactEntry) -> bool:
+        found = entry.attrs.get(key)
+        return isinstance(found, kind) and op(found, value)
+
+    return _QueryTerm(
+        5,
+        _guarded(attr_test, lambda t: prefix in t, negate),
+        negate,
+        (("attr", key, value),) if op is operator.eq else None,
+        None if negate else (len(prefix), re.escape(prefix)),
+    )
+
+
+class Query:
+    """A compiled query for selecting entries.
+
+    Queries are whitespace separated terms, all of which must match.  Each
+    term may be negated with a leading ``!``.
+
+    ``complete``
+        Completed entries.
+    ``@context``, ``+project``
+        Entries with the given context or project.
+    ``pri=B``
+        Entries by priority, also accepting ``!=``, ``<``, ``<=``, ``>``, and
+        ``>=``.  Higher priorities compare as greater, so ``pri>=B`` matches
+        ``A`` and ``B`` priority entries.
+    ``created<2025-01-01``, ``completed>=2025-01-01``
+        Entries by creation or completion date, accepting the same operators.
+        These hide any attributes with the same names.
+    ``key:value``
+        Entries by attribute, accepting ``=`` and the operators above.  Values
+        that look like dates are compared as dates.
+    Anything else
+        Entries containing the term in their text.
+
+    For example, to match incomplete ``+Work`` tasks in ``@office`` of at
+    least ``B`` priority that are due before November::
+
+        query = Query("+Work @office pri>=B due<2026-11-01 !complete")
+
+    Terms are reordered so that cheap checks against an entry's text run
+    first, and the more expensive fields are only parsed for entries that
+    could match.  Entries are tested by calling the query.  Entries with a
+    field that can't be parsed don't match terms on that field.  See
+    ``Entries.filter_file`` for applying a query while reading a file.
+
+    Args:
+        query: Query to compile.
+
+    Raises:
+        ValueError: If a priority or date in the query is invalid.
+    """
+
+    __slots__ = ("_scan", "_terms", "_tests", "text")
+
+    def __init__(self, query: str) -> None:
+        self.text = query
+        self._terms = tuple(
+            sorted(map(_compile_term, query.split()), key=lambda t: t.cost)
+        )
+        self._tests = tuple(term.test for term in self._terms)
+        # Longer literals are generally rarer, so they are used to find
+        # candidate lines
+        scans = [term.scan for term in self._terms if term.scan]
+        self._scan = (
+            max(scans, key=operator.itemgetter(0))[1] if scans else None
+        )
+
+    def _scan_pattern(self, encoding: str) -> re.Pattern[bytes] | None:
+        """Pattern matching some part of every matching line, if possible."""
+        if self._scan is None:
+            return None
+        return re.compile(self._scan.encode(encoding))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}({self.text!r})"
+
+    def __call__(self, entry: Entry | CompactEntry) -> bool:
+        for test in self._tests:
+            if not test(entry):
+                return False
+        return True
+
+
+class Selection(collections.abc.Set):
+    """The entries matched by an ``EntryIndex`` query.
+
+    Selections are sets, and can be combined using the usual operators; ``&``
+    for AND, ``|`` for OR, and ``-`` or ``~`` for NOT.  For example, to find
+    the ``@phone`` tasks in ``+GarageSale`` that aren't top priority::
+
+        index = entries.enable_index()
+        found = (
+            index.context("phone")
+            & index.project("GarageSale")
+            & ~index.priority(Priority.A)
+        )
+
+    Membership is by identity, not by ``Entry`` equality.  A selection is a
+    snapshot, and isn't affected by later changes to the index; this includes
+    ``~``, which selects from the entries that were in the index when the
+    selection was made.  Iteration order is unspecified.
+    """
+
+    __slots__ = ("_entries", "_universe")
+
+    def __init__(
+        self,
+        universe: dict[int, Entry | CompactEntry],
+        entries: dict[int, Entry | CompactEntry],
+    ) -> None:
+        # Every entry in the index at the time, which must not be modified
+        self._universe = universe
+        self._entries = entries
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}({list(self)!r})"
+
+    def __contains__(self, entry: object) -> bool:
+        return self._entries.get(id(entry)) is entry
+
+    def __iter__(self) -> typing.Iterator[Entry | CompactEntry]:
+        return iter(self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _from_iterable(
+        self, entries: typing.Iterable[Entry | CompactEntry]
+    ) -> "Selection":
+        return Selection(self._universe, {id(e): e for e in entries})
+
+    # The mixin operators work element by element, these are faster versions
+    # for the common case of combining query results
+
+    def __and__(self, other: typing.Any) -> "Selection":
+        if not isinstance(other, Selection):
+            return super().__and__(other)
+        small, large = sorted((self._entries, other._entries), key=len)
+        return Selection(
+            self._universe, {k: v for k, v in small.items() if k in large}
+        )
+
+    def __or__(self, other: typing.Any) -> "Selection":
+        if not isinstance(other, Selection):
+            return super().__or__(other)
+        return Selection(self._universe, self._entries | other._entries)
+
+    def __sub__(self, other: typing.Any) -> "Selection":
+        if not isinstance(other, Selection):
+            return super().__sub__(other)
+        return Selection(
+            self._universe,
+            {k: v for k, v in self._entries.items() if k not in other._entries},
+        )
+
+    def __invert__(self) -> "Selection":
+        return Selection(
+            self._universe,
+            {k: v for k, v in self._universe.items() if k not in self._entries},
+        )
+
+
+class SymbolTable:
+    """Small integer ids for contexts and projects.
+
+    Each distinct tag is given an id when first seen, which is its bit in the
+    masks of entries containing it.  Tags are given with their sigil, so that
+    a context and a project with the same name are distinguished.  This allows
+    membership tests to be made with integer operations instead of scanning
+    lists.
+
+    Each ``EntryIndex`` has its own table, see ``EntryIndex.symbols``.  Ids
+    are never released, so are valid for as long as the index.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._tags: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def __contains__(self, tag: object) -> bool:
+        return tag in self._ids
+
+    def id(self, tag: str) -> int:
+        """Return the id of a tag, adding it to the table if necessary.
+
+        Args:
+            tag: Context or project, including its sigil.
+
+        Raises:
+            ValueError: If ``tag`` isn't a context or project.
+        """
+        try:
+            return self._ids[tag]
+        except KeyError:
+            pass
+        if not tag.startswith(("@", "+")):
+            raise ValueError(f"Invalid tag {tag!r}")
+        tag = sys.intern(tag)
+        self._ids[tag] = len(self._tags)
+        self._tags.append(tag)
+        return self._ids[tag]
+
+    def tag(self, ident: int) -> str:
+        """Return the tag with a given id.
+
+        Args:
+            ident: Id of the tag.
+        """
+        return self._tags[ident]
+
+    def mask(self, *tags: str) -> int:
+        """Return the bitset containing the given tags.
+
+        Args:
+            tags: Contexts and projects, including their sigils.
+        """
+        mask = 0
+        for tag in tags:
+            mask |= 1 << self.id(tag)
+        return mask
+
+    def tags(self, mask: int) -> list[str]:
+        """Return the tags in a bitset, in id order.
+
+        Args:
+            mask: Bitset of tag ids.
+        """
+        return [
+            tag for ident, tag in enumerate(self._tags) if mask >> ident & 1
+        ]
+
+
+class EntryIndex:
+    """Inverted indexes over the entries in an ``Entries`` list.
+
+    Maps contexts, projects, attribute keys and values, and priorities to the
+    entries that contain them, so that queries don't need to scan the list and
+    parse every entry.  The index is kept current as entries are added to, or
+    removed from, the list, and when an entry's ``text`` is changed.
+
+    Each entry's contexts and projects are also kept as a bitset of ids from
+    the index's ``symbols``, so that entries with several tags can be found
+    with integer operations, see ``tags``.
+
+    Don't create these directly, use ``Entries.enable_index``.
+    """
+
+    def __init__(
+        self, entries: typing.Iterable[Entry | CompactEntry] = ()
+    ) -> None:
+        # Imported here as it is only needed for indexes
+        import weakref
+
+        # Entries only hold a weak reference to the index, so that it can be
+        # collected along with its list.  The same reference is shared by
+        # every entry, and identifies the index in their observers.
+        self._ref = weakref.ref(self)
+        # Entries aren't hashable, so everything is keyed on their identity
+        self._entries: dict[int, Entry | CompactEntry] = {}
+        # Copy of ``_entries`` shared by selections, until it changes
+        self._snapshot: dict[int, Entry | CompactEntry] | None = None
+        self._counts: dict[int, int] = {}
+        self._keys: dict[int, tuple[_IndexKey, ...]] = {}
+        self._postings: dict[_IndexKey, dict[int, Entry | CompactEntry]] = {}
+        # Tag ids are scoped to the index, so that the masks stay as narrow as
+        # the tags actually used
+        self.symbols = SymbolTable()
+        self._masks: dict[int, int] = {}
+        for entry in entries:
+            self._add(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _add(self, entry: Entry | CompactEntry) -> None:
+        ident = id(entry)
+        if ident in self._counts:
+            # The same object can appear in a list more than once
+            self._counts[ident] += 1
+            return
+        self._entries[ident] = entry
+        self._counts[ident] = 1
+        self._snapshot = None
+        self._link(entry)
+        observers = entry._observers
+        if observers:
+            # Drop references to indexes that have since been collected
+            observers = tuple(ref for ref in observers if ref() is not None)
+        entry._observers = (*observers, self._ref)
+
+    def _discard(self, entry: Entry | CompactEntry) -> None:
+        ident = id(entry)
+        if self._counts[ident] > 1:
+            self._counts[ident] -= 1
+            return
+        self._unlink(entry)
+        del self._entries[ident], self._counts[ident]
+        self._snapshot = None
+        entry._observers = tuple(
+            ref for ref in entry._observers if ref is not self._ref
+        )
+
+    def _clear(self) -> None:
+        for entry in self._entries.values():
+            entry._observers = tuple(
+                ref for ref in entry._observers if ref is not self._ref
+            )
+        self._snapshot = None
+        self._entries.clear()
+        self._counts.clear()
+        self._keys.clear()
+        self._postings.clear()
+        self._masks.clear()
+
+    def _link(self, entry: Entry | CompactEntry) -> None:
+        ident = id(entry)
+        keys = self._keys[ident] = _index_keys(entry)
+        mask = 0
+        for key in keys:
+            self._postings.setdefault(key, {})[ident] = entry
+            sigil = _TAG_SIGILS.get(key[0])
+            if sigil is not None:
+                mask |= 1 << self.symbols.id(sigil + key[1])
+        self._masks[ident] = mask
+
+    def _unlink(self, entry: Entry | CompactEntry) -> None:
+        ident = id(entry)
+        for key in self._keys.pop(ident):
+            posting = self._postings[key]
+            del posting[ident]
+            if not posting:
+                del self._postings[key]
+        del self._masks[ident]
+
+    def _entry_changed(self, entry: Entry | CompactEntry) -> None:
+        if self._entries.get(id(entry)) is not entry:
+            # Only entries in the index are tracked
+            return
+        self._unlink(entry)
+        self._link(entry)
+
+    def _universe(self) -> dict[int, Entry | CompactEntry]:
+        if self._snapshot is None:
+            self._snapshot = dict(self._entries)
+        return self._snapshot
+
+    def _select(self, key: _IndexKey) -> Selection:
+        return Selection(self._universe(), dict(self._postings.get(key, {})))
+
+    def all(self) -> Selection:
+        """Select every entry in the index."""
+        universe = self._universe()
+        return Selection(universe, universe)
+
+    def context(self, context: str) -> Selection:
+        """Select entries with the given context.
+
+        Args:
+            context: Context to match, without the leading ``@``.
+        """
+        return self._select(("context", context))
+
+    def project(self, project: str) -> Selection:
+        """Select entries with the given project.
+
+        Args:
+            project: Project to match, without the leading ``+``.
+        """
+        return self._select(("project", project))
+
+    def tags(self, *tags: str) -> Selection:
+        """Select entries with all of the given contexts and projects.
+
+        For example, to find the ``@phone`` tasks in ``+Family``::
+
+            found = index.tags("@phone", "+Family")
+
+        Args:
+            tags: Contexts and projects to match, including their sigils.
+
+        Raises:
+            ValueError: If a tag isn't a context or project.
+        """
+        for tag in tags:
+            if tag not in self.symbols:
+                # Validate the tag, without adding it to the table
+                if not tag.startswith(("@", "+")):
+                    raise ValueError(f"Invalid tag {tag!r}")
+                return Selection(self._universe(), {})
+        wanted = self.symbols.mask(*tags)
+        entries = self._entries
+        return Selection(
+            self._universe(),
+            {
+                ident: entries[ident]
+                for ident, mask in self._masks.items()
+                if mask & wanted == wanted
+            },
+        )
+
+    def tag_mask(self, entry: Entry | CompactEntry) -> int:
+        """Return the bitset of an entry's contexts and projects.
+
+        Args:
+            entry: Entry in the index.
+
+        Raises:
+            KeyError: If ``entry`` isn't in the index.
+        """
+        if self._entries.get(id(entry)) is not entry:
+            raise KeyError(entry)
+        return self._masks[id(entry)]
+
+    def attr(self, key: str, value: str | datetime.date = _UNSET) -> Selection:
+        """Select entries with the given attribute.
+
+        Args:
+            key: Attribute name to match.
+            value: Attribute value to match, any value matches when not given.
+        """
+        if value is _UNSET:
+            return self._select(("attr", key))
+        return self._select(("attr", key, value))
+
+    def priority(self, priority: Priority | None) -> Selection:
+        """Select entries with the given priority.
+
+        Args:
+            priority: Priority to match, or ``None`` to select entries without
+                a priority.
+        """
+        return self._select(("priority", priority))
+
+    def query(self, query: "str | Query") -> Selection:
+        """Select entries matching a query.
+
+        Terms that the index covers are answered from it, and only the
+        entries they select are tested against the rest of the query.
+
+        Args:
+            query: Query to match, see ``Query`` for the syntax.
+        """
+        if isinstance(query, str):
+            query = Query(query)
+        found: Selection | None = None
+        excluded: list[Selection] = []
+        tests = []
+        for term in query._terms:
+            if term.keys is None:
+                tests.append(term.test)
+                continue
+            postings: dict[int, Entry | CompactEntry] = {}
+            for key in term.keys:
+                postings.update(self._postings.get(key, {}))
+            selected = Selection(self._universe(), postings)
+            if term.negate:
+                excluded.append(selected)
+            else:
+                found = selected if found is None else found & selected
+        if found is None:
+            found = self.all()
+        for selected in excluded:
+            found -= selected
+        if tests:
+            found = Selection(
+                found._universe,
+                {
+                    ident: entry
+                    for ident, entry in found._entries.items()
+                    if all(test(entry) for test in tests)
+                },
+            )
+        return found
+
+
+# Sorts after any real date
+_NO_DATE = datetime.date.max.toordinal() + 1
+
+
+def _date_sort_key(value: datetime.date | None) -> int:
+    return _NO_DATE if value is None else value.toordinal()
+
+
+def _attr_sort_key(value: str | datetime.date | None) -> tuple[int, typing.Any]:
+    # Attribute values may be dates or strings, so order by type first to
+    # avoid comparing them
+    if isinstance(value, datetime.date):
+        return (0, value.toordinal())
+    if value is None:
+        return (2, 0)
+    return (1, value)
+
+
+# Sort key components for entry properties, each sorting missing values last
+_SORT_KEYS: dict[str, typing.Callable[[Entry | CompactEntry], typing.Any]] = {
+    "complete": lambda entry: entry.complete,
+    "completion_date": lambda entry: _date_sort_key(entry.completion_date),
+    "creation_date": lambda entry: _date_sort_key(entry.creation_date),
+    # Highest priority first
+    "priority": lambda entry: -entry.priority_code,
+    "text": lambda entry: entry.text,
+}
+
+
+class Changes(typing.NamedTuple):
+    """Differences applied by ``Entries.reload``, or found by ``Entries.diff``.
+
+    ``Entries.diff`` matches entries by their text, so never reports any as
+    modified.
+    """
+
+    #: New entries, in file order
+    added: list[Entry | CompactEntry]
+    #: Entries no longer present, in their previous order
+    removed: list[Entry | CompactEntry]
+    #: Existing entries whose text was replaced, in file order
+    modified: list[Entry | CompactEntry]
+
+
+def _normalized_text(entry: Entry | CompactEntry) -> str:
+    """Key for entries which differ only in the order of their metadata.
+
+    Contexts, projects, and attributes are sorted after the remaining words,
+    and whitespace is collapsed.
+    """
+    words = []
+    tags = []
+    for word in entry.text.split():
+        if (word[0] in "@+" and len(word) > 1) or (
+            ":" in word and _ATTR_RE.fullmatch(word)
+        ):
+            tags.append(word)
+        else:
+            words.append(word)
+    if tags:
+        tags.sort()
+        words.extend(tags)
+    return " ".join(words)
+
+
+def _text_key(entry: Entry | CompactEntry) -> str:
+    return entry.text
+
+
+# ``datetime64`` values count days from the Unix epoch
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+class TagColumn(typing.NamedTuple):
+    """Dictionary encoded column of multi-valued tags, see ``Columns``.
+
+    Each occurrence of a tag is stored as a pair of its entry's row number and
+    its code, the index of its name in ``names``.
+    """
+
+    #: Distinct tags, indexed by code
+    names: tuple[str, ...]
+    #: Row number for each occurrence
+    rows: "numpy.ndarray"
+    #: Code for each occurrence
+    codes: "numpy.ndarray"
+    #: Value for each occurrence, only set for attributes
+    values: "numpy.ndarray | None"
+    #: Number of rows in the column
+    length: int
+
+    def mask(
+        self, name: str, value: str | datetime.date = _UNSET
+    ) -> "numpy.ndarray":
+        """Find the rows with the given tag.
+
+        Args:
+            name: Tag to match.
+            value: Attribute value to match, any value matches when not given.
+
+        Returns:
+            Boolean array selecting the matching rows.
+        """
+        import numpy
+
+        mask = numpy.zeros(self.length, dtype=bool)
+        if name not in self.names:
+            return mask
+        selected = self.codes == self.names.index(name)
+        if value is not _UNSET:
+            assert self.values is not None
+            selected &= self.values == value
+        mask[self.rows[selected]] = True
+        return mask
+
+    def counts(self) -> dict[str, int]:
+        """Count the occurrences of each tag."""
+        import numpy
+
+        counts = numpy.bincount(self.codes, minlength=len(self.names))
+        return dict(zip(self.names, counts.tolist()))
+
+
+class Columns(typing.NamedTuple):
+    """Columnar view of an ``Entries`` list, for vectorised analysis.
+
+    Every column is a NumPy array with a row per entry, and missing values
+    use a sentinel so that the arrays have a fixed width.  For example, to
+    find the age of open tasks::
+
+        columns = entries.to_columns()
+        today = numpy.datetime64(datetime.date.today())
+        ages = today - columns.creation_date[~columns.complete]
+
+    Use ``Entries.to_columns`` to create these, which requires NumPy.
+    """
+
+    #: Completion status
+    complete: "numpy.ndarray"
+    #: ``Priority`` values as ``int8``, with zero for no priority
+    priority: "numpy.ndarray"
+    #: Creation dates as ``datetime64[D]``, with ``NaT`` when not set
+    creation_date: "numpy.ndarray"
+    #: Completion dates as ``datetime64[D]``, with ``NaT`` when not set
+    completion_date: "numpy.ndarray"
+    contexts: TagColumn
+    projects: TagColumn
+    #: Attributes, with their keys as the tag names
+    attrs: TagColumn
+
+
+class Entries(list):
+    """Represent a task list.
+
+    This is simply a convenience class for holding a collection of ``Entry``
+    objects, and a space to tie custom methods for operating on them.
+
+    Lists that are queried repeatedly can maintain an index of their entries,
+    see ``enable_index``.
+    """
+
+    _index: EntryIndex | None = None
+
+    @property
+    def entry_index(self) -> EntryIndex | None:
+        """The list's index, if enabled."""
+        return self._index
+
+    def enable_index(self) -> EntryIndex:
+        """Maintain an index of the entries in this list.
+
+        Building the index parses the contexts, projects, attributes, and
+        priority of every entry.  From then on it is updated as the list is
+        modified, and when an entry's ``text`` is changed.
+
+        Returns:
+            The index, which is also available as ``entry_index``.
+        """
+        if self._index is None:
+            self._index = EntryIndex(self)
+        return self._index
+
+    def disable_index(self) -> None:
+        """Stop maintaining the list's index."""
+        if self._index is not None:
+            self._index._clear()
+            self._index = None
+
+    def __getstate__(self) -> dict[str, typing.Any]:
+        # Indexes hold weak references, which can't be pickled, so copies
+        # build their own
+        state = dict(vars(self))
+        if state.pop("_index", None) is not None:
+            state["_indexed"] = True
+        return state
+
+    def __setstate__(self, state: dict[str, typing.Any]) -> None:
+        state = dict(state)
+        indexed = state.pop("_indexed", False)
+        vars(self).update(state)
+        if indexed:
+            self.enable_index()
+
+    # The mutating list methods are wrapped to keep the index current
+
+    def append(self, entry: Entry | CompactEntry, /) -> None:
+        super().append(entry)
+        if self._index is not None:
+            self._index._add(entry)
+
+    def extend(self, entries: typing.Iterable[Entry | CompactEntry], /) -> None:
+        if self._index is None:
+            super().extend(entries)
+            return
+        entries = list(entries)
+        super().extend(entries)
+        for entry in entries:
+            self._index._add(entry)
+
+    def __iadd__(
+        self, entries: typing.Iterable[Entry | CompactEntry], /
+    ) -> typing.Self:
+        self.extend(entries)
+        return self
+
+    def __imul__(self, count: int, /) -> typing.Self:
+        super().__imul__(count)
+        if self._index is not None:
+            self._index._clear()
+            for entry in self:
+                self._index._add(entry)
+        return self
+
+    def insert(self, index: int, entry: Entry | CompactEntry, /) -> None:
+        super().insert(index, entry)
+        if self._index is not None:
+            self._index._add(entry)
+
+    def pop(self, index: int = -1, /) -> Entry | CompactEntry:
+        entry = super().pop(index)
+        if self._index is not None:
+            self._index._discard(entry)
+        return entry
+
+    def remove(self, entry: Entry | CompactEntry, /) -> None:
+        if self._index is None:
+            super().remove(entry)
+        else:
+            # Find the object that is actually removed, which may only be
+            # equal to the one given
+            del self[self.index(entry)]
+
+    def clear(self) -> None:
+        super().clear()
+        if self._index is not None:
+            self._index._clear()
+
+    def __setitem__(self, key, value, /) -> None:
+        if self._index is None:
+            super().__setitem__(key, value)
+            return
+        old = self[key]
+        if isinstance(key, slice):
+            value = list(value)
+            super().__setitem__(key, value)
+            for entry in value:
+                self._index._add(entry)
+            for entry in old:
+                self._index._discard(entry)
+        else:
+            super().__setitem__(key, value)
+            self._index._add(value)
+            self._index._discard(old)
+
+    def __delitem__(self, key, /) -> None:
+        if self._index is None:
+            super().__delitem__(key)
+            return
+        old = self[key]
+        super().__delitem__(key)
+        for entry in old if isinstance(key, slice) else [old]:
+            self._index._discard(entry)
+
+    @classmethod
+    def parse_file(
+        cls,
+        file: str | os.PathLike[str] | typing.TextIO,
+        *,
+        eager: bool = False,
+        entry_type: _EntryClass = Entry,
+    ) -> typing.Self:
+        """Parse a file containing tasks in ``todo.txt`` format.
+
+        Args:
+            file: The path to the file containing task entries, or an open
+                file object.
+            eager: Populate all ``Entry`` properties up front, see
+                ``Entry.parse_all``.
+            entry_type: Class to use for entries, ``CompactEntry`` may be
+                used to reduce memory usage for large files.
+
+        Returns:
+            The list of ``Entry`` objects contained in the given file.
+        """
+        return cls(cls.iter_file(file, eager=eager, entry_type=entry_type))
+
+    @classmethod
+    def iter_file(
+        cls,
+        file: str | os.PathLike[str] | typing.TextIO,
+        *,
+        eager: bool = False,
+        entry_type: _EntryClass = Entry,
+    ) -> typing.Iterator[Entry | CompactEntry]:
+        """Lazily parse a file containing tasks in ``todo.txt`` format.
+
+        This reads the file one line at a time, so memory use is independent of
+        the file's size.  For example, counting completed tasks by project::
+
+            counts = collections.Counter(
+                project
+                for entry in Entries.iter_file("done.txt")
+                if entry.complete
+                for project in entry.projects
+            )
+
+        When given a path the file is closed once the iterator is exhausted,
+        or when it is closed, and ``offset`` is set as in ``iter_lines``.
+
+        Args:
+            file: The path to the file containing task entries, or an open
+                file object.
+            eager: Populate all ``Entry`` properties up front, see
+                ``Entry.parse_all``.
+            entry_type: Class to use for entries.
+
+        Yields:
+            ``Entry`` objects in file order, with ``lineno`` set.
+        """
+        if isinstance(file, (str, os.PathLike)):
+            # Keep line endings untranslated, so that offsets can be counted
+            with open(file, newline="") as fh:
+                yield from cls.iter_lines(
+                    fh, eager=eager, entry_type=entry_type, encoding=fh.encoding
+                )
+        else:
+            yield from cls.iter_lines(file, eager=eager, entry_type=entry_type)
+
+    @staticmethod
+    def iter_lines(
+        lines: typing.Iterable[str],
+        *,
+        eager: bool = False,
+        entry_type: _EntryClass = Entry,
+        encoding: str | None = None,
+    ) -> typing.Iterator[Entry | CompactEntry]:
+        """Lazily parse tasks from lines of ``todo.txt`` formatted text.
+
+        When ``encoding`` is given, ``lines`` must be the entire contents of a
+        file with their original line endings, as read with ``newline=""``.
+        Each entry's ``offset`` is then set to the position of its line in the
+        encoded file, which allows ``Entries.save`` to update changed entries
+        in place.
+
+        Args:
+            lines: Lines of text, with or without trailing newlines.
+            eager: Populate all ``Entry`` properties up front, see
+                ``Entry.parse_all``.
+            entry_type: Class to use for entries.
+            encoding: Encoding of the file, for recording offsets.
+
+        Yields:
+            ``Entry`` objects for each non-blank line, with ``lineno`` set to
+            the one-based position in ``lines``.
+        """
+        if encoding is None or "a\n".encode(encoding) != b"a\n":
+            # Offsets can only be counted cheaply for ASCII compatible
+            # encodings, and are unknown without one
+            for lineno, line in enumerate(lines, 1):
+                if line.strip():
+                    entry = entry_type(line.rstrip(), lineno=lineno)
+                    yield entry.parse_all() if eager else entry
+            return
+
+        offset = 0
+        for lineno, line in enumerate(lines, 1):
+            if line.strip():
+                entry = entry_type(line.rstrip(), lineno=lineno, offset=offset)
+                yield entry.parse_all() if eager else entry
+            offset += (
+                len(line) if line.isascii() else len(line.encode(encoding))
+            )
+
+    @classmethod
+    async def aiter_file(
+        cls,
+        file: str | os.PathLike[str] | typing.TextIO,
+        *,
+        eager: bool = False,
+        entry_type: _EntryClass = Entry,
+    ) -> typing.AsyncIterator[Entry | CompactEntry]:
+        """Asynchronously parse a file containing tasks in ``todo.txt`` format.
+
+        This is an async version of ``iter_file``, for use in ``asyncio``
+        applications.  The file is opened and read in a worker thread, a
+        batch of lines at a time, and control is returned to the event loop
+        between batches.  For example::
+
+            async for entry in Entries.aiter_file("todo.txt"):
+                ...
+
+        When given a path ``offset`` is set as in ``iter_lines``, so that
+        ``asave`` can update changed entries in place.
+
+        Args:
+            file: The path to the file containing task entries, or an open
+                file object.
+            eager: Populate all ``Entry`` properties up front, see
+                ``Entry.parse_all``.
+            entry_type: Class to use for entries.
+
+        Yields:
+            ``Entry`` objects in file order, with ``lineno`` set.
+        """
+        import asyncio
+
+        encoding = None
+        if isinstance(file, (str, os.PathLike)):
+            # Keep line endings untranslated, so that offsets can be counted
+            fh = await asyncio.to_thread(open, file, newline="")
+            if "a\n".encode(fh.encoding) == b"a\n":
+                encoding = fh.encoding
+        else:
+            fh = file
+        try:
+            lineno = 0
+            offset = 0
+            while lines := await asyncio.to_thread(
+                fh.readlines, _ASYNC_READ_SIZE
+            ):
+                for line in lines:
+                    lineno += 1
+                    if line.strip():
+                        entry = entry_type(
+                            line.rstrip(),
+                            lineno=lineno,
+                            offset=None if encoding is None else offset,
+                        )
+                        yield entry.parse_all() if eager else entry
+                    if encoding is not None:
+                        offset += (
+                            len(line)
+                            if line.isascii()
+                            else len(line.encode(encoding))
+                        )
+        finally:
+            if fh is not file:
+                fh.close()
+
+    @classmethod
+    async def aparse_file(
+        cls,
+        file: str | os.PathLike[str] | typing.TextIO,
+        *,
+        eager: bool = False,
+        entry_type: _EntryClass = Entry,
+    ) -> typing.Self:
+        """Asynchronously parse a file containing tasks in ``todo.txt`` format.
+
+        This is an async version of ``parse_file``, see ``aiter_file``.
+
+        Args:
+            file: The path to the file containing task entries, or an open
+                file object.
+            eager: Populate all ``Entry`` properties up front, see
+                ``Entry.parse_all``.
+            entry_type: Class to use for entries.
+
+        Returns:
+            The list of ``Entry`` objects contained in the given file.
+        """
+        return cls(
+            [
+                entry
+                async for entry in cls.aiter_file(
+                    file, eager=eager, entry_type=entry_type
+                )
+            ]
+        )
+
+    @classmethod
+    def map_file(
+        cls,
+        file: str | os.PathLike[str],
+        *,
+        encoding: str = "utf-8",
+        entry_type: _EntryClass = Entry,
+    ) -> typing.Self:
+        """Parse a file containing tasks using a memory map.
+
+        This is a faster, and leaner, alternative to ``parse_file`` for large
+        files.  Lines are located in the raw file contents, and each entry only
+        decodes its text when it is first used.
+
+        Args:
+            file: The path to the file containing task entries.
+            encoding: Encoding of the file, which must be ASCII compatible.
+            entry_type: Class to use for entries.
+
+        Returns:
+            The list of ``Entry`` objects contained in the given file, with
+            ``lineno`` and ``offset`` set.
+        """
+        import mmap
+
+        # Not available on every platform
+        dontneed = getattr(mmap, "MADV_DONTNEED", None)
+        with open(file, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                return cls()
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                entries: list[Entry | CompactEntry] = []
+                released = 0
+                for lineno, start, end in _iter_line_spans(buf, encoding):
+                    entries.append(
+                        entry_type._from_bytes(
+                            buf[start:end],
+                            encoding,
+                            lineno=lineno,
+                            offset=start,
+                        )
+                    )
+                    # Pages we've finished with still count towards our
+                    # resident size, so hand them back as we go.
+                    if start - released > _MMAP_RELEASE_SIZE and dontneed:
+                        boundary = start - start % mmap.PAGESIZE
+                        buf.madvise(dontneed, released, boundary - released)
+                        released = boundary
+                return cls(entries)
+
+    @classmethod
+    def filter_file(
+        cls,
+        file: str | os.PathLike[str],
+        query: str | Query,
+        *,
+        encoding: str = "utf-8",
+        entry_type: _EntryClass = Entry,
+    ) -> typing.Self:
+        """Parse only the tasks in a file that match a query.
+
+        This is much faster than parsing the whole file and then filtering
+        when few tasks match.  The raw file contents are searched for text
+        that every matching task must contain, such as a ``@context`` or
+        ``x`` completion marker, and entries are only created for lines where
+        it is found.  For example, to load the ``+Taxes`` tasks completed
+        this year from an archive::
+
+            done = Entries.filter_file("done.txt", "+Taxes completed>=2026-01-01")
+
+        Queries without any such text, for example ``!complete`` or
+        ``created<2026-01-01``, check every line.
+
+        Args:
+            file: The path to the file containing task entries.
+            query: Query to match, see ``Query`` for the syntax.
+            encoding: Encoding of the file, which must be ASCII compatible.
+            entry_type: Class to use for entries.
+
+        Returns:
+            The list of matching ``Entry`` objects, with ``lineno`` and
+            ``offset`` set.
+        """
+        if isinstance(query, str):
+            query = Query(query)
+        with open(file, "rb") as fh:
+            buf = fh.read()
+        pattern = query._scan_pattern(encoding)
+        if pattern is not None:
+            spans = _iter_candidate_spans(buf, pattern)
+        elif b"\r" in buf:
+            spans = _iter_line_spans(buf, encoding)
+        else:
+            spans = _iter_newline_spans(buf)
+        entries = []
+        for lineno, start, end in spans:
+            # Lines containing only whitespace are blank, and skipped
+            if text := buf[start:end].decode(encoding).rstrip():
+                entry = entry_type(text, lineno=lineno, offset=start)
+                if query(entry):
+                    entries.append(entry)
+        return cls(entries)
+
+    @classmethod
+    def parse_file_bulk(
+        cls,
+        file: str | os.PathLike[str],
+        *,
+        encoding: str = "utf-8",
+        entry_type: _EntryClass = Entry,
+    ) -> typing.Self:
+        """Parse a file, extracting the fields of every entry at once.
+
+        This is a faster alternative to ``parse_file`` with ``eager`` set for
+        large files.  Rather than parsing each entry in turn, each field is
+        found with a single regex search over the whole file.  The entries are
+        equal, with the same ``lineno`` and ``offset``, except that:
+
+        * ``attrs`` is left to be parsed lazily.
+        * The file is decoded as UTF-8 by default, rather than with the
+          locale's encoding.
+
+        Args:
+            file: The path to the file containing task entries.
+            encoding: Encoding of the file.
+            entry_type: Class to use for entries.
+
+        Returns:
+            The list of ``Entry`` objects contained in the given file, with
+            ``lineno`` and ``offset`` set.
+        """
+        import itertools
+
+        # Keep line endings untranslated, so that offsets can be counted
+        with open(file, encoding=encoding, newline="") as fh:
+            lines = fh.readlines()
+        texts = [line.rstrip() for line in lines]
+        # Offsets are found as in ``iter_lines``, but without a step per line
+        offsets: typing.Iterable[int | None]
+        if "a\n".encode(encoding) != b"a\n":
+            offsets = itertools.repeat(None)
+        else:
+            sizes = (
+                map(len, lines)
+                if all(map(str.isascii, lines))
+                else (len(line.encode(encoding)) for line in lines)
+            )
+            offsets = itertools.accumulate(sizes, initial=0)
+        entries = []
+        with _GCPaused():
+            for lineno, (text, offset, fields) in enumerate(
+                zip(texts, offsets, _bulk_tokenize(texts)), 1
+            ):
+                if text:
+                    entry = entry_type(text, lineno=lineno, offset=offset)
+                    entry._populate(fields)
+                    entries.append(entry)
+        return cls(entries)
+
+    @classmethod
+    def parse_file_parallel(
+        cls,
+        file: str | os.PathLike[str],
+        *,
+        workers: int | None = None,
+        encoding: str = "utf-8",
+        entry_type: _EntryClass = Entry,
+    ) -> typing.Self:
+        """Parse a file containing tasks using multiple processes.
+
+        The file is split in to newline aligned ranges which are parsed, and
+        have all their fields extracted as in ``Entry.parse_all``, by a pool
+        of worker processes.  The result is equal to ``parse_file`` with
+        ``eager`` set, and ``offset`` is recorded as in ``map_file``.
+
+        Entries hold the values extracted by the workers, and only convert
+        them to property values on first use, as in ``parse_file_cached``.
+        Files too small to benefit from workers, or when only one is
+        requested, are parsed in process.
+
+        Args:
+            file: The path to the file containing task entries.
+            workers: Number of worker processes, defaulting to the number of
+                CPUs.
+            encoding: Encoding of the file, which must be ASCII compatible.
+            entry_type: Class to use for entries.
+
+        Returns:
+            The list of ``Entry`` objects contained in the given file.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers == 1 or os.stat(file).st_size < _PARALLEL_MIN_SIZE:
+            with open(file, encoding=encoding, newline="") as fh:
+                return cls(
+                    cls.iter_lines(
+                        fh, eager=True, entry_type=entry_type, encoding=encoding
+                    )
+                )
+
+        import concurrent.futures
+        import itertools
+
+        # Use more ranges than workers, so a slow range doesn't leave the other
+        # workers idle
+        bounds = _split_ranges(file, workers * 4)
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            results = executor.map(
+                _parse_range,
+                itertools.repeat(file),
+                bounds[:-1],
+                bounds[1:],
+                itertools.repeat(encoding),
+            )
+            with _GCPaused():
+                return cls._from_records(results, entry_type)
+
+    @classmethod
+    def parse_file_cached(
+        cls,
+        file: str | os.PathLike[str],
+        *,
+        query: "str | Query | None" = None,
+        encoding: str = "utf-8",
+        entry_type: _EntryClass = Entry,
+        cache_dir: str | os.PathLike[str] | None = None,
+    ) -> typing.Self:
+        """Parse a file containing tasks, using a persistent cache.
+
+        The parsed fields of every line are stored in a cache file, which is
+        used to skip parsing on later calls.  When the file's size,
+        modification time, and inode are unchanged the cache is used directly.
+        Otherwise the file is read, and only lines that aren't in the cache
+        are parsed.
+
+        Entries hold the cached values, and only convert them to property
+        values on first use.
+
+        The cache also indexes lines as ``EntryIndex`` does, so that a query
+        can be answered without loading every line.  When the cache is used
+        directly, and the query has a term the index covers, only the lines
+        it selects are read from the file and tested against the rest of the
+        query.  For example, to find the ``@phone`` tasks in a large file::
+
+            calls = Entries.parse_file_cached("todo.txt", query="@phone")
+
+        Args:
+            file: The path to the file containing task entries.
+            query: Query to match, see ``Query`` for the syntax, or ``None``
+                for every entry.
+            encoding: Encoding of the file, which must be ASCII compatible.
+            entry_type: Class to use for entries.
+            cache_dir: Directory for cache files, defaulting to ``penelopise``
+                within ``$XDG_CACHE_HOME``.
+
+        Returns:
+            The list of ``Entry`` objects contained in the given file, or
+            matching ``query``, with ``lineno`` and ``offset`` set.
+        """
+        if isinstance(query, str):
+            query = Query(query)
+        cache = _cache_path(file, cache_dir)
+        status = os.stat(file)
+        fingerprint: tuple[int, int, int] | None = (
+            status.st_size,
+            status.st_mtime_ns,
+            status.st_ino,
+        )
+        with _GCPaused():
+            with _map_cache(cache) as buf:
+                if query is not None and (
+                    found := _read_cache_header(buf, encoding)
+                ):
+                    header, base = found
+                    if (
+                        header.fingerprint == fingerprint
+                        and (rows := _cached_rows(buf, base, header, query))
+                        is not None
+                    ):
+                        return cls._from_cached_rows(
+                            file, buf, base, header, rows, query, entry_type
+                        )
+                cached, records = _read_cache(buf, encoding)
+            if cached is None or cached != fingerprint:
+                records = cls._update_cache(
+                    file, cache, status, encoding, records
+                )
+            entries = cls._from_records([(0, records)], entry_type)
+        if query is not None:
+            entries = cls(filter(query, entries))
+        return entries
+
+    @staticmethod
+    def _update_cache(
+        file: str | os.PathLike[str],
+        cache: str,
+        status: os.stat_result,
+        encoding: str,
+        records: list[_Record],
+    ) -> list[_Record]:
+        """Parse a file using the records of a stale cache, and replace it.
+
+        Returns:
+            Records for each line of the file.
+        """
+        import array
+
+        known = {record[2]: record for record in records}
+        with open(file, "rb") as fh:
+            data = fh.read()
+        records = []
+        spans = array.array("Q")
+        for lineno, start, end in _iter_line_spans(data, encoding):
+            spans.extend((lineno, start, end))
+            text = data[start:end].decode(encoding).rstrip()
+            if (record := known.get(text)) is not None:
+                records.append((lineno, start, *record[2:]))
+            else:
+                records.append(
+                    _encode_record(lineno, start, text, _tokenize(text))
+                )
+        fingerprint: tuple[int, int, int] | None = (
+            status.st_size,
+            status.st_mtime_ns,
+            status.st_ino,
+        )
+        import time
+
+        if time.time_ns() - status.st_mtime_ns < _CACHE_RACY_NS:
+            fingerprint = None
+        _write_cache(cache, fingerprint, encoding, records, spans)
+        return records
+
+    @classmethod
+    def _from_cached_rows(
+        cls,
+        file: str | os.PathLike[str],
+        buf: "bytes | mmap.mmap",
+        base: int,
+        header: _CacheHeader,
+        rows: list[int],
+        query: "Query",
+        entry_type: _EntryClass,
+    ) -> typing.Self:
+        """Create entries for the lines of a file selected by a cache's index.
+
+        Lines are read from the file, and tested against the query terms the
+        index doesn't cover.
+        """
+        import array
+        import mmap
+
+        if not rows:
+            return cls()
+        start, size = header.spans
+        spans = array.array("Q", buf[base + start : base + start + size])
+        tests = [term.test for term in query._terms if term.keys is None]
+        entries = []
+        with (
+            open(file, "rb") as fh,
+            mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as data,
+        ):
+            for row in rows:
+                lineno, start, end = spans[row * 3 : row * 3 + 3]
+                text = data[start:end].decode(encoding=header.encoding)
+                entry = entry_type(text.rstrip(), lineno=lineno, offset=start)
+                if all(test(entry) for test in tests):
+                    entries.append(entry)
+        return cls(entries)
+
+    @classmethod
+    def _from_records(
+        cls,
+        results: typing.Iterable[tuple[int, list[_Record]]],
+        entry_type: _EntryClass,
+    ) -> typing.Self:
+        """Create entries holding parsed records.
+
+        Values are only decoded from the records when they're first used, as
+        converting them all would cost almost as much as parsing the text.
+
+        Args:
+            results: Number of lines, and records, for consecutive ranges of
+                a file.
+            entry_type: Class to use for entries.
+        """
+        entries: list[Entry | CompactEntry] = []
+        base = 0
+        for lines, records in results:
+            for record in records:
+                lineno, offset, text = record[:3]
+                entry = entry_type(text, lineno=base + lineno, offset=offset)
+                object.__setattr__(entry, "_record", record)
+                entries.append(entry)
+            base += lines
+        return cls(entries)
+
+    def reload(
+        self,
+        file: str | os.PathLike[str],
+        *,
+        encoding: str = "utf-8",
+        entry_type: _EntryClass = Entry,
+    ) -> Changes:
+        """Update the list in place to match the contents of a file.
+
+        Entries whose text is unchanged are kept, along with any properties
+        they have already computed, so reloading a file after a small edit is
+        much cheaper than parsing it again.  Changed lines are treated as
+        edits to the unmatched entries that were in the same place, and only
+        lines with no such entry create new ones.
+
+        The ``lineno`` and ``offset`` of every entry are updated, as in
+        ``map_file``.
+
+        Args:
+            file: The path to the file containing task entries.
+            encoding: Encoding of the file, which must be ASCII compatible.
+            entry_type: Class to use for new entries.
+
+        Returns:
+            The entries that were added, removed, or modified.
+        """
+        with open(file, "rb") as fh:
+            data = fh.read()
+        lines = [
+            (lineno, start, data[start:end].decode(encoding).rstrip())
+            for lineno, start, end in _iter_line_spans(data, encoding)
+        ]
+
+        # Edits are normally localised, so skip the unchanged ends first
+        shortest = min(len(self), len(lines))
+        head = 0
+        while head < shortest and self[head].text == lines[head][2]:
+            head += 1
+        tail = 0
+        while (
+            tail < shortest - head
+            and self[-1 - tail].text == lines[-1 - tail][2]
+        ):
+            tail += 1
+        old = self[head : len(self) - tail]
+        new = lines[head : len(lines) - tail]
+
+        # Reuse entries with identical text, even if they've moved
+        pool: dict[str, list[Entry | CompactEntry]] = {}
+        for entry in reversed(old):
+            pool.setdefault(entry.text, []).append(entry)
+        middle: list[Entry | CompactEntry | None] = [
+            candidates.pop() if (candidates := pool.get(text)) else None
+            for _, _, text in new
+        ]
+
+        # Group the remaining entries by the reused entry that preceded them,
+        # so they're only paired with new lines in the same place
+        position = {id(e): pos for pos, e in enumerate(middle) if e is not None}
+        gaps: dict[int, list[Entry | CompactEntry]] = {}
+        last = -1
+        for entry in old:
+            if id(entry) in position:
+                last = position[id(entry)]
+            else:
+                gaps.setdefault(last, []).append(entry)
+
+        changes = Changes([], [], [])
+        last = -1
+        for pos, entry in enumerate(middle):
+            if entry is not None:
+                last = pos
+                continue
+            lineno, offset, text = new[pos]
+            if candidates := gaps.get(last):
+                entry = candidates.pop(0)
+                entry.text = text
+                changes.modified.append(entry)
+            else:
+                entry = entry_type(text, lineno=lineno, offset=offset)
+                changes.added.append(entry)
+            middle[pos] = entry
+        remaining = {id(e) for candidates in gaps.values() for e in candidates}
+        changes.removed.extend(e for e in old if id(e) in remaining)
+        if old or new:
+            self[head : len(self) - tail] = middle
+
+        for entry, (lineno, offset, _) in zip(self, lines):
+            if entry.lineno != lineno:
+                entry.lineno = lineno
+            if entry.offset != offset:
+                entry.offset = offset
+        return changes
+
+    def to_columns(self) -> Columns:
+        """Convert the list to columnar form.
+
+        The entries' properties are read once, and stored in NumPy arrays
+        that support fast filtering and aggregation.  The result doesn't
+        follow later changes to the list.
+
+        NumPy is an optional dependency, and must be installed to use this.
+
+        Returns:
+            The columns for the entries in the list.
+
+        Raises:
+            KeyError: An entry has duplicate attributes.
+            ValueError: An entry has an invalid date or priority.
+        """
+        import numpy
+
+        nat = numpy.iinfo(numpy.int64).min
+        complete = []
+        priority = []
+        creation = []
+        completion = []
+        tags: tuple[dict[str, int], dict[str, int], dict[str, int]] = (
+            {},
+            {},
+            {},
+        )
+        tag_rows: tuple[list[int], list[int], list[int]] = ([], [], [])
+        tag_codes: tuple[list[int], list[int], list[int]] = ([], [], [])
+        attr_values: list[str | datetime.date] = []
+        for row, entry in enumerate(self):
+            complete.append(entry.complete)
+            priority.append(entry.priority_code)
+            date = entry.creation_date
+            creation.append(date.toordinal() - _EPOCH_ORDINAL if date else nat)
+            date = entry.completion_date
+            completion.append(
+                date.toordinal() - _EPOCH_ORDINAL if date else nat
+            )
+            attrs = entry.attrs
+            attr_values.extend(attrs.values())
+            for names, rows, codes, values in zip(
+                tags,
+                tag_rows,
+                tag_codes,
+                (entry.contexts, entry.projects, attrs.keys()),
+            ):
+                for value in values:
+                    rows.append(row)
+                    codes.append(names.setdefault(value, len(names)))
+
+        values = numpy.empty(len(attr_values), dtype=object)
+        values[:] = attr_values
+        contexts, projects, attrs = (
+            TagColumn(
+                tuple(names),
+                numpy.array(rows, dtype=numpy.int64),
+                numpy.array(codes, dtype=numpy.int32),
+                None,
+                len(self),
+            )
+            for names, rows, codes in zip(tags, tag_rows, tag_codes)
+        )
+        return Columns(
+            numpy.array(complete, dtype=bool),
+            numpy.array(priority, dtype=numpy.int8),
+            numpy.array(creation, dtype=numpy.int64).view("datetime64[D]"),
+            numpy.array(completion, dtype=numpy.int64).view("datetime64[D]"),
+            contexts,
+            projects,
+            attrs._replace(values=values),
+        )
+
+    def filter(
+        self, query: str | Query
+    ) -> typing.Iterator[Entry | CompactEntry]:
+        """Iterate over the entries matching a query.
+
+        Entries are produced lazily, in list order.  When the index is enabled,
+        the entries it selects are found first, so that the remaining entries
+        are skipped without being parsed.
+
+        Args:
+            query: Query to match, see ``Query`` for the syntax.
+
+        Yields:
+            Matching entries.
+        """
+        if isinstance(query, str):
+            query = Query(query)
+        test: typing.Callable[[Entry | CompactEntry], bool] = query
+        if self._index is not None:
+            test = self._index.query(query).__contains__
+        for entry in self:
+            if test(entry):
+                yield entry
+
+    def apply(
+        self,
+        query: str | Query,
+        action: typing.Callable[[Entry | CompactEntry], object],
+    ) -> list[Entry | CompactEntry]:
+        """Change every entry matching a query.
+
+        Matches are all found before any are changed, so edits can't affect
+        which entries are selected.  Using the structured mutators, such as
+        ``Entry.mark_complete``, avoids reparsing each entry after its change.
+        For example, to complete a sprint's open tasks::
+
+            changed = entries.apply("+Sprint42 !complete", Entry.mark_complete)
+            entries.save(path, changed=changed)
+
+        Args:
+            query: Query to match, see ``Query`` for the syntax.
+            action: Function called with each matching entry.
+
+        Returns:
+            Entries whose text was changed, suitable for ``save(changed=...)``.
+        """
+        changed = []
+        for entry in list(self.filter(query)):
+            text = entry.text
+            action(entry)
+            if entry.text != text:
+                changed.append(entry)
+        return changed
+
+    def priority_histogram(self) -> collections.Counter[Priority | None]:
+        """Count the entries with each priority.
+
+        This gives the same result as counting each entry's ``priority``, but
+        is considerably faster for entries that haven't been parsed.  Their
+        priority is read straight from their text, and isn't stored, while
+        entries that already have their priority are counted from it.
+
+        Returns:
+            Number of entries with each priority, with ``None`` counting
+            those without one.
+
+        Raises:
+            ValueError: An entry has an invalid priority.
+        """
+        extract = _extract_priority
+        return collections.Counter(
+            [
+                extract(entry.text)
+                if (priority := entry._cached("priority")) is _UNSET
+                else priority
+                for entry in self
+            ]
+        )
+
+    def dedupe(self, *, normalize: bool = False) -> typing.Self:
+        """Return a copy of the list without duplicate entries.
+
+        Entries are compared by their text, keeping the first of each.
+
+        Args:
+            normalize: Also treat entries as duplicates when they only differ
+                in the order of their contexts, projects, and attributes, or
+                in whitespace.
+        """
+        key = _normalized_text if normalize else _text_key
+        seen: set[str] = set()
+        unique = []
+        for entry in self:
+            k = key(entry)
+            if k not in seen:
+                seen.add(k)
+                unique.append(entry)
+        return self.__class__(unique)
+
+    def diff(
+        self,
+        other: typing.Iterable[Entry | CompactEntry],
+        *,
+        normalize: bool = False,
+    ) -> Changes:
+        """Find the entries added and removed in another list.
+
+        Entries are matched by their text, and repeated entries are counted,
+        so a list containing a task twice differs from one containing it
+        once.  ``modified`` is always empty.
+
+        Args:
+            other: Entries to compare against, such as another copy of the
+                same file.
+            normalize: Match entries which only differ in the order of their
+                contexts, projects, and attributes, or in whitespace.
+
+        Returns:
+            Entries from ``other`` that aren't in this list, and entries from
+            this list that aren't in ``other``.
+        """
+        key = _normalized_text if normalize else _text_key
+        other = list(other)
+        other_keys = list(map(key, other))
+        available = collections.Counter(other_keys)
+        keys = []
+        removed = []
+        for entry in self:
+            k = key(entry)
+            keys.append(k)
+            if available[k]:
+                available[k] -= 1
+            else:
+                removed.append(entry)
+        available = collections.Counter(keys)
+        added = []
+        for entry, k in zip(other, other_keys):
+            if available[k]:
+                available[k] -= 1
+            else:
+                added.append(entry)
+        return Changes(added, removed, [])
+
+    def merge(
+        self,
+        other: typing.Iterable[Entry | CompactEntry],
+        *,
+        normalize: bool = False,
+    ) -> typing.Self:
+        """Return a copy of the list with the entries only in another list.
+
+        This is suitable for combining copies of a file that have been edited
+        separately, for example on two machines.  The entries added in
+        ``other``, as found by ``diff``, are appended to a copy of this list.
+
+        Args:
+            other: Entries to merge.
+            normalize: Match entries which only differ in the order of their
+                contexts, projects, and attributes, or in whitespace.
+        """
+        return self.__class__(
+            [*self, *self.diff(other, normalize=normalize).added]
+        )
+
+    def sorted_by(
+        self,
+        *keys: str,
+        reverse: bool = False,
+        limit: int | None = None,
+    ) -> typing.Self:
+        """Return a sorted copy of the list.
+
+        Entries are ordered by each of the given keys in turn.  The keys may
+        be ``priority``, ``creation_date``, ``completion_date``, ``complete``,
+        or ``text``, and any other name is read from ``attrs``.  Priorities
+        sort from ``A``, and missing values always sort last.
+
+        Each entry stores the key it was last sorted with, so repeatedly
+        sorting by the same keys only computes them for entries that have
+        changed.
+
+        Args:
+            keys: Names to sort by, defaulting to priority, creation date,
+                ``due`` attribute, and text.
+            reverse: Sort in descending order.
+            limit: Only return this many entries, which is much faster than
+                sorting the whole list when it is small.
+
+        Returns:
+            The sorted entries.
+        """
+        if not keys:
+            keys = ("priority", "creation_date", "due", "text")
+        getters = [
+            _SORT_KEYS.get(
+                name,
+                lambda entry, name=name: _attr_sort_key(entry.attrs.get(name)),
+            )
+            for name in keys
+        ]
+
+        def sort_key(entry: Entry | CompactEntry) -> tuple[typing.Any, ...]:
+            cached = entry._sort_key
+            if cached is not None and cached[0] == keys:
+                return cached[1]
+            key = tuple([getter(entry) for getter in getters])
+            # Bypass ``Entry.__setattr__``, as this may be called for every
+            # entry in a large list
+            object.__setattr__(entry, "_sort_key", (keys, key))
+            return key
+
+        if limit is None:
+            return type(self)(sorted(self, key=sort_key, reverse=reverse))
+        # Imported here as it is only needed for partial sorts
+        import heapq
+
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        return type(self)(select(limit, self, key=sort_key))
+
+    def save(
+        self,
+        file: str | os.PathLike[str],
+        *,
+        changed: typing.Iterable[Entry | CompactEntry] | None = None,
+        encoding: str = "utf-8",
+    ) -> None:
+        """Write the list to a file in ``todo.txt`` format.
+
+        The file is replaced atomically, so it always contains either the old
+        or the new tasks, even if writing fails part way through.  Each entry's
+        ``lineno`` and ``offset`` are updated to match the new file.
+
+        When only a few entries have been changed since the file was read, pass
+        them as ``changed``.  If each still has the same encoded length then
+        their lines are overwritten in place, instead of writing the whole
+        file.  This relies on the file not having been modified since the
+        entries' offsets were set, when it was read by ``parse_file`` or
+        ``map_file`` for example, or by the last ``save``.
+
+        Args:
+            file: The path to write to.
+            changed: Entries in the list which have changed since the file was
+                read.
+            encoding: Encoding to use, which must be ASCII compatible.
+        """
+        if changed is not None and _patch_lines(file, changed, encoding):
+            return
+        positions = []
+        offset = 0
+
+        def lines() -> typing.Iterator[bytes]:
+            nonlocal offset
+            for entry in self:
+                line = entry.text.encode(encoding) + b"\n"
+                positions.append(offset)
+                offset += len(line)
+                yield line
+
+        _atomic_write(file, lines())
+        for lineno, (entry, offset) in enumerate(zip(self, positions), 1):
+            # Bypass ``Entry.__setattr__``, as this is called for every entry
+            object.__setattr__(entry, "lineno", lineno)
+            object.__setattr__(entry, "offset", offset)
+
+    async def asave(
+        self,
+        file: str | os.PathLike[str],
+        *,
+        changed: typing.Iterable[Entry | CompactEntry] | None = None,
+        encoding: str = "utf-8",
+    ) -> None:
+        """Asynchronously write the list to a file in ``todo.txt`` format.
+
+        This is an async version of ``save``, which writes a snapshot of the
+        list in a worker thread.  Entries must not be modified until it
+        completes.
+
+        Args:
+            file: The path to write to.
+            changed: Entries in the list which have changed since the file was
+                read.
+            encoding: Encoding to use, which must be ASCII compatible.
+        """
+        import asyncio
+
+        snapshot = Entries(self)
+        await asyncio.to_thread(
+            snapshot.save,
+            file,
+            changed=None if changed is None else list(changed),
+            encoding=encoding,
+        )
+
+    def append_to(
+        self,
+        file: str | os.PathLike[str],
+        entries: typing.Iterable[Entry | CompactEntry],
+        *,
+        encoding: str = "utf-8",
+    ) -> None:
+        """Add new entries to the end of a file, and of the list.
+
+        This is much cheaper than ``save`` for adding tasks to a large file, as
+        only the new lines are written.
+
+        Args:
+            file: The path to append to, which should be the file the list was
+                read from.
+            entries: New entries to add.
+            encoding: Encoding to use, which must be ASCII compatible.
+        """
+        entries = list(entries)
+        lines = [entry.text.encode(encoding) + b"\n" for entry in entries]
+        with open(file, "a+b") as fh:
+            # Find the number of lines already in the file, only reading back
+            # from the last entry when its position is known
+            last = self[-1] if self else None
+            start, lineno = 0, 0
+            if last is not None and last.offset is not None and last.lineno:
+                start, lineno = last.offset, last.lineno - 1
+            fh.seek(start)
+            tail = fh.read()
+            if tail[-1:] not in b"\r\n":
+                lines.insert(0, b"\n")
+                tail += b"\n"
+            lineno += _count_lines(tail)
+            offset = start + len(tail)
+            fh.write(b"".join(lines))
+            fh.flush()
+            os.fsync(fh.fileno())
+        for entry in entries:
+            lineno += 1
+            object.__setattr__(entry, "lineno", lineno)
+            object.__setattr__(entry, "offset", offset)
+            offset += len(entry.text.encode(encoding)) + 1
+        self.extend(entries)
+
+    @staticmethod
+    def archive(
+        todo: str | os.PathLike[str],
+        done: str | os.PathLike[str],
+        *,
+        encoding: str = "utf-8",
+    ) -> int:
+        """Move completed tasks from one file to another.
+
+        Both files are processed a line at a time, so this is suitable for
+        very large files.  Completed tasks are appended to ``done``, and
+        ``todo`` is then replaced atomically; if this is interrupted tasks may
+        appear in both files, but are never lost.
+
+        Any ``Entries`` read from ``todo`` will need to be reloaded afterwards,
+        see ``reload``.
+
+        Args:
+            todo: The path to the file containing tasks.
+            done: The path to the file containing completed tasks.
+            encoding: Encoding of both files.
+
+        Returns:
+            The number of tasks that were moved.
+        """
+        archived = 0
+        # Lines are read with their terminators untranslated, so the ones that
+        # are kept are written back exactly as they were
+        with (
+            open(todo, encoding=encoding, newline="") as src,
+            open(done, "a+b") as dst,
+        ):
+            if dst.seek(0, os.SEEK_END):
+                dst.seek(-1, os.SEEK_END)
+                separator = b"" if dst.read(1) in b"\r\n" else b"\n"
+            else:
+                separator = b""
+
+            def remaining() -> typing.Iterator[bytes]:
+                nonlocal archived, separator
+                for line in src:
+                    if _extract_complete(line):
+                        dst.write(
+                            separator + line.rstrip("\r\n").encode(encoding)
+                        )
+                        separator = b"\n"
+                        archived += 1
+                    else:
+                        yield line.encode(encoding)
+                if archived:
+                    dst.write(b"\n")
+                # The completed tasks must be safely stored before they're
+                # removed from ``todo``
+                dst.flush()
+                os.fsync(dst.fileno())
+
+            _atomic_write(todo, remaining())
+        return archived
+
+
+class LazyEntries(collections.abc.Sequence):
+    """Read-only task list that only creates entries when they're used.
+
+    Only the position of each line is stored, so memory use for even very
+    large files is small, and entries are created from the file's contents
+    when accessed.  Recently used entries are kept, so repeated access returns
+    the same object, but changes to an entry are lost once it is evicted.
+    For example, to show the second page of a large archive::
+
+        with LazyEntries("done.txt") as archive:
+            page = archive[50:100]
+
+    The file is memory mapped until ``close`` is called.  Convert to
+    ``Entries`` to work with the complete list.
+
+    Args:
+        file: The path to the file containing task entries.
+        encoding: Encoding of the file, which must be ASCII compatible.
+        entry_type: Class to use for entries.
+        cache_size: Maximum number of entries to keep.
+    """
+
+    def __init__(
+        self,
+        file: str | os.PathLike[str],
+        *,
+        encoding: str = "utf-8",
+        entry_type: _EntryClass = Entry,
+        cache_size: int = 1024,
+    ) -> None:
+        self._encoding = encoding
+        self._entry_type = entry_type
+        self._cache_size = cache_size
+        self._cache: collections.OrderedDict[int, Entry | CompactEntry] = (
+            collections.OrderedDict()
+        )
+        # Imported here as they are only needed for this class
+        import array
+        import mmap
+
+        self._buf: bytes | mmap.mmap = b""
+        with open(file, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size:
+                self._buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._linenos = array.array("Q")
+        self._starts = array.array("Q")
+        self._ends = array.array("Q")
+        for lineno, start, end in _iter_line_spans(self._buf, encoding):
+            self._linenos.append(lineno)
+            self._starts.append(start)
+            self._ends.append(end)
+
+    def __enter__(self) -> typing.Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the file, after which entries can't be accessed."""
+        if not isinstance(self._buf, bytes):
+            self._buf.close()
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def _load(self, index: int) -> Entry | CompactEntry:
+        start = self._starts[index]
+        return self._entry_type._from_bytes(
+            self._buf[start : self._ends[index]],
+            self._encoding,
+            lineno=self._linenos[index],
+            offset=start,
+        )
+
+    @typing.overload
+    def __getitem__(self, index: int) -> Entry | CompactEntry: ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> Entries: ...
+
+    def __getitem__(self, index: int | slice) -> Entry | CompactEntry | Entries:
+        if isinstance(index, slice):
+            return Entries(self[i] for i in range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LazyEntries index out of range")
+        try:
+            self._cache.move_to_end(index)
+            return self._cache[index]
+        except KeyError:
+            pass
+        entry = self._load(index)
+        if self._cache_size > 0:
+            self._cache[index] = entry
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return entry
+
+    def __iter__(self) -> typing.Iterator[Entry | CompactEntry]:
+        # Iterating over the whole list would flush the cache, so only use
+        # it for entries that are already there
+        for index in range(len(self)):
+            entry = self._cache.get(index)
+            yield self._load(index) if entry is None else entry
+
+
+class ProfileStats:
+    """Counters collected by ``profiling``.
+
+    Attributes:
+        calls: Number of calls to each field's extractor, by field name, and
+            to the single pass tokenizer as ``tokenize``.
+        time: Cumulative time in seconds spent in each extractor.
+        hits: Accesses of each field which used a previously computed value.
+        misses: Accesses of each field which had to compute the value.
+        lines_read: Lines read by ``parse_file`` and ``iter_file``.
+        lines_skipped: Lines read that were blank, and so skipped.
+        read_time: Time in seconds spent reading lines.
+        invalidations: Changes to entries' ``text``, whether assigned or made
+            by methods such as ``mark_complete``, which drop computed values.
+    """
+
+    def __init__(self) -> None:
+        self.calls: collections.Counter[str] = collections.Counter()
+        self.time: collections.Counter[str] = collections.Counter()
+        self.hits: collections.Counter[str] = collections.Counter()
+        self.misses: collections.Counter[str] = collections.Counter()
+        self.lines_read = 0
+        self.lines_skipped = 0
+        self.read_time = 0.0
+        self.invalidations = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__qualname__} calls={dict(self.calls)!r} "
+            f"lines_read={self.lines_read} "
+            f"invalidations={self.invalidations}>"
+        )
+
+    def report(self) -> str:
+        """Format the counters as a table, slowest extractors first."""
+        lines = [
+            (
+                f"{'field':>15} {'calls':>9} {'seconds':>9} {'hits':>9} "
+                f"{'misses':>9}"
+            )
+        ]
+        names = sorted(
+            self.calls.keys() | self.hits.keys() | self.misses.keys(),
+            key=lambda name: -self.time[name],
+        )
+        lines.extend(
+            f"{name:>15} {self.calls[name]:9} {self.time[name]:9.4f} "
+            f"{self.hits[name]:9} {self.misses[name]:9}"
+            for name in names
+        )
+        lines.append(
+            f"lines read {self.lines_read} ({self.read_time:.4f}s), "
+            f"skipped {self.lines_skipped}, "
+            f"invalidations {self.invalidations}"
+        )
+        return "\n".join(lines)
+
+
+def _timed(
+    stats: ProfileStats, name: str, func: typing.Callable[[str], typing.Any]
+) -> typing.Callable[[str], typing.Any]:
+    from time import perf_counter
+
+    @functools.wraps(func)
+    def wrapper(text: str) -> typing.Any:
+        start = perf_counter()
+        try:
+            return func(text)
+        finally:
+            stats.time[name] += perf_counter() - start
+            stats.calls[name] += 1
+
+    return wrapper
+
+
+class _ProfiledCachedProperty:
+    """Stand in for an ``Entry`` field, counting cache hits and misses.
+
+    This is a data descriptor, unlike ``functools.cached_property``, so that
+    it is consulted even when the value is already in the instance dictionary.
+    """
+
+    def __init__(
+        self, stats: ProfileStats, prop: functools.cached_property
+    ) -> None:
+        self._stats = stats
+        self._prop = prop
+        self._name = prop.attrname
+
+    def __get__(self, instance: Entry | None, owner: type | None = None):
+        if instance is None:
+            return self
+        try:
+            value = instance.__dict__[self._name]
+        except KeyError:
+            self._stats.misses[self._name] += 1
+            return self._prop.__get__(instance, owner)
+        self._stats.hits[self._name] += 1
+        return value
+
+    def __set__(self, instance: Entry, value: typing.Any) -> None:
+        raise AttributeError(f"Cannot set attribute '{self._name}'.")
+
+
+def _profiled_slot(stats: ProfileStats, name: str, prop: property) -> property:
+    slot = f"_{name}"
+    fget = prop.fget
+
+    def getter(entry: CompactEntry) -> typing.Any:
+        if getattr(entry, slot) is _UNSET:
+            stats.misses[name] += 1
+        else:
+            stats.hits[name] += 1
+        return fget(entry)
+
+    return property(getter, doc=prop.__doc__)
+
+
+# Set while ``profiling`` is active
+_profile_stats: ProfileStats | None = None
+
+
+def profiling() -> "contextlib.AbstractContextManager[ProfileStats]":
+    """Collect statistics on parsing within a block.
+
+    Instrumented versions of the field extractors and properties are swapped
+    in for the duration of the block, so there is no overhead at all when
+    profiling isn't active.  For example::
+
+        with penelopise.profiling() as stats:
+            entries = Entries.parse_file("todo.txt")
+            overdue = [e for e in entries if e.attrs.get("due", today) < today]
+        print(stats.report())
+
+    Statistics are collected from every thread while active, and profiling
+    can't be nested.
+
+    Returns:
+        Context manager producing statistics, which are updated as entries
+        are used.
+
+    Raises:
+        RuntimeError: If profiling is already active.
+    """
+    import contextlib
+
+    return contextlib.contextmanager(_profiling)()
+
+
+def _profiling() -> typing.Iterator[ProfileStats]:
+    global _profile_stats
+    from time import perf_counter
+
+    if _profile_stats is not None:
+        raise RuntimeError("Profiling is already active")
+    stats = _profile_stats = ProfileStats()
+    module = globals()
+    patches: list[tuple[typing.Any, str, typing.Any]] = []
+
+    def patch(target: typing.Any, name: str, value: typing.Any) -> None:
+        if isinstance(target, dict):
+            patches.append((target, name, target[name]))
+            target[name] = value
+        else:
+            patches.append((target, name, target.__dict__[name]))
+            setattr(target, name, value)
+
+    for name in _FIELDS:
+        extractor = f"_extract_{name}"
+        patch(module, extractor, _timed(stats, name, module[extractor]))
+        patch(Entry, name, _ProfiledCachedProperty(stats, Entry.__dict__[name]))
+        patch(
+            CompactEntry,
+            name,
+            _profiled_slot(stats, name, CompactEntry.__dict__[name]),
+        )
+    patch(module, "_tokenize", _timed(stats, "tokenize", _tokenize))
+
+    # Assigning the text and the structured mutators both end by notifying
+    # indexes, and only when the text has actually changed
+    notify = _BaseEntry._notify
+
+    def counted_notify(entry: _BaseEntry) -> None:
+        stats.invalidations += 1
+        notify(entry)
+
+    patch(_BaseEntry, "_notify", counted_notify)
+
+    iter_lines = Entries.iter_lines
+
+    def counted_iter_lines(
+        lines: typing.Iterable[str], **kwargs: typing.Any
+    ) -> typing.Iterator[Entry | CompactEntry]:
+        def counted() -> typing.Iterator[str]:
+            it = iter(lines)
+            while True:
+                start = perf_counter()
+                line = next(it, None)
+                stats.read_time += perf_counter() - start
+                if line is None:
+                    return
+                stats.lines_read += 1
+                if not line.strip():
+                    stats.lines_skipped += 1
+                yield line
+
+        return iter_lines(counted(), **kwargs)
+
+    patch(Entries, "iter_lines", staticmethod(counted_iter_lines))
+    try:
+        yield stats
+    finally:
+        for target, name, value in reversed(patches):
+            if isinstance(target, dict):
+                target[name] = value
+            else:
+                setattr(target, name, value)
+        _profile_stats = None
@@ -0,0 +1,87 @@
+import pytest
+
+import penelopise
+
+
+def fields(entry):
+    """Collect all fields from an entry, including those that raise.
+
+    Tuples, as used by ``CompactEntry``, are converted to lists so that
+    entries of either type can be compared.
+    """
+    result = {}
+    for name in penelopise._FIELDS:
+        try:
+            value = getattr(entry, name)
+        except (KeyError, ValueError) as e:
+            value = type(e)
+        result[name] = list(value) if isinstance(value, tuple) else value
+    return result
+
+
+@pytest.fixture
+def todo_file(tmp_path):
+    """A small task file, with a blank line and mixed line terminators."""
+    path = tmp_path / "todo.txt"
+    path.write_bytes(
+        b"(A) call Mom @phone\r\n\r\nbuy milk @shops\nx 2025-01-02 sweep\n"
+    )
+    return path
+
+
+@pytest.fixture
+def entries():
+    """A few tasks with overlapping contexts, projects and attributes."""
+    return penelopise.Entries(
+        [
+            penelopise.Entry("(A) 2026-01-05 call Mom @phone +Family"),
+            penelopise.Entry(
+                "(C) schedule sale @phone +Work @office due:2026-10-01"
+            ),
+            penelopise.Entry("price items +Work @office due:2026-11-30 pri:B"),
+            penelopise.Entry("x 2026-01-02 2025-12-30 sweep @home due:soon"),
+            penelopise.Entry("book flights pri:1"),
+        ]
+    )
+
+
+@pytest.fixture(scope="session")
+def write_file(tmp_path_factory):
+    """Write a file in a new directory, for tests run by Hypothesis.
+
+    Function scoped fixtures aren't reset between examples, so each call
+    gets a fresh directory. Bytes are written as they are, and anything
+    else is taken to be lines of text.
+    """
+
+    def write(content):
+        path = tmp_path_factory.mktemp("todo") / "todo.txt"
+        if isinstance(content, bytes):
+            path.write_bytes(content)
+        else:
+            path.write_text("\n".join(content))
+        return path
+
+    return write
+
+
+def encodable(todo_list):
+    """Texts from ``todo_testable`` that can be written to a file.
+
+    Lone surrogates can't be encoded, so texts containing them are skipped.
+    """
+    return [
+        text
+        for text, _ in todo_list
+        if text.encode(errors="ignore").decode() == text
+    ]
+
+
+def positions(entries):
+    """Where each entry was read from, along with its text."""
+    return [(e.lineno, e.offset, e.text) for e in entries]
+
+
+def ids(entries):
+    """The identities of some entries, ignoring their order."""
+    return sorted(id(e) for e in entries)
@@ -0,0 +1,98 @@
+import asyncio
+import os
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+import penelopise
+from penelopise import CompactEntry, Entries, Entry
+
+from .conftest import encodable, positions
+from .strategies import todo_testable
+
+
+@given(st.lists(todo_testable(), max_size=10))
+def test_matches_parse_file(write_file, todo_list):
+    """Async parsing should produce the same entries as ``parse_file``."""
+    path = write_file(encodable(todo_list))
+    entries = asyncio.run(Entries.aparse_file(path))
+    assert positions(entries) == positions(Entries.parse_file(path))
+
+
+def test_batches(todo_file, monkeypatch):
+    """Line numbers should continue across batches."""
+    monkeypatch.setattr(penelopise, "_ASYNC_READ_SIZE", 1)
+    entries = asyncio.run(
+        Entries.aparse_file(todo_file, eager=True, entry_type=CompactEntry)
+    )
+    assert positions(entries) == positions(Entries.parse_file(todo_file))
+    assert isinstance(entries[0], CompactEntry)
+
+
+def test_yields_control(todo_file, monkeypatch):
+    """Other tasks should run while a file is parsed."""
+    monkeypatch.setattr(penelopise, "_ASYNC_READ_SIZE", 1)
+    events = []
+
+    async def ticker():
+        for _ in range(3):
+            events.append("tick")
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.create_task(ticker())
+        async for entry in Entries.aiter_file(todo_file):
+            events.append(entry.lineno)
+        await task
+
+    asyncio.run(main())
+    assert events[-1] == 4
+    assert events.index("tick") < events.index(4)
+
+
+def test_file_object(todo_file):
+    """Open files should be read, but not closed."""
+
+    async def main():
+        with todo_file.open() as fh:
+            entries = await Entries.aparse_file(fh)
+            assert not fh.closed
+        return entries
+
+    assert len(asyncio.run(main())) == 3
+
+
+def test_early_exit(todo_file):
+    """Files should be closed when iteration stops early."""
+
+    async def main():
+        found = Entries.aiter_file(todo_file)
+        entry = await anext(found)
+        await found.aclose()
+        return entry
+
+    assert asyncio.run(main()).lineno == 1
+
+
+def test_asave(tmp_path):
+    """Async saves should write the file and update positions."""
+    path = tmp_path / "todo.txt"
+    entries = Entries([Entry("first"), Entry("second @home")])
+    asyncio.run(entries.asave(path))
+    assert path.read_text() == "first\nsecond @home\n"
+    assert [e.offset for e in entries] == [0, 6]
+    entries[0].text = "FIRST"
+    asyncio.run(entries.asave(path, changed=entries[:1]))
+    assert path.read_text() == "FIRST\nsecond @home\n"
+
+
+def test_asave_in_place(todo_file):
+    """Changes to parsed entries should be written without replacing the file."""
+    entries = asyncio.run(Entries.aparse_file(todo_file))
+    inode = os.stat(todo_file).st_ino
+    entries[1].text = "buy eggs @shops"
+    asyncio.run(entries.asave(todo_file, changed=entries[1:2]))
+    assert os.stat(todo_file).st_ino == inode
+    assert todo_file.read_bytes() == (
+        b"(A) call Mom @phone\r\n\r\nbuy eggs @shops\nx 2025-01-02 sweep\n"
+    )
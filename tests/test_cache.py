@@ -0,0 +1,271 @@
+import gc
+import os
+
+import pytest
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+
+import penelopise
+from penelopise import CompactEntry, Entries
+
+from .conftest import encodable, fields, positions
+from .strategies import todo_testable
+
+# A modification time far enough in the past to be trusted
+OLD = 10**18
+
+
+@pytest.fixture
+def todo_file(todo_file):
+    os.utime(todo_file, ns=(OLD, OLD))
+    return todo_file
+
+
+@pytest.fixture
+def tokenized(monkeypatch):
+    calls = []
+    tokenize = penelopise._tokenize
+
+    def counting(text):
+        calls.append(text)
+        return tokenize(text)
+
+    monkeypatch.setattr(penelopise, "_tokenize", counting)
+    return calls
+
+
+def loaded(entries):
+    """Positions and fields, which should survive the cache."""
+    return [(*positions([e])[0], fields(e)) for e in entries]
+
+
+@given(st.lists(todo_testable(), max_size=10), st.sampled_from([1, 2]))
+# Writing and syncing the cache for each example is slow enough to be blamed on
+# input generation when measuring coverage
+@settings(suppress_health_check=[HealthCheck.too_slow])
+def test_matches_map_file(write_file, todo_list, loads):
+    """Cached parsing should produce the same entries as ``map_file``."""
+    path = write_file(encodable(todo_list))
+    os.utime(path, ns=(OLD, OLD))
+    expected = loaded(Entries.map_file(path))
+    for _ in range(loads):
+        entries = Entries.parse_file_cached(path, cache_dir=path.parent / "c")
+    assert loaded(entries) == expected
+
+
+def test_unchanged_file(tmp_path, todo_file, tokenized, monkeypatch):
+    """Unchanged files shouldn't be read or parsed."""
+    Entries.parse_file_cached(todo_file, cache_dir=tmp_path / "c")
+    tokenized.clear()
+
+    def fail(*args):
+        raise AssertionError("file was read")
+
+    monkeypatch.setattr(penelopise, "_iter_line_spans", fail)
+    entries = Entries.parse_file_cached(todo_file, cache_dir=tmp_path / "c")
+    assert entries[0].contexts == ["phone"]
+    assert entries[1].lineno == 3
+    assert not tokenized
+
+
+@pytest.mark.parametrize("entry_type", [penelopise.Entry, CompactEntry])
+def test_not_reparsed(tmp_path, monkeypatch, entry_type):
+    """Entries loaded from the cache should use its values, not the text."""
+    path = tmp_path / "todo.txt"
+    path.write_text(
+        "x 2025-01-07 2025-01-01 call Mom @phone +Family\n"
+        "(B) buy milk due:2025-01-05 shop:corner\n"
+    )
+    os.utime(path, ns=(OLD, OLD))
+    expected = loaded(Entries.parse_file(path, entry_type=entry_type))
+    Entries.parse_file_cached(path, cache_dir=tmp_path / "c")
+
+    def fail(*args):
+        raise AssertionError("entry was parsed")
+
+    monkeypatch.setattr(penelopise, "_tokenize", fail)
+    for name in dir(penelopise):
+        if name.startswith("_extract_"):
+            monkeypatch.setattr(penelopise, name, fail)
+    entries = Entries.parse_file_cached(
+        path, cache_dir=tmp_path / "c", entry_type=entry_type
+    )
+    assert loaded(entries) == expected
+
+
+QUERY_FILE = """\
+(A) call Mom @phone +Family
+x 2025-01-03 2025-01-01 pay rent +Home due:2025-01-01
+
+(B) buy milk @shop due:2025-01-05
+(C) email Bob @phone pri:1
+call Dad @phone +Family due:2025-01-05 @phone
+(D) @phone
+"""
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "@phone",
+        "@phone +Family",
+        "@phone !+Family",
+        "+Family !@phone",
+        "pri=A",
+        "pri>=C @phone",
+        "pri!=A",
+        "due:2025-01-05",
+        "due=2025-01-05 !complete",
+        "@phone Mom",
+        "complete",
+        "@nowhere",
+        "!complete",
+        "Bob",
+    ],
+)
+def test_query(tmp_path, query):
+    """Queries should select the same entries as filtering every entry."""
+    path = tmp_path / "todo.txt"
+    path.write_text(QUERY_FILE)
+    os.utime(path, ns=(OLD, OLD))
+    expected = loaded(Entries.parse_file(path).filter(query))
+    # The first load writes the cache, and the second uses it
+    for _ in range(2):
+        entries = Entries.parse_file_cached(
+            path, cache_dir=tmp_path / "c", query=query
+        )
+        assert loaded(entries) == expected
+
+
+def test_query_reads_selected(tmp_path, todo_file, tokenized, monkeypatch):
+    """Queries should only read the lines the cache selects."""
+    Entries.parse_file_cached(todo_file, cache_dir=tmp_path / "c")
+    tokenized.clear()
+
+    def fail(*args):
+        raise AssertionError("every line was read")
+
+    monkeypatch.setattr(penelopise, "_read_cache", fail)
+    monkeypatch.setattr(penelopise, "_iter_line_spans", fail)
+    (entry,) = Entries.parse_file_cached(
+        todo_file, cache_dir=tmp_path / "c", query="@phone pri=A"
+    )
+    assert entry.text == "(A) call Mom @phone"
+    assert (entry.lineno, entry.offset) == (1, 0)
+    assert not tokenized
+    assert not Entries.parse_file_cached(
+        todo_file, cache_dir=tmp_path / "c", query="@phone !pri=A"
+    )
+
+
+def test_changed_lines(tmp_path, todo_file, tokenized):
+    """Only lines that have changed should be parsed."""
+    Entries.parse_file_cached(todo_file, cache_dir=tmp_path / "c")
+    assert len(tokenized) == 3
+    tokenized.clear()
+    todo_file.write_text(
+        "new task\n(A) call Mom @phone\nbuy milk @shops\nx 2025-01-02 sweep\n"
+    )
+    entries = Entries.parse_file_cached(todo_file, cache_dir=tmp_path / "c")
+    assert tokenized == ["new task"]
+    assert [e.lineno for e in entries] == [1, 2, 3, 4]
+    assert entries[2].offset == 29
+
+
+def test_deferred_values(tmp_path, todo_file):
+    """Cached entries should raise for invalid values, and follow changes."""
+    todo_file.write_text(
+        "(A) call Mom @phone\nbuy milk due:2025-01-05\npri:1\n"
+    )
+    os.utime(todo_file, ns=(OLD, OLD))
+    for _ in range(2):
+        entries = Entries.parse_file_cached(
+            todo_file, cache_dir=tmp_path / "c", entry_type=CompactEntry
+        )
+        with pytest.raises(ValueError, match="Invalid priority"):
+            _ = entries[2].priority
+        assert str(entries[1].attrs["due"]) == "2025-01-05"
+    entries[0].text = "call Dad @home"
+    assert entries[0].contexts == ("home",)
+    assert entries[0].priority is None
+
+
+def test_racy_file(tmp_path, todo_file, tokenized, monkeypatch):
+    """Recently modified files should be checked on the next load."""
+    os.utime(todo_file)
+    Entries.parse_file_cached(todo_file, cache_dir=tmp_path / "c")
+    spans = []
+    iter_line_spans = penelopise._iter_line_spans
+
+    def counting(*args):
+        spans.append(args)
+        return iter_line_spans(*args)
+
+    monkeypatch.setattr(penelopise, "_iter_line_spans", counting)
+    Entries.parse_file_cached(todo_file, cache_dir=tmp_path / "c")
+    assert spans
+    assert len(tokenized) == 3
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"", b"garbage", b"\xe9\x00\x00\x00\x00\x00"],
+)
+def test_unusable_cache(tmp_path, todo_file, content):
+    """Damaged cache files should be ignored, and replaced."""
+    cache_dir = tmp_path / "c"
+    Entries.parse_file_cached(todo_file, cache_dir=cache_dir)
+    (cache_file,) = cache_dir.iterdir()
+    cache_file.write_bytes(content)
+    entries = Entries.parse_file_cached(todo_file, cache_dir=cache_dir)
+    assert len(entries) == 3
+    assert cache_file.read_bytes() != content
+
+
+@pytest.mark.parametrize("query", [None, "@phone"])
+def test_truncated_cache(tmp_path, todo_file, query):
+    """Cache files missing part of a section should be ignored."""
+    cache_dir = tmp_path / "c"
+    Entries.parse_file_cached(todo_file, cache_dir=cache_dir)
+    (cache_file,) = cache_dir.iterdir()
+    cache_file.write_bytes(cache_file.read_bytes()[:-1])
+    entries = Entries.parse_file_cached(
+        todo_file, cache_dir=cache_dir, query=query
+    )
+    assert len(entries) == (3 if query is None else 1)
+
+
+def test_encoding_change(tmp_path, todo_file, tokenized):
+    """Caches should only be used with the same encoding."""
+    Entries.parse_file_cached(todo_file, cache_dir=tmp_path / "c")
+    Entries.parse_file_cached(
+        todo_file, cache_dir=tmp_path / "c", encoding="latin-1"
+    )
+    assert len(tokenized) == 6
+
+
+def test_default_location(tmp_path, todo_file, monkeypatch):
+    """Caches should be stored in the user's cache directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    Entries.parse_file_cached(todo_file)
+    assert len(list((tmp_path / "xdg" / "penelopise").iterdir())) == 1
+
+
+def test_unwritable_cache(tmp_path, todo_file):
+    """Failing to write the cache shouldn't prevent parsing."""
+    blocker = tmp_path / "c"
+    blocker.write_text("not a directory")
+    entries = Entries.parse_file_cached(todo_file, cache_dir=blocker)
+    assert len(entries) == 3
+
+
+def test_gc_restored(tmp_path, todo_file):
+    """Garbage collection should only be paused while loading."""
+    Entries.parse_file_cached(todo_file, cache_dir=tmp_path / "c")
+    assert gc.isenabled()
+    gc.disable()
+    try:
+        Entries.parse_file_cached(todo_file, cache_dir=tmp_path / "c")
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
@@ -0,0 +1,76 @@
+import datetime
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from penelopise import Entries, Entry, Priority
+
+from .strategies import todo_testable
+
+numpy = pytest.importorskip("numpy")
+
+
+def as_date(value):
+    return None if numpy.isnat(value) else value.astype(datetime.date)
+
+
+@given(st.lists(todo_testable(), max_size=20))
+def test_matches_entries(todo_list):
+    """Columns should hold the same values as the entries."""
+    entries = Entries(Entry(text) for text, _ in todo_list)
+    columns = entries.to_columns()
+    assert columns.complete.tolist() == [e.complete for e in entries]
+    assert columns.priority.tolist() == [e.priority or 0 for e in entries]
+    assert [as_date(d) for d in columns.creation_date] == [
+        e.creation_date for e in entries
+    ]
+    assert [as_date(d) for d in columns.completion_date] == [
+        e.completion_date for e in entries
+    ]
+    for row, entry in enumerate(entries):
+        for context in entry.contexts:
+            assert columns.contexts.mask(context)[row]
+        for project in entry.projects:
+            assert columns.projects.mask(project)[row]
+        for key, value in entry.attrs.items():
+            assert columns.attrs.mask(key, value)[row]
+
+
+def test_tags():
+    """Tag columns should be dictionary encoded."""
+    entries = Entries(
+        [
+            Entry("(A) call Mom @phone +Family due:2025-06-01"),
+            Entry("email Dad @computer @phone +Family"),
+            Entry("x sweep @home due:soon"),
+        ]
+    )
+    columns = entries.to_columns()
+    assert columns.contexts.names == ("phone", "computer", "home")
+    assert columns.contexts.counts() == {"phone": 2, "computer": 1, "home": 1}
+    assert columns.projects.mask("Family").tolist() == [True, True, False]
+    assert columns.projects.mask("missing").tolist() == [False] * 3
+    assert columns.attrs.mask("due").tolist() == [True, False, True]
+    assert columns.attrs.mask("due", "soon").tolist() == [False, False, True]
+    assert columns.attrs.mask("due", datetime.date(2025, 6, 1)).tolist() == [
+        True,
+        False,
+        False,
+    ]
+    assert columns.priority[0] == Priority.A
+    assert columns.complete.tolist() == [False, False, True]
+
+
+def test_empty():
+    """Empty lists should produce empty columns."""
+    columns = Entries().to_columns()
+    assert columns.complete.shape == (0,)
+    assert columns.creation_date.dtype == numpy.dtype("datetime64[D]")
+    assert columns.attrs.counts() == {}
+
+
+def test_invalid():
+    """Invalid values should raise, as they do when read from an entry."""
+    with pytest.raises(ValueError, match="Invalid priority"):
+        Entries([Entry("pri:1")]).to_columns()
@@ -0,0 +1,106 @@
+import pytest
+from hypothesis import given
+
+import penelopise
+
+from .strategies import todo_testable
+
+
+@given(todo_testable())
+def test_matches_entry(todo_testable):
+    """Compact entries should produce the same values as ``Entry``."""
+    text, _ = todo_testable
+    entry = penelopise.Entry(text)
+    compact = penelopise.CompactEntry(text)
+    assert compact.complete is entry.complete
+    assert compact.completion_date == entry.completion_date
+    assert compact.creation_date == entry.creation_date
+    assert compact.priority == entry.priority
+    assert compact.contexts == tuple(entry.contexts)
+    assert compact.projects == tuple(entry.projects)
+    assert compact.attrs == entry.attrs
+
+
+@given(todo_testable())
+def test_parse_all(todo_testable):
+    """Single pass parsing should fill the same values."""
+    text, _ = todo_testable
+    compact = penelopise.CompactEntry(text).parse_all()
+    assert compact.contexts == penelopise.CompactEntry(text).contexts
+    assert compact.attrs == penelopise.CompactEntry(text).attrs
+
+
+def test_no_instance_dict():
+    """Compact entries shouldn't carry an instance dictionary."""
+    entry = penelopise.CompactEntry("(A) call Mom @phone")
+    assert not hasattr(entry, "__dict__")
+    with pytest.raises(AttributeError):
+        entry.complete = True  # type: ignore
+
+
+def test_shared_values():
+    """Tags should be interned, and empty values shared."""
+    first = penelopise.CompactEntry("buy milk @shops")
+    second = penelopise.CompactEntry("buy bread @shops")
+    assert first.contexts[0] is second.contexts[0]
+    assert first.projects is second.projects
+    assert first.attrs is second.attrs
+
+
+def test_properties_invalidate_on_change():
+    """Text changes should invalidate computed properties."""
+    e = penelopise.CompactEntry("example with @context")
+    assert e.contexts == ("context",)
+    e.text = "dropped context"
+    assert not e.contexts
+
+
+def test_comparison():
+    """Compact entries should compare with regular entries."""
+    assert penelopise.CompactEntry("example") == penelopise.Entry("example")
+    assert penelopise.CompactEntry("(A) example") > penelopise.Entry("other")
+
+
+def test_file_input(tmp_path):
+    """Test file parsing to compact entries."""
+    p = tmp_path / "todo.txt"
+    p.write_text("x Rule @Ithaca\nDevise machine to unravel +shroud @bed\n")
+    entries = penelopise.Entries.parse_file(
+        p, entry_type=penelopise.CompactEntry
+    )
+    assert all(isinstance(e, penelopise.CompactEntry) for e in entries)
+    assert entries == penelopise.Entries.parse_file(p)
+
+
+def test_cached_values():
+    """Computed values should be reused."""
+    e = penelopise.CompactEntry("(A) 2025-08-01 file +taxes due:2025-08-17")
+    for attr in [
+        "complete",
+        "completion_date",
+        "creation_date",
+        "priority",
+        "projects",
+        "attrs",
+    ]:
+        assert getattr(e, attr) is getattr(e, attr)
+
+
+@pytest.mark.parametrize(
+    "text, field, exception",
+    [
+        ("invalid pri:value", "priority", ValueError),
+        ("duplicate key:value1 key:value2", "attrs", KeyError),
+    ],
+)
+def test_parse_all_defers_errors(text, field, exception):
+    """Errors should only surface when the failing property is accessed."""
+    entry = penelopise.CompactEntry(text).parse_all()
+    with pytest.raises(exception):
+        getattr(entry, field)
+
+
+def test_base_is_abstract():
+    """Entry implementations must provide the storage hooks."""
+    with pytest.raises(TypeError, match="abstract"):
+        penelopise._BaseEntry()
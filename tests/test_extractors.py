@@ -0,0 +1,96 @@
+import datetime
+import pathlib
+
+import pytest
+from hypothesis import given
+
+import penelopise
+from penelopise import CompactEntry, Entry, register_extractor
+
+from .strategies import todo_testable
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(penelopise, "_EXTRACTORS", {})
+
+
+@given(todo_testable())
+def test_matches_attrs(todo):
+    """Extracted values should match ``attrs`` for simple attributes."""
+    text, data = todo
+    entry = Entry(text)
+    try:
+        for key, value in data.attrs.items():
+            if key != "pri":
+                register_extractor(key)
+                assert entry.extract(key) == value
+    finally:
+        penelopise._EXTRACTORS.clear()
+
+
+@pytest.mark.parametrize("entry_type", [Entry, CompactEntry])
+@pytest.mark.usefixtures("registry")
+def test_extract(entry_type):
+    """Registered attributes should be converted, and cached."""
+    calls = []
+
+    def convert(value):
+        calls.append(value)
+        return pathlib.Path(value)
+
+    register_extractor("body", convert)
+    register_extractor("due", datetime.date.fromisoformat)
+    entry = entry_type("write report body:notes/report.md")
+    assert entry.extract("body").suffix == ".md"
+    assert entry.extract("body") is entry.extract("body")
+    assert entry.extract("due") is None
+    assert calls == ["notes/report.md"]
+    entry.text = "write report due:2025-01-05 nobody:x.md"
+    assert entry.extract("body") is None
+    assert entry.extract("due") == datetime.date(2025, 1, 5)
+
+
+@pytest.mark.usefixtures("registry")
+def test_extract_errors():
+    """Unregistered and repeated attributes should raise."""
+    register_extractor("body")
+    with pytest.raises(KeyError, match="Unregistered"):
+        Entry("due:soon").extract("due")
+    with pytest.raises(KeyError, match="Duplicate"):
+        Entry("body:a body:b").extract("body")
+    with pytest.raises(ValueError, match="Invalid attribute"):
+        register_extractor("bad key")
+    with pytest.raises(ValueError, match="Invalid attribute"):
+        register_extractor("")
+
+
+@pytest.mark.usefixtures("registry")
+def test_reregister():
+    """Registering a key again should replace its converter."""
+    register_extractor("n", int)
+    assert Entry("n:4").extract("n") == 4
+    register_extractor("n", float)
+    assert Entry("n:4").extract("n") == 4.0
+
+
+@pytest.mark.parametrize(
+    ("text", "field", "expected"),
+    [
+        ("x (A) 2025-01-02 task", "completion_date", datetime.date(2025, 1, 2)),
+        ("x\t(A) task", "priority", penelopise.Priority.A),
+        ("(B) 2025-01-02 task", "creation_date", datetime.date(2025, 1, 2)),
+        ("٢025-01-02 task", "creation_date", ValueError),
+        ("task (A) ", "priority", None),
+        ("task with:colon", "attrs", {"with": "colon"}),
+        ("task", "attrs", {}),
+        ("email a@b.com", "contexts", []),
+    ],
+)
+def test_fast_paths(text, field, expected):
+    """Skipping the regex should never change the result."""
+    if expected is ValueError:
+        with pytest.raises(ValueError):
+            getattr(Entry(text), field)
+    else:
+        assert getattr(Entry(text), field) == expected
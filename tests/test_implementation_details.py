@@ -1,3 +1,5 @@
+import datetime
+
 import pytest
 
 import penelopise
@@ -15,3 +17,34 @@ def test_priority_with_pri_tag():
     entry = penelopise.Entry("some task pri:A")
     assert entry.priority == penelopise.Priority.A
     assert entry.attrs == {}
+
+
+@pytest.mark.parametrize("parse_all", [False, True])
+def test_shared_dates(parse_all):
+    """Test identical dates share a single object."""
+    first = penelopise.Entry("x 2025-01-02 2025-01-01 task due:2025-01-01")
+    second = penelopise.Entry("x 2025-01-02 2025-01-01 other due:2025-01-01")
+    if parse_all:
+        first.parse_all()
+        second.parse_all()
+    assert first.creation_date is second.creation_date
+    assert first.completion_date is second.completion_date
+    assert first.attrs["due"] is second.creation_date
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("notes.md", "notes.md"),
+        ("2025-13-01", "2025-13-01"),
+        ("20250105", datetime.date(2025, 1, 5)),
+        ("2025W011", datetime.date(2024, 12, 30)),
+        ("2025-W01-1", datetime.date(2024, 12, 30)),
+    ],
+)
+def test_attr_dates(value, expected):
+    """Test attribute values are dates whenever ``fromisoformat`` allows."""
+    assert penelopise.Entry(f"task key:{value}").attrs["key"] == expected
+    assert penelopise.Entry(f"task key:{value}").parse_all().attrs == {
+        "key": expected
+    }
@@ -0,0 +1,66 @@
+import json
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+import penelopise
+
+DEFERRED = [
+    "array",
+    "asyncio",
+    "bisect",
+    "concurrent.futures",
+    "gc",
+    "hashlib",
+    "heapq",
+    "mmap",
+    "numpy",
+    "tempfile",
+    "threading",
+]
+
+SCRIPT = f"""
+import json, sys
+import penelopise
+print(json.dumps({{
+    "modules": [m for m in {DEFERRED!r} if m in sys.modules],
+    "compiled": [
+        name
+        for name, value in vars(penelopise).items()
+        if isinstance(value, penelopise._LazyPattern)
+        and value._compiled is not None
+    ],
+}}))
+"""
+
+
+def test_import_is_lazy():
+    """Importing shouldn't compile patterns, or import rarely used modules."""
+    # Use the same copy of the package as the tests
+    path = os.path.dirname(os.path.dirname(penelopise.__file__))
+    proc = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        capture_output=True,
+        env=dict(os.environ, PYTHONPATH=path),
+        check=True,
+        text=True,
+    )
+    assert json.loads(proc.stdout) == {"modules": [], "compiled": []}
+
+
+@pytest.mark.parametrize(
+    ("pattern", "flags"),
+    [(r"@(\S+)\b", 0), (r"\(([A-Z])\)", re.ASCII), (rb"[\r\n]", 0)],
+)
+def test_lazy_pattern(pattern, flags):
+    """Lazy patterns should behave like compiled ones."""
+    lazy = penelopise._LazyPattern(pattern, flags)
+    compiled = re.compile(pattern, flags)
+    text = "(A) call @Mom\r\n" if isinstance(pattern, str) else b"a\r\nb\n"
+    assert lazy.findall(text) == compiled.findall(text)
+    assert lazy.pattern == compiled.pattern
+    assert lazy.flags == compiled.flags
+    assert "findall" in vars(lazy)
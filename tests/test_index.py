@@ -0,0 +1,211 @@
+import copy
+import gc
+import pickle
+import weakref
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+import penelopise
+from penelopise import Entries, Entry, Priority
+
+from .conftest import ids
+from .strategies import todo_testable
+
+
+@given(st.lists(todo_testable(), max_size=20))
+def test_matches_scan(todo_list):
+    """Index lookups should match a linear scan."""
+    entries = Entries(Entry(text) for text, _ in todo_list)
+    index = entries.enable_index()
+    for entry in entries:
+        for context in entry.contexts:
+            assert ids(index.context(context)) == ids(
+                e for e in entries if context in e.contexts
+            )
+        for project in entry.projects:
+            assert ids(index.project(project)) == ids(
+                e for e in entries if project in e.projects
+            )
+        for key, value in entry.attrs.items():
+            assert ids(index.attr(key, value)) == ids(
+                e for e in entries if e.attrs.get(key) == value
+            )
+        assert ids(index.priority(entry.priority)) == ids(
+            e for e in entries if e.priority == entry.priority
+        )
+
+
+def test_set_algebra(entries):
+    """Selections should combine with set operators."""
+    index = entries.enable_index()
+    phone = index.context("phone")
+    sale = index.project("Work")
+    assert list(phone & sale) == [entries[1]]
+    assert ids(phone | sale) == ids(entries[:3])
+    assert list(sale - phone) == [entries[2]]
+    assert ids(~phone) == ids(entries[2:])
+    assert ids(phone ^ sale) == ids([entries[0], entries[2]])
+    assert ids(phone & entries[:2]) == ids(entries[:2])
+    assert ids(phone | entries[2:3]) == ids(entries[:3])
+    assert ids(phone - entries[:1]) == ids(entries[1:2])
+    assert ids(index.attr("due")) == ids(entries[1:4])
+    assert not index.context("missing")
+    assert repr(sale - phone) == f"Selection([{entries[2]!r}])"
+
+
+def test_identity(entries):
+    """Membership should be by identity, not equality."""
+    index = entries.enable_index()
+    assert entries[0] in index.all()
+    assert Entry(entries[0].text) not in index.all()
+
+
+def test_mutations(entries):
+    """The index should follow changes to the list."""
+    index = entries.enable_index()
+    entries.append(Entry("ring plumber @phone"))
+    entries.insert(0, Entry("text Dad @phone"))
+    entries += [Entry("email Dad @computer")]
+    assert len(index.context("phone")) == 4
+    entries.pop(0)
+    entries.remove(Entry("ring plumber @phone"))
+    del entries[:2]
+    assert len(index.context("phone")) == 0
+    entries[0] = Entry("(A) urgent @phone")
+    entries[1:] = [Entry("later @phone")]
+    assert ids(index.priority(Priority.A)) == ids(entries[:1])
+    assert len(index) == len(entries) == 2
+    entries *= 2
+    assert len(index.context("phone")) == 2
+    del entries[0]
+    assert len(index.context("phone")) == 2
+    entries.clear()
+    assert not index.all()
+
+
+def test_duplicate_objects(entries):
+    """The same entry may appear in a list more than once."""
+    index = entries.enable_index()
+    entries.append(entries[0])
+    entries.pop()
+    assert entries[0] in index.context("phone")
+    entries.pop(0)
+    assert entries[0] not in index.context("Family")
+
+
+def test_text_change(entries):
+    """Changing an entry's text should update the index."""
+    index = entries.enable_index()
+    entry = entries[0]
+    entry.text = "(C) call Mom @home +Family"
+    assert entry not in index.context("phone")
+    assert entry in index.context("home")
+    assert entry in index.priority(Priority.C)
+    entries.remove(entry)
+    entry.text = "call Mom @phone"
+    assert entry not in index.all()
+
+
+def test_compact_entries():
+    """Compact entries should be indexable too."""
+    entries = Entries([penelopise.CompactEntry("call Mom @phone")])
+    index = entries.enable_index()
+    entries[0].text = "call Dad @phone"
+    assert len(index.context("phone")) == 1
+
+
+def test_invalid_fields():
+    """Entries with malformed fields should be indexed without them."""
+    entries = Entries([Entry("bad a:1 a:2 @home"), Entry("pri:1 @home")])
+    index = entries.enable_index()
+    assert len(index.context("home")) == 2
+    assert not index.attr("a")
+    assert list(index.priority(None)) == [entries[0]]
+
+
+def test_disable(entries):
+    """Disabling the index should detach it from entries."""
+    assert entries.entry_index is None
+    index = entries.enable_index()
+    assert entries.enable_index() is index
+    assert entries.entry_index is index
+    entries.disable_index()
+    entries.disable_index()
+    assert entries.entry_index is None
+    assert not index.all()
+    assert all(e._observers == () for e in entries)
+    entries.remove(entries[0])
+    entries.append(Entry("new"))
+    entries.extend([Entry("newer")])
+    entries.insert(0, Entry("first"))
+    entries[0] = Entry("replaced")
+    entries.pop()
+    del entries[0]
+    entries *= 2
+    assert len(entries) == 10
+
+
+def test_selection_snapshot(entries):
+    """Complements should be taken from the entries when selected."""
+    index = entries.enable_index()
+    phone = index.context("phone")
+    price, sweep, book = entries[2:]
+    entries.append(Entry("ring plumber"))
+    del entries[2]
+    assert ids(~phone) == ids([price, sweep, book])
+    assert ids(~index.context("phone")) == ids(entries[2:])
+
+
+def test_index_collected():
+    """Entries shouldn't keep the index of a discarded list alive."""
+    entries = Entries([Entry("(A) call Mom @phone"), Entry("buy milk")])
+    index = weakref.ref(entries.enable_index())
+    kept = entries[0]
+    del entries
+    gc.collect()
+    assert index() is None
+    kept.text = "(A) call Dad @phone"
+    kept.add_context("home")
+
+
+@pytest.mark.parametrize(
+    "entry_type", [Entry, penelopise.CompactEntry, penelopise.FrozenEntry]
+)
+def test_pickle(entry_type):
+    """Indexed lists and entries should pickle, with the list reindexed."""
+    entries = Entries([entry_type("(A) call Mom @phone"), entry_type("buy")])
+    entries.enable_index()
+    _ = entries[0].attrs
+    entry = pickle.loads(pickle.dumps(entries[0]))
+    assert entry == entries[0]
+    assert entry.contexts == entries[0].contexts
+    loaded = pickle.loads(pickle.dumps(entries))
+    assert loaded == entries
+    assert loaded.entry_index is not None
+    assert list(loaded.entry_index.context("phone")) == [loaded[0]]
+
+
+@pytest.mark.parametrize("entry_type", [Entry, penelopise.CompactEntry])
+@pytest.mark.parametrize("copier", [copy.copy, copy.deepcopy])
+def test_copy(entry_type, copier):
+    """Copies of indexed entries shouldn't be in the original's index."""
+    entries = Entries([entry_type("(A) call Mom @phone"), entry_type("buy")])
+    index = entries.enable_index()
+    entry = copier(entries[0])
+    entry.text = "call Dad @home"
+    assert list(index.context("phone")) == [entries[0]]
+    assert not index.context("home")
+    copied = copier(entries)
+    assert copied.entry_index is not index
+    assert len(copied.entry_index.context("phone")) == 1
+
+
+def test_untracked_change(entries):
+    """Changes to entries that aren't in the index should be ignored."""
+    index = entries.enable_index()
+    stray = Entry("call Mom @phone")
+    object.__setattr__(stray, "_observers", entries[0]._observers)
+    stray.text = "call Dad @garden"
+    assert not index.context("garden")
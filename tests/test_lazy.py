@@ -0,0 +1,80 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from penelopise import CompactEntry, Entries, LazyEntries
+
+from .conftest import encodable, positions
+from .strategies import todo_testable
+
+
+@given(st.lists(todo_testable(), max_size=10), st.integers(0, 3))
+def test_matches_map_file(write_file, todo_list, cache_size):
+    """Lazy entries should match ``map_file``, whatever the cache size."""
+    path = write_file(encodable(todo_list))
+    expected = Entries.map_file(path)
+    with LazyEntries(path, cache_size=cache_size) as entries:
+        assert len(entries) == len(expected)
+        assert positions(entries) == positions(expected)
+        assert positions(entries[::-1]) == positions(expected[::-1])
+
+
+def test_indexing(todo_file):
+    """Entries should be available by index and slice."""
+    with LazyEntries(todo_file, entry_type=CompactEntry) as entries:
+        assert isinstance(entries[0], CompactEntry)
+        assert entries[-1].complete
+        assert entries[1].offset == 23
+        page = entries[1:]
+        assert isinstance(page, Entries)
+        assert [e.lineno for e in page] == [3, 4]
+        assert entries[5:] == []
+        with pytest.raises(IndexError):
+            entries[3]
+        with pytest.raises(IndexError):
+            entries[-4]
+
+
+def test_cache(todo_file):
+    """Recently used entries should be reused, including their changes."""
+    with LazyEntries(todo_file, cache_size=2) as entries:
+        first = entries[0]
+        first.text = "(B) call Mom @phone"
+        assert entries[0] is first
+        assert next(iter(entries)) is first
+        entries[1]
+        entries[2]
+        assert entries[0] is not first
+        assert entries[0].text == "(A) call Mom @phone"
+
+
+def test_iteration_keeps_cache(todo_file):
+    """Iterating shouldn't replace cached entries."""
+    with LazyEntries(todo_file, cache_size=1) as entries:
+        last = entries[-1]
+        assert list(entries)[-1] is last
+        assert entries[-1] is last
+
+
+def test_uncached(todo_file):
+    """A cache size of zero should always create new entries."""
+    with LazyEntries(todo_file, cache_size=0) as entries:
+        assert entries[0] is not entries[0]
+        assert entries[0] == entries[0]
+
+
+def test_empty_file(tmp_path):
+    """Empty files should produce empty lists."""
+    path = tmp_path / "todo.txt"
+    path.touch()
+    with LazyEntries(path) as entries:
+        assert len(entries) == 0
+        assert list(entries) == []
+
+
+def test_closed(todo_file):
+    """Entries can't be read after closing."""
+    entries = LazyEntries(todo_file)
+    entries.close()
+    with pytest.raises(ValueError):
+        entries[0]
@@ -0,0 +1,111 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from penelopise import CompactEntry, Entries, Entry, FrozenEntry
+
+from .strategies import todo_testable
+
+
+def texts(entries):
+    return [e.text for e in entries]
+
+
+@given(
+    st.lists(st.sampled_from(["a", "b", "c @x"]), max_size=8),
+    st.lists(st.sampled_from(["a", "b", "c @x"]), max_size=8),
+)
+def test_diff_counts(mine, theirs):
+    """Diffs should account for repeated entries."""
+    changes = Entries(map(Entry, mine)).diff(map(Entry, theirs))
+    expected = list(theirs)
+    for text in mine:
+        if text in expected:
+            expected.remove(text)
+    assert texts(changes.added) == expected
+    assert sorted(texts(changes.removed) + theirs) == sorted(
+        mine + texts(changes.added)
+    )
+    assert changes.modified == []
+
+
+@given(st.lists(todo_testable(), max_size=10))
+def test_dedupe_idempotent(todo_list):
+    """Merging lists that are already contained should add nothing."""
+    entries = Entries(Entry(text) for text, _ in todo_list * 2)
+    unique = entries.dedupe()
+    assert texts(unique) == list(dict.fromkeys(texts(entries)))
+    assert sorted(texts(unique.merge(entries))) == sorted(texts(entries))
+    assert unique.merge(unique.dedupe(normalize=True), normalize=True) == unique
+
+
+@pytest.fixture
+def entries():
+    return Entries(
+        [
+            Entry("(A) call Mom @phone +Family"),
+            Entry("buy milk @shops"),
+            Entry("(A) call Mom +Family  @phone"),
+            CompactEntry("buy milk @shops"),
+        ]
+    )
+
+
+def test_dedupe(entries):
+    """The first of each entry should be kept."""
+    unique = entries.dedupe()
+    assert isinstance(unique, Entries)
+    assert [id(e) for e in unique] == [id(e) for e in entries[:3]]
+    assert [id(e) for e in entries.dedupe(normalize=True)] == [
+        id(e) for e in entries[:2]
+    ]
+
+
+def test_normalize():
+    """Normalising should only ignore the order of metadata."""
+    entries = Entries(
+        [
+            Entry("x 2025-01-02 task due:2025-01-05 @home +Chores"),
+            Entry("x 2025-01-02 task +Chores @home due:2025-01-05"),
+            Entry("x 2025-01-02 +Chores task @home due:2025-01-05"),
+            Entry("2025-01-02 x task due:2025-01-05 @home +Chores"),
+            Entry("x 2025-01-02 task @home due:2025-01-06 +Chores"),
+        ]
+    )
+    assert len(entries.dedupe(normalize=True)) == 3
+
+
+def test_merge(entries):
+    """Merging should append entries only found in the other list."""
+    theirs = [Entry("buy milk @shops"), Entry("new task"), Entry("new task")]
+    merged = entries.merge(theirs)
+    assert texts(merged) == texts(entries) + ["new task", "new task"]
+    assert merged[-1] is theirs[-1]
+    changes = entries.diff(theirs)
+    assert texts(changes.removed) == [
+        "(A) call Mom @phone +Family",
+        "(A) call Mom +Family  @phone",
+        "buy milk @shops",
+    ]
+    assert changes.removed[-1] is entries[-1]
+
+
+def test_frozen_entry():
+    """Frozen entries should be hashable, and immutable."""
+    entry = FrozenEntry("call Mom @phone", lineno=3)
+    assert entry.contexts == ["phone"]
+    assert entry.lineno == 3
+    assert len({entry, FrozenEntry("call Mom @phone")}) == 1
+    assert entry == Entry("call Mom @phone")
+    assert {entry: 1}[FrozenEntry("call Mom @phone")] == 1
+    with pytest.raises(AttributeError, match="Cannot change"):
+        entry.text = "call Dad"
+
+
+def test_frozen_loading(tmp_path):
+    """Files can be read as frozen entries."""
+    path = tmp_path / "todo.txt"
+    path.write_text("first\nsecond\nfirst\n")
+    assert len(set(Entries.map_file(path, entry_type=FrozenEntry))) == 2
+    with pytest.raises(TypeError):
+        hash(Entry("first"))
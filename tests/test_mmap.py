@@ -0,0 +1,72 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+import penelopise
+
+
+@given(
+    st.lists(
+        st.sampled_from(
+            ["x", "@a", "+b", " ", "\t", "\n", "\r", "\r\n", "\x1c", "　"]
+        )
+    )
+)
+def test_matches_parse_file(write_file, fragments):
+    """Memory mapped parsing should split lines like text mode files."""
+    p = write_file("".join(fragments).encode())
+    expected = penelopise.Entries.parse_file(p)
+    entries = penelopise.Entries.map_file(p)
+    assert entries == expected
+    assert [e.lineno for e in entries] == [e.lineno for e in expected]
+
+
+def test_offsets(tmp_path):
+    """Entries should record the byte offset of their line."""
+    p = tmp_path / "todo.txt"
+    p.write_bytes(
+        "Spin wool\n\nWeave shroud for Laërtes\nUnpick shroud\n".encode()
+    )
+    data = p.read_bytes()
+    for entry in penelopise.Entries.map_file(p):
+        assert data[entry.offset :].decode().startswith(entry.text)
+
+
+@pytest.mark.parametrize(
+    "entry_type", [penelopise.Entry, penelopise.CompactEntry]
+)
+def test_deferred_decoding(tmp_path, entry_type):
+    """Text should only be decoded when it is used."""
+    p = tmp_path / "todo.txt"
+    p.write_bytes(b"(A) Thank Mom for the meatballs @phone  \n")
+    (entry,) = penelopise.Entries.map_file(p, entry_type=entry_type)
+    assert hasattr(entry, "_raw")
+    assert entry.contexts[0] == "phone"
+    assert not hasattr(entry, "_raw")
+    assert entry.text == "(A) Thank Mom for the meatballs @phone"
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        _ = entry.missing  # type: ignore
+
+
+def test_encoding(tmp_path):
+    """Other ASCII compatible encodings should be supported."""
+    p = tmp_path / "todo.txt"
+    p.write_bytes("Ask Laërtes about +shroud\n".encode("latin-1"))
+    (entry,) = penelopise.Entries.map_file(p, encoding="latin-1")
+    assert entry.text == "Ask Laërtes about +shroud"
+
+
+def test_empty_file(tmp_path):
+    """Empty files can't be mapped, but should still parse."""
+    p = tmp_path / "todo.txt"
+    p.touch()
+    assert penelopise.Entries.map_file(p) == []
+
+
+def test_release_pages(tmp_path, monkeypatch):
+    """Releasing mapped pages shouldn't affect the parsed entries."""
+    monkeypatch.setattr(penelopise, "_MMAP_RELEASE_SIZE", 0)
+    p = tmp_path / "todo.txt"
+    p.write_text("Unpick the day's weaving +shroud\n" * 1000)
+    entries = penelopise.Entries.map_file(p)
+    assert entries == penelopise.Entries.parse_file(p)
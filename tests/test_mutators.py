@@ -0,0 +1,163 @@
+import datetime
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from penelopise import CompactEntry, Entries, Entry, FrozenEntry, Priority
+
+from .conftest import fields
+from .strategies import todo_testable
+
+edits = st.one_of(
+    st.builds(
+        lambda d: lambda e: e.mark_complete(d),
+        st.dates(datetime.date(2000, 1, 1), datetime.date(2099, 12, 31)),
+    ),
+    st.builds(
+        lambda p: lambda e: e.set_priority(p),
+        st.none() | st.sampled_from(Priority),
+    ),
+    st.builds(
+        lambda c: lambda e: e.add_context(c),
+        st.sampled_from(["phone", "home", "a_b"]),
+    ),
+    st.builds(
+        lambda p: lambda e: e.add_project(p),
+        st.sampled_from(["Family", "Sprint42"]),
+    ),
+    st.builds(
+        lambda k, v: lambda e: e.set_attr(k, v),
+        st.sampled_from(["due", "t", "body"]),
+        st.none()
+        | st.sampled_from(["x", "notes.md"])
+        | st.just(datetime.date(2025, 1, 5)),
+    ),
+)
+
+
+@given(
+    todo_testable(),
+    st.sampled_from([Entry, CompactEntry]),
+    st.lists(edits, max_size=4),
+)
+def test_matches_reparse(todo, entry_type, actions):
+    """Edited entries should have the same fields as freshly parsed ones."""
+    text, _ = todo
+    entry = entry_type(text).parse_all()
+    for action in actions:
+        action(entry)
+        assert fields(entry) == fields(Entry(entry.text))
+
+
+@pytest.mark.parametrize("entry_type", [Entry, CompactEntry])
+def test_mark_complete(entry_type):
+    """Completing should keep the priority, and be idempotent."""
+    entry = entry_type("(A) call Mom @phone")
+    entry.mark_complete(datetime.date(2025, 1, 2))
+    assert entry.text == "x 2025-01-02 call Mom @phone pri:A"
+    assert entry.complete
+    assert entry.priority == Priority.A
+    entry.mark_complete()
+    assert entry.completion_date == datetime.date(2025, 1, 2)
+    entry = entry_type("buy milk")
+    entry.mark_complete()
+    assert entry.completion_date == datetime.date.today()
+
+
+@pytest.mark.parametrize("entry_type", [Entry, CompactEntry])
+def test_set_priority(entry_type):
+    """Priorities should replace markers and ``pri:`` attributes."""
+    entry = entry_type("(A) 2025-01-01 call Mom pri:C")
+    entry.set_priority(Priority.B)
+    assert entry.text == "(B) 2025-01-01 call Mom"
+    entry.set_priority(None)
+    assert entry.text == "2025-01-01 call Mom"
+    assert entry.creation_date == datetime.date(2025, 1, 1)
+    entry = entry_type("x (A) 2025-01-02 call Mom")
+    entry.set_priority(Priority.D)
+    assert entry.text == "x 2025-01-02 call Mom pri:D"
+
+
+@pytest.mark.parametrize("entry_type", [Entry, CompactEntry])
+def test_tags(entry_type):
+    """Tags should only be added once, and must be valid."""
+    entry = entry_type("call Mom @phone")
+    entry.add_context("phone")
+    entry.add_project("Family")
+    entry.add_context("home")
+    assert entry.text == "call Mom @phone +Family @home"
+    with pytest.raises(ValueError, match="Invalid context"):
+        entry.add_context("two words")
+    with pytest.raises(ValueError, match="Invalid project"):
+        entry.add_project("")
+
+
+@pytest.mark.parametrize("entry_type", [Entry, CompactEntry])
+def test_set_attr(entry_type):
+    """Attributes should be replaced in place, or appended."""
+    entry = entry_type("pay bill due:2025-01-05 @home")
+    entry.set_attr("due", datetime.date(2025, 2, 1))
+    entry.set_attr("amount", "40")
+    assert entry.text == "pay bill due:2025-02-01 @home amount:40"
+    assert entry.attrs["due"] == datetime.date(2025, 2, 1)
+    entry.set_attr("due", None)
+    assert entry.text == "pay bill @home amount:40"
+    with pytest.raises(ValueError, match="Invalid attribute"):
+        entry.set_attr("a b", "c")
+    with pytest.raises(ValueError, match="set_priority"):
+        entry.set_attr("pri", "A")
+
+
+def test_partial_invalidation():
+    """Fields unaffected by a change should stay cached."""
+    entry = Entry("(A) 2025-01-01 a long enough task description @phone")
+    contexts = entry.contexts
+    _ = entry.attrs
+    entry.add_project("Family")
+    assert entry.contexts is contexts
+    assert "attrs" in vars(entry)
+    assert "projects" not in vars(entry)
+
+
+def test_frozen():
+    """Frozen entries can't be edited."""
+    entry = FrozenEntry("call Mom")
+    with pytest.raises(AttributeError, match="Cannot change"):
+        entry.add_context("phone")
+    assert entry.text == "call Mom"
+
+
+def test_index():
+    """Indexes should follow structured changes."""
+    entries = Entries([Entry("call Mom"), CompactEntry("buy milk")])
+    index = entries.enable_index()
+    entries[1].add_context("shops")
+    assert list(index.context("shops")) == [entries[1]]
+    entries[1].mark_complete()
+    assert list(index.query("complete")) == [entries[1]]
+
+
+def test_apply():
+    """Batch edits should only report entries that changed."""
+    entries = Entries(
+        [
+            Entry("(A) plan +Sprint42"),
+            Entry("x 2025-01-01 review +Sprint42"),
+            Entry("write docs +Sprint41"),
+            CompactEntry("ship it +Sprint42"),
+        ]
+    )
+    changed = entries.apply(
+        "+Sprint42", lambda e: e.mark_complete(datetime.date(2025, 1, 2))
+    )
+    assert changed == [entries[0], entries[3]]
+    assert [e.text for e in changed] == [
+        "x 2025-01-02 plan +Sprint42 pri:A",
+        "x 2025-01-02 ship it +Sprint42",
+    ]
+    entries.enable_index()
+    assert entries.apply("!complete", lambda e: e.add_context("desk")) == [
+        entries[2]
+    ]
+    assert list(entries.filter("@desk")) == [entries[2]]
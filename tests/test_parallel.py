@@ -0,0 +1,81 @@
+import pytest
+
+import penelopise
+
+from .conftest import fields
+
+TODO = (
+    "x 2025-08-16 2025-08-01 Rule @Ithaca\r\n"
+    "\r\n"
+    "(A) Devise machine to unravel +shroud @bed due:2025-09-01\r\n"
+    "invalid pri:value with bad:2025-13-45\r\n"
+    "duplicate key:value1 key:value2\r\n"
+    "x 2025-02-30 Cut +penelopise release\r\n"
+    "2025-02-30 Unpick shroud\r\n"
+) * 50
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_matches_sequential(tmp_path, monkeypatch, workers):
+    """Parallel parsing should match sequential parsing exactly."""
+    monkeypatch.setattr(penelopise, "_PARALLEL_MIN_SIZE", 0)
+    p = tmp_path / "todo.txt"
+    p.write_bytes(TODO.encode())
+    entries = penelopise.Entries.parse_file_parallel(p, workers=workers)
+    assert isinstance(entries, penelopise.Entries)
+    assert [(e.lineno, e.offset, fields(e)) for e in entries] == [
+        (e.lineno, e.offset, fields(e)) for e in penelopise.Entries.map_file(p)
+    ]
+
+
+def test_fields_prepopulated(tmp_path, monkeypatch):
+    """Fields should be extracted by the workers."""
+    monkeypatch.setattr(penelopise, "_PARALLEL_MIN_SIZE", 0)
+    p = tmp_path / "todo.txt"
+    p.write_text("(B) 2025-08-01 Weave +shroud\n")
+    (entry,) = penelopise.Entries.parse_file_parallel(
+        p, workers=2, entry_type=penelopise.CompactEntry
+    )
+    monkeypatch.setattr(penelopise, "_extract_priority", None)
+    monkeypatch.setattr(penelopise, "_extract_projects", None)
+    assert entry.priority == penelopise.Priority.B
+    assert entry.projects == ("shroud",)
+
+
+def test_small_file(tmp_path):
+    """Small files should be parsed eagerly, in process."""
+    p = tmp_path / "todo.txt"
+    p.write_text("(B) 2025-08-01 Weave +shroud\n")
+    (entry,) = penelopise.Entries.parse_file_parallel(
+        p, entry_type=penelopise.CompactEntry
+    )
+    assert entry._priority == penelopise.Priority.B
+    assert entry._projects == ("shroud",)
+    assert entry.offset == 0
+
+
+def test_split_ranges(tmp_path):
+    """Ranges should be aligned to line boundaries."""
+    p = tmp_path / "todo.txt"
+    p.write_bytes(TODO.encode())
+    data = p.read_bytes()
+    for count in [7, len(data)]:
+        bounds = penelopise._split_ranges(p, count)
+        assert bounds[0] == 0
+        assert bounds[-1] == len(data)
+        assert bounds == sorted(set(bounds))
+        assert all(data[b - 1 : b] == b"\n" for b in bounds[1:-1])
+
+
+def test_split_ranges_unterminated(tmp_path):
+    """Files without line endings can't be split."""
+    p = tmp_path / "todo.txt"
+    p.write_text("Weave " * 100)
+    assert penelopise._split_ranges(p, 4) == [0, 600]
+
+
+def test_empty_file(tmp_path):
+    """Empty files should produce an empty list."""
+    p = tmp_path / "todo.txt"
+    p.touch()
+    assert penelopise.Entries.parse_file_parallel(p) == []
@@ -0,0 +1,95 @@
+import collections
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+import penelopise
+from penelopise import CompactEntry, Entries, Entry, Priority, Query
+
+from .strategies import todo_testable
+
+
+@given(
+    st.lists(todo_testable(), max_size=10),
+    st.sampled_from([Entry, CompactEntry]),
+)
+def test_histogram_matches_entries(todo_list, entry_type):
+    """Histograms should count exactly the entries' priorities."""
+    entries = Entries(entry_type(text) for text, _ in todo_list)
+    expected = collections.Counter(e.priority for e in entries)
+    assert entries.priority_histogram() == expected
+    for entry in entries:
+        assert entry.priority_code == int(entry.priority or 0)
+
+
+def test_histogram():
+    """Entries without a priority should be counted under ``None``."""
+    entries = Entries(
+        [
+            Entry("(A) call Mom"),
+            CompactEntry("x 2025-01-02 sweep pri:A"),
+            Entry("buy milk"),
+            Entry("(C) book flights"),
+        ]
+    )
+    assert entries.priority_histogram() == {
+        Priority.A: 2,
+        Priority.C: 1,
+        None: 1,
+    }
+    assert "priority" not in vars(entries[2])
+    assert Entries().priority_histogram() == {}
+
+
+@pytest.mark.parametrize("entry_type", [Entry, CompactEntry])
+def test_histogram_parsed(entry_type, monkeypatch):
+    """Entries that have been parsed should be counted from their values."""
+    entries = Entries([entry_type("(A) call Mom"), entry_type("buy milk")])
+    for entry in entries:
+        _ = entry.priority
+    monkeypatch.setattr(penelopise, "_extract_priority", None)
+    assert entries.priority_histogram() == {Priority.A: 1, None: 1}
+
+
+@pytest.mark.parametrize("entry_type", [Entry, CompactEntry])
+@pytest.mark.parametrize("parsed", [0, 1])
+def test_histogram_mixed(entry_type, parsed, monkeypatch):
+    """Each entry should be counted from its value only if it has one."""
+    entries = Entries([entry_type("(A) call Mom"), entry_type("(B) buy milk")])
+    _ = entries[parsed].priority
+    unparsed = entries[1 - parsed]
+
+    def extract(text):
+        assert text == unparsed.text
+        return Priority[text[1]]
+
+    monkeypatch.setattr(penelopise, "_extract_priority", extract)
+    assert entries.priority_histogram() == {Priority.A: 1, Priority.B: 1}
+    assert unparsed._cached("priority") is penelopise._UNSET
+
+
+@pytest.mark.parametrize("entry_type", [Entry, CompactEntry])
+@pytest.mark.parametrize("text", ["pri:AB", "pri:a", "pri:1", "pri:É"])
+def test_invalid(entry_type, text):
+    """Anything other than one uppercase ASCII letter should be rejected."""
+    entries = Entries([entry_type(f"task {text}")])
+    with pytest.raises(ValueError, match="Invalid priority value"):
+        _ = entries[0].priority
+    with pytest.raises(ValueError, match="Invalid priority value"):
+        entries.priority_histogram()
+    with pytest.raises(ValueError, match="Invalid priority value"):
+        Query(text.replace(":", "="))
+
+
+def test_codes():
+    """Codes should order like priorities, with zero for none."""
+    assert Entry("task").priority_code == 0
+    assert Entry("(Z) task").priority_code == 1
+    assert Entry("(A) task").priority_code == 26
+    entries = Entries([Entry("(B) b"), Entry("a"), Entry("(A) c")])
+    assert [e.text for e in entries.sorted_by("priority")] == [
+        "(A) c",
+        "(B) b",
+        "a",
+    ]
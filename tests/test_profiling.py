@@ -0,0 +1,107 @@
+import functools
+
+import pytest
+
+import penelopise
+from penelopise import CompactEntry, Entries, Entry
+
+
+@pytest.mark.parametrize("entry_type", [Entry, CompactEntry])
+def test_fields(entry_type):
+    """Extractor calls, cache hits, and misses should be counted."""
+    entry = entry_type("(A) call Mom @phone due:2025-01-05")
+    with penelopise.profiling() as stats:
+        for _ in range(3):
+            assert entry.priority == penelopise.Priority.A
+        assert entry.attrs["due"].day == 5
+    assert stats.calls["priority"] == 1
+    assert stats.misses["priority"] == 1
+    assert stats.hits["priority"] == 2
+    assert stats.calls["attrs"] == 1
+    assert stats.time["priority"] > 0
+    assert "contexts" not in stats.calls
+
+
+@pytest.mark.parametrize("entry_type", [Entry, CompactEntry])
+def test_invalidations(entry_type):
+    """Text changes should be counted, but not unchanged assignments."""
+    entry = entry_type("call Mom")
+    with penelopise.profiling() as stats:
+        entry.text = "call Mom"
+        entry.text = "call Dad"
+        assert entry.text == "call Dad"
+        entry.parse_all()
+        assert entry.complete is False
+    assert stats.invalidations == 1
+    assert stats.calls["tokenize"] == 1
+    assert stats.hits["complete"] == 1
+
+
+@pytest.mark.parametrize("entry_type", [Entry, CompactEntry])
+def test_edit_invalidations(entry_type):
+    """Changes made by the structured mutators should be counted too."""
+    entry = entry_type("call Mom @phone")
+    with penelopise.profiling() as stats:
+        entry.add_context("phone")
+        entry.set_priority(penelopise.Priority.A)
+        entry.set_attr("due", "2025-01-05")
+        entry.mark_complete()
+    assert entry.complete
+    assert stats.invalidations == 3
+
+
+def test_parse_file(todo_file):
+    """Lines read and skipped should be counted."""
+    # Lines containing only whitespace are also skipped
+    todo_file.write_bytes(todo_file.read_bytes() + b"  \n")
+    with penelopise.profiling() as stats:
+        entries = Entries.parse_file(todo_file)
+    assert len(entries) == 3
+    assert stats.lines_read == 5
+    assert stats.lines_skipped == 2
+    assert stats.read_time > 0
+    assert [e.lineno for e in entries] == [1, 3, 4]
+
+
+def test_restored(todo_file):
+    """Everything should be restored afterwards, even after errors."""
+    with pytest.raises(ZeroDivisionError), penelopise.profiling():
+        1 / 0  # noqa: B018
+    assert isinstance(Entry.__dict__["complete"], functools.cached_property)
+    assert "__wrapped__" not in vars(penelopise._extract_complete)
+    assert "__wrapped__" not in vars(penelopise._tokenize)
+    assert Entries.iter_lines.__name__ == "iter_lines"
+    with penelopise.profiling() as stats:
+        pass
+    assert Entry("@phone").contexts == ["phone"]
+    assert not stats.calls
+
+
+def test_immutable_fields():
+    """Fields should still be read-only while profiling."""
+    entry = Entry("task")
+    with (
+        penelopise.profiling(),
+        pytest.raises(AttributeError, match="Cannot set"),
+    ):
+        entry.complete = True
+
+
+def test_nested():
+    """Profiling can't be nested."""
+    with (
+        penelopise.profiling(),
+        pytest.raises(RuntimeError, match="already active"),
+        penelopise.profiling(),
+    ):
+        pass
+
+
+def test_report():
+    """Reports should list every field used."""
+    with penelopise.profiling() as stats:
+        assert Entry("call Mom @phone").contexts == ["phone"]
+    report = stats.report()
+    assert "contexts" in report
+    assert "lines read 0" in report
+    assert "calls={'contexts': 1}" in repr(stats)
@@ -0,0 +1,151 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from penelopise import Entries, Entry, Query
+
+from .conftest import ids
+from .strategies import todo_testable
+
+
+def entry_queries(entry):
+    """Queries built from an entry's own fields, which it should match."""
+    terms = [f"@{c}" for c in entry.contexts]
+    terms.extend(f"+{p}" for p in entry.projects)
+    try:
+        terms.extend(
+            f"{k}:{v}"
+            for k, v in entry.attrs.items()
+            if k not in {"created", "completed"}
+        )
+    except KeyError:
+        pass
+    if entry.complete:
+        terms.append("complete")
+    else:
+        terms.append("!complete")
+    return [*terms, " ".join(terms)]
+
+
+@given(st.lists(todo_testable(), min_size=1, max_size=5))
+def test_matches_index(todo_list):
+    """Filtering should give the same results with and without the index."""
+    entries = Entries(Entry(text) for text, _ in todo_list)
+    extra = ["pri>=M", "!pri=A", "created>=1500-01-01", "a"]
+    expected = {}
+    for entry in entries:
+        for query in entry_queries(entry):
+            expected[query] = list(entries.filter(query))
+            assert entry in expected[query]
+    for query in extra:
+        expected[query] = list(entries.filter(query))
+    index = entries.enable_index()
+    for query, found in expected.items():
+        assert list(entries.filter(query)) == found
+        assert ids(index.query(query)) == ids(found)
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("", [0, 1, 2, 3, 4]),
+        ("complete", [3]),
+        ("!complete", [0, 1, 2, 4]),
+        ("@phone", [0, 1]),
+        ("!@phone", [2, 3, 4]),
+        ("+Work @office pri>=B due<2026-11-01 !complete", []),
+        ("+Work @office pri<=C due<2026-12-01 !complete", [1]),
+        ("pri=A", [0]),
+        ("pri!=A", [1, 2, 3, 4]),
+        ("pri>C", [0, 2]),
+        ("due:soon", [3]),
+        ("due=2026-10-01", [1]),
+        ("due>=2026-10-01", [1, 2]),
+        ("due<zzz", [3]),
+        ("created<2026-01-01", [3]),
+        ("completed=2026-01-02", [3]),
+        ("sale", [1]),
+        ("!flights", [0, 1, 2, 3]),
+    ],
+)
+def test_filter(entries, query, expected):
+    """Queries should match entries by each kind of term."""
+    assert list(entries.filter(query)) == [entries[i] for i in expected]
+    index = entries.enable_index()
+    assert list(entries.filter(Query(query))) == [entries[i] for i in expected]
+    assert ids(index.query(query)) == ids(entries[i] for i in expected)
+
+
+def test_ordering():
+    """Cheap terms should be checked before parsing fields."""
+    query = Query("due<2026-11-01 pri>=B @phone milk !complete")
+    assert [t.cost for t in query._terms] == sorted(
+        t.cost for t in query._terms
+    )
+    entry = Entry("x buy bread @shops due:2026-01-01")
+    assert not query(entry)
+    assert "attrs" not in entry.__dict__
+    assert "contexts" not in entry.__dict__
+
+
+def test_lazy(entries):
+    """Filtering should follow changes made while iterating."""
+    found = entries.filter("@phone")
+    assert next(found) is entries[0]
+    entries[1].text = "schedule sale @office"
+    assert list(found) == []
+
+
+@pytest.mark.parametrize(
+    "query", ["pri=1", "pri>AB", "created<soon", "completed=2026-13-01", "!"]
+)
+def test_invalid(query):
+    """Invalid values should be rejected when compiling."""
+    with pytest.raises(ValueError):
+        Query(query)
+
+
+def test_repr():
+    """Queries should show their source."""
+    assert repr(Query("@phone !complete")) == "Query('@phone !complete')"
+
+
+@pytest.mark.parametrize(
+    "query", ["@a", "+b", "complete", "!complete", "pri>=B", "x", "k:v"]
+)
+@given(
+    st.lists(
+        st.sampled_from(
+            ["x ", "x", "@a", "+b", "(B) ", "pri:A", "k:v", " ", "\n", "\r"]
+        )
+    )
+)
+def test_filter_file_matches(tmp_path_factory, query, fragments):
+    """Filtered loading should match parsing everything, then filtering."""
+    path = tmp_path_factory.mktemp("filter") / "todo.txt"
+    path.write_bytes("".join(fragments).encode())
+    expected = [e for e in Entries.parse_file(path) if Query(query)(e)]
+    entries = Entries.filter_file(path, query)
+    assert entries == expected
+    assert [e.lineno for e in entries] == [e.lineno for e in expected]
+
+
+def test_filter_file(tmp_path, entries):
+    """Only candidate lines should be parsed."""
+    path = tmp_path / "todo.txt"
+    path.write_bytes("\r\n\r\n".join(e.text for e in entries).encode())
+    created = []
+
+    class Counted(Entry):
+        def __init__(self, text, /, **kwargs):
+            super().__init__(text, **kwargs)
+            created.append(self)
+
+    found = Entries.filter_file(path, Query("+Work due"), entry_type=Counted)
+    assert found == entries[1:3]
+    assert [e.lineno for e in found] == [3, 5]
+    data = path.read_bytes()
+    assert data[found[1].offset :].decode().startswith(found[1].text)
+    assert len(created) == 2
+    assert Entries.filter_file(path, "!complete") == entries[:3] + entries[4:]
+    assert Entries.filter_file(path, "completed>=2026-01-01") == [entries[3]]
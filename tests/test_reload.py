@@ -0,0 +1,82 @@
+from hypothesis import given
+from hypothesis import strategies as st
+
+from penelopise import CompactEntry, Entries, Entry
+
+
+@given(
+    st.lists(st.sampled_from(["a @x", "b +y", "c", "a @x", "d k:v", ""])),
+    st.lists(st.sampled_from(["a @x", "b +y", "c", "e", "d k:v", ""])),
+)
+def test_matches_map_file(write_file, before, after):
+    """Reloading should produce the same list as reading the file afresh."""
+    path = write_file(before)
+    entries = Entries.map_file(path)
+    index = entries.enable_index()
+    previous = list(entries)
+    path.write_text("\n".join(after))
+    changes = entries.reload(path)
+
+    expected = Entries.map_file(path)
+    assert entries == expected
+    assert [e.lineno for e in entries] == [e.lineno for e in expected]
+    assert [e.offset for e in entries] == [e.offset for e in expected]
+    assert len(entries) - len(previous) == len(changes.added) - len(
+        changes.removed
+    )
+    assert {id(e) for e in entries} == {
+        id(e) for e in previous if all(e is not r for r in changes.removed)
+    } | {id(e) for e in changes.added}
+    assert len(index) == len({id(e) for e in entries})
+    assert sorted(id(e) for e in index.context("x")) == sorted(
+        id(e) for e in entries if "x" in e.contexts
+    )
+
+
+def test_single_edit(todo_file):
+    """Editing a line should only modify the matching entry."""
+    entries = Entries.map_file(todo_file)
+    _ = entries[2].contexts
+    kept = list(entries)
+    todo_file.write_bytes(todo_file.read_bytes().replace(b"milk", b"bread"))
+    changes = entries.reload(todo_file)
+    assert changes.added == changes.removed == []
+    assert changes.modified == [kept[1]]
+    assert all(a is b for a, b in zip(entries, kept))
+    assert entries[1].text == "buy bread @shops"
+    assert "contexts" in entries[2].__dict__
+
+
+def test_moved_lines(todo_file):
+    """Reordered lines should reuse their entries."""
+    entries = Entries.map_file(todo_file)
+    kept = list(entries)
+    todo_file.write_text(
+        "x 2025-01-02 sweep\n(A) call Mom @phone\nbuy milk @shops\n"
+    )
+    changes = entries.reload(todo_file)
+    assert changes == ([], [], [])
+    assert [id(e) for e in entries] == [id(kept[i]) for i in (2, 0, 1)]
+    assert [e.lineno for e in entries] == [1, 2, 3]
+
+
+def test_insert_and_delete(todo_file):
+    """Inserted lines should be added, and deleted lines removed."""
+    entries = Entries.parse_file(todo_file, entry_type=CompactEntry)
+    todo_file.write_text("new task\n(A) call Mom @phone\n")
+    changes = entries.reload(todo_file, entry_type=CompactEntry)
+    assert changes.added == [Entry("new task")]
+    assert isinstance(changes.added[0], CompactEntry)
+    assert changes.removed == [
+        Entry("buy milk @shops"),
+        Entry("x 2025-01-02 sweep"),
+    ]
+    assert changes.modified == []
+    assert entries[1].lineno == 2
+    assert entries[1].offset == 9
+
+
+def test_unchanged(todo_file):
+    """Reloading an unchanged file should change nothing."""
+    entries = Entries.map_file(todo_file)
+    assert entries.reload(todo_file) == ([], [], [])
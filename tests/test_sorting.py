@@ -0,0 +1,86 @@
+import datetime
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from penelopise import CompactEntry, Entries, Entry
+
+from .strategies import todo_testable
+
+
+def reference_key(entry):
+    """Straightforward version of the default ``sorted_by`` ordering."""
+    due = entry.attrs.get("due")
+    return (
+        -(entry.priority or 0),
+        entry.creation_date is None,
+        entry.creation_date or datetime.date.min,
+        isinstance(due, str) + 2 * (due is None),
+        due if isinstance(due, str) else "",
+        due if isinstance(due, datetime.date) else datetime.date.min,
+        entry.text,
+    )
+
+
+@given(st.lists(todo_testable(), max_size=30), st.integers(0, 40))
+def test_default_order(todo_list, limit):
+    """The default ordering should match the documented keys."""
+    entries = Entries(Entry(text) for text, _ in todo_list)
+    expected = sorted(entries, key=reference_key)
+    assert entries.sorted_by() == expected
+    assert entries.sorted_by(limit=limit) == expected[:limit]
+    assert (
+        entries.sorted_by(reverse=True, limit=limit)
+        == (sorted(entries, key=reference_key, reverse=True)[:limit])
+    )
+
+
+@pytest.fixture
+def entries():
+    return Entries(
+        [
+            Entry("2025-01-03 file taxes due:2025-04-15"),
+            Entry("(B) 2025-01-02 call Mom due:soon"),
+            Entry("(A) book flights"),
+            Entry("(B) 2025-01-02 buy milk due:2025-01-05"),
+            Entry("x 2025-01-04 2025-01-01 sweep"),
+        ]
+    )
+
+
+def test_keys(entries):
+    """Entries should sort by each key in turn."""
+    assert [e.text[:5] for e in entries.sorted_by()] == [
+        "(A) b",
+        "(B) 2",
+        "(B) 2",
+        "x 202",
+        "2025-",
+    ]
+    assert entries.sorted_by()[1].text.endswith("buy milk due:2025-01-05")
+    assert entries.sorted_by("due")[:3] == [entries[3], entries[0], entries[1]]
+    assert entries.sorted_by("complete", "text", reverse=True)[0] is entries[4]
+    assert entries.sorted_by("completion_date")[0] is entries[4]
+    assert entries.sorted_by("creation_date", limit=1) == [entries[4]]
+    assert isinstance(entries.sorted_by(), Entries)
+
+
+def test_cached_keys(entries):
+    """Keys should be computed once, and recomputed after text changes."""
+    entries.sorted_by("priority")
+    cached = entries[2]._sort_key
+    entries.sorted_by("priority")
+    assert entries[2]._sort_key is cached
+    entries[2].text = "(C) book flights"
+    assert entries[2]._sort_key is None
+    assert entries.sorted_by("priority")[2] is entries[2]
+
+
+def test_compact_entries():
+    """Compact entries should cache keys in their slots."""
+    entries = Entries([CompactEntry("(B) first"), CompactEntry("(A) second")])
+    assert entries.sorted_by()[0] is entries[1]
+    entries[1].text = "second"
+    assert entries[1]._sort_key is None
+    assert entries.sorted_by()[0] is entries[0]
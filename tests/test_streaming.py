@@ -0,0 +1,78 @@
+import io
+import itertools
+
+import pytest
+
+import penelopise
+
+TODO = (
+    "x Rule @Ithaca\n"
+    "\n"
+    "Devise machine to unravel +shroud @bed\n"
+    "   \n"
+    "Cut +penelopise release\n"
+)
+
+
+def test_iter_file(tmp_path):
+    """Iterating a file should match parsing it."""
+    p = tmp_path / "todo.txt"
+    p.write_text(TODO)
+    entries = penelopise.Entries.iter_file(p)
+    assert not isinstance(entries, list)
+    assert list(entries) == penelopise.Entries.parse_file(p)
+
+
+def test_iter_file_object():
+    """File objects should be accepted as well as paths."""
+    entries = list(penelopise.Entries.iter_file(io.StringIO(TODO)))
+    assert [e.text for e in entries] == [
+        "x Rule @Ithaca",
+        "Devise machine to unravel +shroud @bed",
+        "Cut +penelopise release",
+    ]
+
+
+def test_lineno():
+    """Line numbers should account for skipped blank lines."""
+    entries = penelopise.Entries.iter_lines(TODO.splitlines())
+    assert [e.lineno for e in entries] == [1, 3, 5]
+    assert penelopise.Entry("no source").lineno is None
+
+
+@pytest.mark.parametrize(
+    "entry_type", [penelopise.Entry, penelopise.CompactEntry]
+)
+def test_iter_lines_options(entry_type):
+    """Entry type and eager parsing should be configurable."""
+    (entry,) = penelopise.Entries.iter_lines(
+        ["(A) call Mom @phone"], eager=True, entry_type=entry_type
+    )
+    assert isinstance(entry, entry_type)
+    assert entry.lineno == 1
+    assert list(entry.contexts) == ["phone"]
+
+
+def test_lazy_consumption():
+    """Lines should only be consumed as entries are requested."""
+
+    def lines():
+        yield "first task"
+        raise AssertionError("Read too far")
+
+    first = next(iter(penelopise.Entries.iter_lines(lines())))
+    assert first.text == "first task"
+
+
+def test_parse_file_object():
+    """Test parsing from an open file."""
+    entries = penelopise.Entries.parse_file(io.StringIO(TODO))
+    assert isinstance(entries, penelopise.Entries)
+    assert len(entries) == 3
+
+
+def test_counting_pipeline():
+    """Streaming should support aggregations without building a list."""
+    lines = itertools.repeat("x 2025-08-16 stitch +shroud @loom", 1000)
+    completed = sum(e.complete for e in penelopise.Entries.iter_lines(lines))
+    assert completed == 1000
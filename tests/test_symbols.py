@@ -0,0 +1,87 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from penelopise import CompactEntry, Entries, Entry, SymbolTable
+
+from .strategies import todo_testable
+
+
+@given(
+    st.lists(todo_testable(), max_size=5),
+    st.sampled_from([Entry, CompactEntry]),
+)
+def test_tag_mask(todo_list, entry_type):
+    """Masks should contain exactly the entry's tags."""
+    entries = Entries(entry_type(text) for text, _ in todo_list)
+    index = entries.enable_index()
+    for entry in entries:
+        expected = {f"@{c}" for c in entry.contexts}
+        expected.update(f"+{p}" for p in entry.projects)
+        assert set(index.symbols.tags(index.tag_mask(entry))) == expected
+
+
+@pytest.mark.parametrize("entry_type", [Entry, CompactEntry])
+def test_membership(entry_type):
+    """Indexes should find entries with several tags at once."""
+    entries = Entries(
+        [
+            entry_type("call Mom @phone +Family"),
+            entry_type("call Dad @phone"),
+            entry_type("tidy @Family +phone"),
+        ]
+    )
+    index = entries.enable_index()
+    assert set(map(id, index.tags("@phone", "+Family"))) == {id(entries[0])}
+    assert len(index.tags("@phone")) == 2
+    assert len(index.tags()) == 3
+    assert not index.tags("@phone", "@office")
+    assert "@office" not in index.symbols
+    entries[0].text = "call Mom @home +Family"
+    assert not index.tags("@phone", "+Family")
+    with pytest.raises(ValueError, match="Invalid tag"):
+        index.tags("phone")
+
+
+def test_tag_mask_not_indexed():
+    """Only entries in the index have masks."""
+    index = Entries([Entry("call Mom @phone")]).enable_index()
+    with pytest.raises(KeyError):
+        index.tag_mask(Entry("call Mom @phone"))
+
+
+def test_scoped():
+    """Each index should have its own table, containing only its tags."""
+    first = Entries([Entry("call Mom @phone"), Entry("@home +Garden")])
+    second = Entries([Entry("+Garden weeding")])
+    first_index = first.enable_index()
+    second_index = second.enable_index()
+    assert first_index.symbols is not second_index.symbols
+    assert len(first_index.symbols) == 3
+    assert second_index.tag_mask(second[0]) == 1
+    assert second_index.symbols.tags(1) == ["+Garden"]
+
+
+@pytest.mark.parametrize("entry_type", [Entry, CompactEntry])
+def test_interned(entry_type):
+    """Tags should be shared between entries."""
+    first = entry_type("call Mom @" + "phone +" + "Family").parse_all()
+    second = entry_type("+" + "Family call Dad @" + "phone")
+    assert first.contexts[0] is second.contexts[0]
+    assert first.projects[0] is second.projects[0]
+
+
+def test_table():
+    """Tables should assign ids in order, once per tag."""
+    table = SymbolTable()
+    assert table.id("@phone") == 0
+    assert table.id("+phone") == 1
+    assert table.id("@phone") == 0
+    assert table.mask("@phone", "+phone", "@home") == 0b111
+    assert table.tag(2) == "@home"
+    assert table.tags(0b101) == ["@phone", "@home"]
+    assert len(table) == 3
+    assert "+phone" in table
+    assert "+home" not in table
+    with pytest.raises(ValueError, match="Invalid tag"):
+        table.id("phone")
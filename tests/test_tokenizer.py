@@ -0,0 +1,155 @@
+import os
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+import penelopise
+
+from .conftest import fields
+from .strategies import todo_testable
+
+
+@given(todo_testable())
+def test_fused_matches_lazy(todo_testable):
+    """The single pass tokenizer should match the lazy properties."""
+    text, _ = todo_testable
+    assert fields(penelopise.Entry(text).parse_all()) == fields(
+        penelopise.Entry(text)
+    )
+
+
+@given(
+    st.lists(
+        st.sampled_from(
+            ["x", " ", "(A)", "2025-08-16", "pri:", "@", "+", ":", "a", "é"]
+        )
+    )
+)
+def test_fused_matches_lazy_awkward(fragments):
+    """Tokenizer should match the regular expressions in edge cases."""
+    text = "".join(fragments)
+    assert fields(penelopise.Entry(text).parse_all()) == fields(
+        penelopise.Entry(text)
+    )
+
+
+@pytest.mark.parametrize(
+    "text, field, exception",
+    [
+        ("invalid pri:value", "priority", ValueError),
+        ("invalid pri:AB", "priority", ValueError),
+        ("x 2025-13-45 invalid completion", "completion_date", ValueError),
+        ("2025-02-30 invalid creation", "creation_date", ValueError),
+        ("duplicate key:value1 key:value2", "attrs", KeyError),
+    ],
+)
+def test_fused_defers_errors(text, field, exception):
+    """Errors should only surface when the failing property is accessed."""
+    entry = penelopise.Entry(text).parse_all()
+    assert entry.contexts == []
+    with pytest.raises(exception):
+        getattr(entry, field)
+
+
+def test_fused_pri_tag():
+    """Priority metadata should be found by the tokenizer."""
+    entry = penelopise.Entry("some task pri:A").parse_all()
+    assert vars(entry)["priority"] == penelopise.Priority.A
+
+
+def test_fused_invalidation():
+    """Populated properties should be invalidated on text changes."""
+    e = penelopise.Entry("example with @context").parse_all()
+    e.text = "dropped context"
+    assert not e.contexts
+
+
+def test_eager_file_input(tmp_path):
+    """Test eager file parsing."""
+    p = tmp_path / "todo.txt"
+    p.write_text("(A) Thank Mom for the meatballs @phone\n\nx Rule @Ithaca\n")
+    entries = penelopise.Entries.parse_file(p, eager=True)
+    assert entries == penelopise.Entries.parse_file(p)
+    assert all("contexts" in vars(e) for e in entries)
+
+
+def bulk_fields(texts):
+    """Collect fields from entries populated by the bulk tokenizer."""
+    result = []
+    for text, populated in zip(texts, penelopise._bulk_tokenize(texts)):
+        entry = penelopise.Entry(text)
+        entry._populate(populated)
+        result.append(fields(entry))
+    return result
+
+
+@given(st.lists(todo_testable(), max_size=5))
+def test_bulk_matches_lazy(todo_list):
+    """The bulk tokenizer should match the lazy properties."""
+    texts = [text for text, _ in todo_list]
+    assert bulk_fields(texts) == [
+        fields(penelopise.Entry(text)) for text in texts
+    ]
+
+
+@given(
+    st.lists(
+        st.sampled_from(
+            [
+                "x",
+                " ",
+                "(A)",
+                "2025-08-16",
+                "pri:",
+                "A",
+                "@",
+                "+",
+                "a",
+                "é",
+                "\n",
+            ]
+        )
+    )
+)
+def test_bulk_matches_lazy_awkward(fragments):
+    """Matches shouldn't cross, or be hidden by, the ends of lines."""
+    texts = [line.rstrip() for line in "".join(fragments).split("\n")]
+    assert bulk_fields(texts) == [
+        fields(penelopise.Entry(text)) for text in texts
+    ]
+
+
+@pytest.mark.parametrize(
+    "entry_type", [penelopise.Entry, penelopise.CompactEntry]
+)
+def test_parse_file_bulk(tmp_path, entry_type):
+    """Bulk parsing should populate entries like ``parse_file``."""
+    path = tmp_path / "todo.txt"
+    path.write_bytes(
+        b"(A) call Mom @phone  \r\n\r\nx 2025-01-02 pri:AB +Family\r"
+        b"2025-13-01 a@b @c+d\n \t\n"
+    )
+    expected = penelopise.Entries.parse_file(path, entry_type=entry_type)
+    entries = penelopise.Entries.parse_file_bulk(path, entry_type=entry_type)
+    assert entries == expected
+    assert [(e.lineno, e.offset) for e in entries] == [
+        (e.lineno, e.offset) for e in expected
+    ]
+    assert [e.offset for e in entries] == [0, 25, 53]
+    assert entries[0].priority == penelopise.Priority.A
+    assert list(entries[2].contexts) == ["c+d"]
+    with pytest.raises(ValueError, match="Invalid isoformat"):
+        _ = entries[2].creation_date
+    assert [fields(e) for e in entries] == [fields(e) for e in expected]
+
+
+def test_parse_file_bulk_save(todo_file):
+    """Bulk parsed entries should be written back in place."""
+    todo_file.write_bytes(b"caf\xc3\xa9 @home\r\nbuy milk @shops\n")
+    entries = penelopise.Entries.parse_file_bulk(todo_file)
+    inode = os.stat(todo_file).st_ino
+    entries[1].text = "buy eggs @shops"
+    entries.save(todo_file, changed=entries[1:])
+    assert os.stat(todo_file).st_ino == inode
+    assert todo_file.read_bytes() == b"caf\xc3\xa9 @home\r\nbuy eggs @shops\n"
@@ -0,0 +1,231 @@
+import os
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from penelopise import CompactEntry, Entries, Entry, Priority
+
+from .conftest import encodable, positions
+from .strategies import todo_testable
+
+
+@given(st.lists(todo_testable(), max_size=10))
+def test_round_trip(tmp_path_factory, todo_list):
+    """Saved files should read back to the same entries and positions."""
+    path = tmp_path_factory.mktemp("save") / "todo.txt"
+    # Only text that can be stored as a single line in a file
+    entries = Entries(
+        Entry(text.strip())
+        for text in encodable(todo_list)
+        if len(text.strip().splitlines()) == 1
+    )
+    entries.save(path)
+    loaded = Entries.map_file(path)
+    assert loaded == entries
+    assert positions(loaded) == positions(entries)
+
+
+def test_save_replaces(todo_file):
+    """Saving should replace the file, keeping its permissions."""
+    os.chmod(todo_file, 0o640)
+    entries = Entries.parse_file(todo_file, entry_type=CompactEntry)
+    entries.pop()
+    entries.save(todo_file)
+    assert todo_file.read_bytes() == b"(A) call Mom @phone\nbuy milk @shops\n"
+    assert os.stat(todo_file).st_mode & 0o777 == 0o640
+    assert positions(entries) == [
+        (1, 0, "(A) call Mom @phone"),
+        (2, 20, "buy milk @shops"),
+    ]
+    assert os.listdir(todo_file.parent) == ["todo.txt"]
+
+
+def test_save_failure(todo_file):
+    """A failed save should leave the original file intact."""
+    original = todo_file.read_bytes()
+    entries = Entries([Entry("fine"), Entry("not latin-1 ☃")])
+    with pytest.raises(UnicodeEncodeError):
+        entries.save(todo_file, encoding="latin-1")
+    assert todo_file.read_bytes() == original
+    assert os.listdir(todo_file.parent) == ["todo.txt"]
+
+
+@pytest.mark.parametrize("umask", [0o022, 0o077])
+def test_save_new_file(tmp_path, monkeypatch, umask):
+    """Saving should create files that don't exist yet, honouring the umask.
+
+    The umask is process-wide, so it must not be changed, even briefly.
+    """
+    path = tmp_path / "todo.txt"
+    previous = os.umask(umask)
+    try:
+        with monkeypatch.context() as m:
+            m.delattr(os, "umask")
+            Entries([Entry("new task")]).save(path)
+    finally:
+        os.umask(previous)
+    assert path.read_text() == "new task\n"
+    assert os.stat(path).st_mode & 0o777 == 0o666 & ~umask
+
+
+def test_save_symlink(tmp_path, todo_file):
+    """Saving through a symbolic link should replace the file it points to."""
+    link = tmp_path / "link.txt"
+    link.symlink_to(todo_file)
+    Entries([Entry("new task")]).save(link)
+    assert link.is_symlink()
+    assert todo_file.read_text() == "new task\n"
+    assert sorted(os.listdir(tmp_path)) == ["link.txt", "todo.txt"]
+
+
+def test_archive_symlink(tmp_path, todo_file):
+    """Archiving through symbolic links should update the files they point to."""
+    done = tmp_path / "done.txt"
+    done.write_text("")
+    (tmp_path / "todo-link.txt").symlink_to(todo_file)
+    (tmp_path / "done-link.txt").symlink_to(done)
+    assert (
+        Entries.archive(tmp_path / "todo-link.txt", tmp_path / "done-link.txt")
+        == 1
+    )
+    assert (tmp_path / "todo-link.txt").is_symlink()
+    assert todo_file.read_text() == "(A) call Mom @phone\n\nbuy milk @shops\n"
+    assert done.read_text() == "x 2025-01-02 sweep\n"
+
+
+@pytest.mark.parametrize("entry_type", [Entry, CompactEntry])
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"(A) call Mom @phone\r\n\r\nbuy milk @shops\nx 2025-01-02 sweep\n",
+        b"first\rsecond\r\n  \nthird",
+        "caf\u00e9 \u2603 @home\nna\u00efve +Plan\n".encode(),
+    ],
+)
+def test_parse_file_offsets(tmp_path, entry_type, content):
+    """Parsed files should have the same offsets as mapped ones."""
+    path = tmp_path / "todo.txt"
+    path.write_bytes(content)
+    entries = Entries.parse_file(path, entry_type=entry_type)
+    assert positions(entries) == positions(Entries.map_file(path))
+
+
+def test_patch_in_place(todo_file):
+    """Same length changes should be written without replacing the file."""
+    entries = Entries.map_file(todo_file)
+    inode = os.stat(todo_file).st_ino
+    entries[0].text = "(B) call Mom @phone"
+    entries[1].text = "buy eggs @shops"
+    entries.save(todo_file, changed=entries[:2])
+    assert os.stat(todo_file).st_ino == inode
+    assert todo_file.read_bytes() == (
+        b"(B) call Mom @phone\r\n\r\nbuy eggs @shops\nx 2025-01-02 sweep\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "(A) call Mom @home",
+        "(A) call Mom @phones",
+    ],
+)
+def test_patch_fallback(todo_file, text):
+    """Changes to a line's length should rewrite the whole file."""
+    entries = Entries.map_file(todo_file)
+    inode = os.stat(todo_file).st_ino
+    entries[0].text = text
+    entries.save(todo_file, changed=entries[:1])
+    assert os.stat(todo_file).st_ino != inode
+    assert Entries.map_file(todo_file) == entries
+    assert positions(Entries.map_file(todo_file)) == positions(entries)
+
+
+def test_patch_after_parse_file(todo_file):
+    """Entries read with ``parse_file`` should be patched in place."""
+    entries = Entries.parse_file(todo_file)
+    inode = os.stat(todo_file).st_ino
+    entries[0].set_priority(Priority.B)
+    entries.save(todo_file, changed=entries[:1])
+    assert os.stat(todo_file).st_ino == inode
+    assert todo_file.read_bytes() == (
+        b"(B) call Mom @phone\r\n\r\nbuy milk @shops\nx 2025-01-02 sweep\n"
+    )
+
+
+def test_patch_needs_offsets(todo_file):
+    """Entries without offsets can't be patched."""
+    with todo_file.open() as fh:
+        entries = Entries.parse_file(fh)
+    entries.save(todo_file, changed=entries[:1])
+    assert todo_file.read_bytes().count(b"\r") == 0
+
+
+def test_patch_moved_line(todo_file):
+    """Offsets that are no longer at the start of a line can't be patched."""
+    entries = Entries.map_file(todo_file)
+    todo_file.write_bytes(b"X" + todo_file.read_bytes())
+    entries.save(todo_file, changed=entries[2:3])
+    assert todo_file.read_bytes().startswith(b"(A) call Mom @phone\n")
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        b"first\n",
+        b"first",
+        b"first\r\n\r\n",
+        b"first\rsecond\r",
+    ],
+)
+@pytest.mark.parametrize(
+    "loader", [Entries.map_file, Entries.parse_file, lambda _: Entries()]
+)
+def test_append_to(tmp_path, content, loader):
+    """Appended entries should match reading the file again."""
+    path = tmp_path / "todo.txt"
+    path.write_bytes(content)
+    entries = loader(path)
+    entries.append_to(path, [Entry("new @task"), Entry("another")])
+    loaded = Entries.map_file(path)
+    assert loaded[-2:] == entries[-2:]
+    assert positions(loaded)[-2:] == positions(entries)[-2:]
+
+
+def test_append_to_index(todo_file):
+    """Appended entries should be indexed."""
+    entries = Entries.map_file(todo_file)
+    index = entries.enable_index()
+    entries.append_to(todo_file, [Entry("ring plumber @phone")])
+    assert len(index.context("phone")) == 2
+
+
+def test_archive(tmp_path, todo_file):
+    """Completed tasks should be moved to the done file."""
+    done = tmp_path / "done.txt"
+    done.write_text("x 2025-01-01 older")
+    assert Entries.archive(todo_file, done) == 1
+    assert todo_file.read_text() == "(A) call Mom @phone\n\nbuy milk @shops\n"
+    assert done.read_text() == "x 2025-01-01 older\nx 2025-01-02 sweep\n"
+    assert Entries.archive(todo_file, done) == 0
+    assert done.read_text() == "x 2025-01-01 older\nx 2025-01-02 sweep\n"
+
+
+def test_archive_new_done_file(tmp_path, todo_file):
+    """The done file should be created if necessary."""
+    done = tmp_path / "done.txt"
+    todo_file.write_text("x one\nx two\n")
+    assert Entries.archive(todo_file, done) == 2
+    assert todo_file.read_text() == ""
+    assert done.read_text() == "x one\nx two\n"
+
+
+def test_archive_line_terminators(tmp_path, todo_file):
+    """Kept lines should be written back with their original terminators."""
+    done = tmp_path / "done.txt"
+    todo_file.write_bytes(b"a\r\nx b\r\nc\rx d\r\ne")
+    assert Entries.archive(todo_file, done) == 2
+    assert todo_file.read_bytes() == b"a\r\nc\re"
+    assert done.read_bytes() == b"x b\nx d\n"